@@ -20,14 +20,15 @@ import pytest
 from xoney.generic.equity import Equity
 from xoney.generic.routes import Instrument
 from xoney.strategy import Strategy
-from xoney.generic.candlestick import Chart, Candle
+from xoney.generic.candlestick import Chart, Candle, BinaryChartSource
 from xoney.generic.events import Event, OpenTrade, CloseStrategyTrades
 from xoney.generic.enums import TradeSide
 from xoney.generic.trades import Trade, TradeMetaInfo
 from xoney.generic.trades.levels import LevelHeap, SimpleEntry
 from xoney.backtesting import Backtester
 from xoney import TradingSystem, Symbol
-from xoney.generic.timeframes import DAY_1
+from xoney.generic.timeframes import DAY_1, HOUR_4, HOUR_1
+from tests import utils
 
 
 @pytest.fixture
@@ -42,6 +43,17 @@ def dataframe():
         close=base[1:]
     )
 
+
+@pytest.fixture
+def some_pair():
+    return Instrument(Symbol("SOME/THING"), DAY_1)
+
+
+@pytest.fixture
+def trend_system(TrendCandleStrategy, some_pair):
+    return TradingSystem(config={TrendCandleStrategy(): [some_pair]})
+
+
 @pytest.mark.parametrize("commission",
                          [0.1, 0, 0.01, 0.5])
 @pytest.mark.parametrize("deposit",
@@ -60,3 +72,189 @@ def test_return_type_equity(dataframe, n, deposit, commission, TrendCandleStrate
     backtester.run(charts={some_pair: dataframe},
                    trading_system=trading_system)
     assert isinstance(backtester.equity, Equity)
+
+
+def test_strategy_runs_once_per_candle(dataframe, TrendCandleStrategy,
+                                       some_pair):
+    lengths = []
+
+    class RecordingStrategy(TrendCandleStrategy):
+        def run(self, chart):
+            lengths.append(len(chart))
+            super().run(chart)
+
+    trading_system = TradingSystem(config={RecordingStrategy(): [some_pair]})
+
+    backtester = Backtester()
+    backtester.run(charts={some_pair: dataframe},
+                   trading_system=trading_system)
+    assert lengths == list(range(1, len(dataframe) + 1))
+    assert len(backtester.equity) == len(dataframe)
+
+
+@pytest.mark.parametrize("n_checkpoints", [1, 4])
+def test_reporter(dataframe, some_pair, trend_system, n_checkpoints):
+    reported = []
+
+    def reporter(tick, equity):
+        reported.append((tick, len(equity)))
+
+    backtester = Backtester()
+    backtester.run(charts={some_pair: dataframe},
+                   trading_system=trend_system,
+                   reporter=reporter,
+                   n_checkpoints=n_checkpoints)
+    assert len(reported) == n_checkpoints
+    for tick, length in reported:
+        assert 0 < tick < len(dataframe) - 1
+        assert length == tick + 1
+
+
+def test_reporter_stops(dataframe, some_pair, trend_system):
+    class Stop(Exception):
+        pass
+
+    def reporter(tick, equity):
+        raise Stop
+
+    backtester = Backtester()
+    with pytest.raises(Stop):
+        backtester.run(charts={some_pair: dataframe},
+                       trading_system=trend_system,
+                       reporter=reporter)
+    assert len(backtester.equity) < len(dataframe)
+
+
+def test_clone(dataframe, some_pair, trend_system):
+    backtester = Backtester(initial_depo=50, commission=0.01)
+    backtester.run(charts={some_pair: dataframe},
+                   trading_system=trend_system)
+
+    clone = backtester.clone()
+    assert clone.commission == backtester.commission
+    assert clone.free_balance == 50
+    assert len(clone.equity) == 0
+    assert clone._trades is not backtester._trades
+
+    clone.run(charts={some_pair: dataframe},
+              trading_system=trend_system)
+    assert clone.equity == backtester.equity
+
+
+def test_run_resets(dataframe, some_pair, trend_system):
+    backtester = Backtester()
+    backtester.run(charts={some_pair: dataframe},
+                   trading_system=trend_system)
+    first = backtester.equity
+    backtester.run(charts={some_pair: dataframe},
+                   trading_system=trend_system)
+    assert backtester.equity == first
+
+
+@pytest.fixture
+def LookbackStrategy(TrendCandleStrategy):
+    class LookbackStrategy(TrendCandleStrategy):
+        lengths = []
+
+        def run(self, chart):
+            self.lengths.append(len(chart))
+            super().run(chart[-3:])
+
+        @property
+        def min_candles(self):
+            return 3
+
+    return LookbackStrategy
+
+
+@pytest.mark.parametrize("block_size", [1, 7, 1000])
+def test_run_stream(LookbackStrategy, tmp_path, block_size, some_pair):
+    chart = Chart(df=utils.random_df(300))
+    path = tmp_path / "chart.xchart"
+    chart.save(path)
+
+    backtester = Backtester()
+    backtester.run(charts={some_pair: chart},
+                   trading_system=TradingSystem(
+                       config={LookbackStrategy(): [some_pair]}
+                   ))
+    expected = backtester.equity
+
+    LookbackStrategy.lengths.clear()
+    source = BinaryChartSource(path, block_size=block_size)
+    backtester.run_stream(trading_system=TradingSystem(
+                              config={LookbackStrategy(): [some_pair]}
+                          ),
+                          sources={some_pair: source})
+    assert backtester.equity == expected
+    assert backtester.equity._timestamp.equals(expected._timestamp)
+    assert max(LookbackStrategy.lengths) == 3
+
+
+def test_run_stream_without_sources(trend_system):
+    with pytest.raises(ValueError):
+        Backtester().run_stream(trading_system=trend_system, sources={})
+
+
+def test_run_stream_multiple_charts(LookbackStrategy, tmp_path):
+    daily = Instrument(Symbol("SOME/THING"), DAY_1)
+    hourly = Instrument(Symbol("OTHER/THING"), HOUR_4)
+    charts = {daily: Chart(df=utils.random_df(60)),
+              hourly: Chart(df=utils.random_df(300), timeframe=HOUR_4)}
+    sources = {}
+    for instrument, chart in charts.items():
+        path = tmp_path / f"{instrument.timeframe}.xchart"
+        chart.save(path)
+        sources[instrument] = BinaryChartSource(path, block_size=16)
+
+    def trading_system():
+        # The strategies keep their last signal between runs.
+        return TradingSystem(config={LookbackStrategy(): [daily],
+                                     LookbackStrategy(): [hourly]})
+
+    backtester = Backtester()
+    backtester.run(charts=charts, trading_system=trading_system())
+    expected = backtester.equity
+    backtester.run_stream(trading_system=trading_system(), sources=sources)
+    assert backtester.equity == expected
+    assert backtester.equity._timestamp.equals(expected._timestamp)
+
+
+def test_mixed_timeframes_dispatch(TrendCandleStrategy):
+    calls = {}
+    runs = []
+
+    class RecordingStrategy(TrendCandleStrategy):
+        def run(self, chart):
+            calls.setdefault(chart.timeframe, []).append(len(chart))
+            runs.append((chart.timeframe, chart.timestamp[-1]))
+            super().run(chart[-3:])
+
+    hourly = Instrument(Symbol("SOME/THING"), HOUR_1)
+    daily = Instrument(Symbol("OTHER/THING"), DAY_1)
+    base = Chart(df=utils.random_df(24 * 20), timeframe=HOUR_1)
+    charts = {hourly: base, daily: base.resample(DAY_1)}
+    trading_system = TradingSystem(config={RecordingStrategy(): [hourly],
+                                           RecordingStrategy(n=2): [daily]})
+
+    reported = []
+    backtester = Backtester()
+    backtester.run(charts=charts,
+                   trading_system=trading_system,
+                   reporter=lambda tick, equity: reported.append(tick))
+    assert len(backtester.equity) == len(base)
+    assert len(reported) == 10
+    # Each strategy runs only when a candle of its own chart is closed.
+    assert calls[HOUR_1] == list(range(1, len(base) + 1))
+    daily_closes = charts[daily].timestamp + DAY_1.timedelta
+    closed = daily_closes <= base.timestamp[-1] + HOUR_1.timedelta
+    assert calls[DAY_1] == list(range(1, closed.sum() + 1))
+
+    # The daily strategy first runs on the first hourly tick
+    # at or after the close of the first daily candle.
+    first = runs.index((DAY_1, charts[daily].timestamp[0]))
+    hourly_closes = [timestamp + HOUR_1.timedelta
+                     for timeframe, timestamp in runs[:first]
+                     if timeframe == HOUR_1]
+    assert hourly_closes[-1] >= daily_closes[0]
+    assert hourly_closes[-2] < daily_closes[0]
@@ -15,9 +15,13 @@
 import pytest
 from datetime import datetime, timedelta
 
+import numpy as np
 import pandas as pd
 
-from xoney.backtesting._utils import _equity_start_stop, time_adjustment
+from xoney.backtesting._utils import (_equity_start_stop,
+                                      time_adjustment,
+                                      merge_events,
+                                      group_events)
 from xoney import timeframes
 
 
@@ -70,3 +74,24 @@ def test_invalid_adjustment():
     timeframe = timeframes.HOUR_1
     with pytest.raises(ValueError):
         time_adjustment(adj, timeframe)
+
+
+def test_merge_events():
+    ticks, pairs = merge_events([np.array([0, 2, 4]),
+                                 np.array([1, 2]),
+                                 np.array([], dtype=int),
+                                 np.array([2, 5])])
+    assert ticks.tolist() == [0, 1, 2, 2, 2, 4, 5]
+    # Events of one tick keep the order of the pairs.
+    assert pairs.tolist() == [0, 1, 0, 1, 3, 0, 3]
+    assert list(group_events(ticks, pairs)) == [(0, [0]),
+                                                (1, [1]),
+                                                (2, [0, 1, 3]),
+                                                (4, [0]),
+                                                (5, [3])]
+
+
+def test_merge_no_events():
+    ticks, pairs = merge_events([])
+    assert len(ticks) == len(pairs) == 0
+    assert list(group_events(ticks, pairs)) == []
@@ -0,0 +1,182 @@
+# Copyright 2023 Vladyslav Kochetov. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# =============================================================================
+import numpy as np
+import pytest
+
+from xoney import TradingSystem, Symbol, Instrument, Chart
+from xoney.backtesting import Backtester, VectorizedBacktester
+from xoney.generic.timeframes import DAY_1
+from xoney.strategy import VectorizedStrategy, Signals
+
+from tests import utils
+
+
+def moving_average(array, length):
+    result = np.full(len(array), np.nan)
+    if len(array) >= length:
+        cumulative = np.cumsum(np.insert(array, 0, 0.0))
+        result[length-1:] = (cumulative[length:]
+                             - cumulative[:-length]) / length
+    return result
+
+
+class CrossStrategy(VectorizedStrategy):
+    def __init__(self, fast=3, slow=8, stop=None, take=None):
+        super().__init__(fast=fast, slow=slow)
+        self.fast = fast
+        self.slow = slow
+        self.stop = stop
+        self.take = take
+
+    def signals(self, chart):
+        close = chart.close_array
+        fast = moving_average(close, self.fast)
+        slow = moving_average(close, self.slow)
+        position = np.where(np.isnan(slow), 0, np.where(fast > slow, 1, -1))
+        signals = Signals(position=position)
+        if self.stop is not None:
+            signals.stop_loss = close * (1 - self.stop * position)
+        if self.take is not None:
+            signals.take_profit = close * (1 + self.take * position)
+        return signals
+
+
+@pytest.fixture(scope="module")
+def chart():
+    df = utils.random_df(300)
+    high = df[["Open", "High", "Close"]].max(axis=1).values
+    low = df[["Open", "Low", "Close"]].min(axis=1).values
+    return Chart(open=df["Open"].values,
+                 high=high,
+                 low=low,
+                 close=df["Close"].values)
+
+
+@pytest.fixture
+def pairs():
+    return (Instrument(Symbol("SOME/THING"), DAY_1),
+            Instrument(Symbol("OTHER/THING"), DAY_1))
+
+
+# Settings of the strategies and the indices of the pairs they trade.
+LAYOUTS = {
+    "separate": [((3, 8), [0]), ((2, 5), [1])],
+    "shared": [((3, 8), [0, 1])],
+    "stacked": [((3, 8), [0]), ((2, 5), [0]), ((4, 12), [0])],
+    "mixed": [((3, 8), [0, 1]), ((2, 5), [1]), ((4, 12), [0])],
+}
+
+
+@pytest.mark.parametrize("commission", [0, 0.001, 0.01])
+@pytest.mark.parametrize("max_trades", [1, 2, 3])
+@pytest.mark.parametrize("stop, take", [(None, None),
+                                        (0.01, None),
+                                        (None, 0.01),
+                                        (0.005, 0.01)])
+@pytest.mark.parametrize("layout", LAYOUTS)
+def test_same_equity(chart, pairs, commission, max_trades, stop, take,
+                     layout):
+    some, other = pairs
+    charts = {some: chart, other: chart * 1.1}
+
+    def system():
+        return TradingSystem({CrossStrategy(fast, slow, stop, take):
+                              [pairs[index] for index in indices]
+                              for (fast, slow), indices in LAYOUTS[layout]},
+                             max_trades=max_trades)
+
+    event_driven = Backtester(commission=commission)
+    event_driven.run(system(), charts)
+    vectorized = VectorizedBacktester(commission=commission)
+    vectorized.run(system(), charts)
+
+    assert len(vectorized.equity) == len(event_driven.equity)
+    assert not np.isnan(event_driven.equity.as_array()).any()
+    assert np.allclose(vectorized.equity.as_array(),
+                       event_driven.equity.as_array())
+    assert np.isclose(vectorized.free_balance, event_driven.free_balance)
+
+
+def test_stop_loss(chart, pairs):
+    some, _ = pairs
+    backtester = VectorizedBacktester(commission=0)
+    backtester.run(TradingSystem({CrossStrategy(stop=0.001): [some]}),
+                   {some: chart})
+    without_stops = VectorizedBacktester(commission=0)
+    without_stops.run(TradingSystem({CrossStrategy(): [some]}),
+                      {some: chart})
+
+    equity = backtester.equity.as_array()
+    assert equity.shape == without_stops.equity.as_array().shape
+    assert not np.allclose(equity, without_stops.equity.as_array())
+    # After a stop loss the balance stays flat until the next signal.
+    assert (np.diff(equity) == 0).sum() > \
+           (np.diff(without_stops.equity.as_array()) == 0).sum()
+
+
+def test_reporter(chart, pairs):
+    some, _ = pairs
+    assert not VectorizedBacktester.reports_progress
+    with pytest.raises(ValueError):
+        VectorizedBacktester().run(TradingSystem({CrossStrategy(): [some]}),
+                                   {some: chart},
+                                   reporter=lambda tick, equity: None)
+
+
+def test_signals_length(chart, pairs):
+    class Broken(CrossStrategy):
+        def signals(self, chart):
+            return Signals(position=np.ones(len(chart) - 1))
+
+    some, _ = pairs
+    with pytest.raises(ValueError):
+        VectorizedBacktester().run(TradingSystem({Broken(): [some]}),
+                                   {some: chart})
+
+
+@pytest.mark.parametrize("commission", [0, 0.001])
+@pytest.mark.parametrize("stop", [None, 0.01])
+def test_run_batch(chart, pairs, commission, stop):
+    some, _ = pairs
+    settings = [(3, 8, 1), (2, 5, 1), (4, 12, 2), (5, 6, 3)]
+
+    def systems():
+        return [TradingSystem({CrossStrategy(fast, slow, stop): [some]},
+                              max_trades=max_trades)
+                for fast, slow, max_trades in settings]
+
+    backtester = VectorizedBacktester(commission=commission)
+    equities = backtester.run_batch(systems(), {some: chart})
+
+    assert len(equities) == len(settings)
+    for system, equity in zip(systems(), equities):
+        single = VectorizedBacktester(commission=commission)
+        single.run(system, {some: chart})
+        assert np.allclose(equity.as_array(), single.equity.as_array())
+
+
+def test_run_batch_many_pairs(chart, pairs):
+    some, other = pairs
+    charts = {some: chart, other: chart * 1.1}
+
+    def systems():
+        return [TradingSystem({CrossStrategy(fast, 8): [some],
+                               CrossStrategy(2, 5): [other]})
+                for fast in (2, 3)]
+
+    equities = Backtester().run_batch(systems(), charts)
+    batch = VectorizedBacktester().run_batch(systems(), charts)
+    for event_driven, vectorized in zip(equities, batch):
+        assert np.allclose(event_driven.as_array(), vectorized.as_array())
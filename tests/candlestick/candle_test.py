@@ -66,6 +66,7 @@ class TestComparisonOperators:
 
     def test_eq_candles(self, candle):
         assert candle == Candle(2.0, 4.0, 1.0, 3.0)
+        assert (candle == Candle(2.0, 4.0, 1.0, 3.5)) is False
 
     def test_eq_deepcopy(self, candle):
         assert candle == deepcopy(candle)
@@ -281,3 +282,22 @@ class TestOp:
 
         assert result.high == (candle.high / other_candle.low)
         assert result.low == (candle.low / other_candle.high)
+
+
+def test_slots(candle):
+    assert not hasattr(candle, "__dict__")
+    with pytest.raises(AttributeError):
+        candle.something = 1
+
+
+def test_trusted(candle):
+    trusted = Candle._trusted(2, 4, 1, 3, time, 100.)
+    assert trusted == candle
+    assert trusted.volume == candle.volume
+    assert trusted.timestamp == candle.timestamp
+
+
+def test_skip_validation():
+    with pytest.raises(TypeError):
+        Candle("2", 4, 1, 3)
+    assert Candle("2", 4, 1, 3, validate=False).open == "2"
@@ -13,15 +13,21 @@
 # limitations under the License.
 # =============================================================================
 import copy
-from datetime import datetime
+import pickle
+from datetime import datetime, timedelta
 
 import numpy as np
 import pandas as pd
 import pytest
 
-from xoney.generic.candlestick import Chart, Candle
+from xoney.generic.candlestick import Chart, Candle, _binary
+from xoney.generic.timeframes import (DAY_1, DAY_3, MINUTE_1,
+                                     MINUTE_15, HOUR_1, HOUR_4)
+from xoney import Instrument, Symbol
+from tests import utils
 from xoney.system.exceptions import (IncorrectChartLength,
-                                     InvalidChartParameters)
+                                     InvalidChartParameters,
+                                     InvalidChartFile)
 
 
 @pytest.fixture
@@ -221,3 +227,274 @@ def test_append(chart):
     len_1 = len(chart)
     chart.append(Candle(1, 1, 1, 1, datetime(1970, 1, 2), 1))
     assert len_1 + 1 == len(chart)
+
+
+def test_slice_is_view(chart):
+    view = chart[10:20]
+    assert np.shares_memory(view.close_array, chart.close_array)
+    assert view.close_array.dtype == np.float64
+
+
+def test_columns(chart):
+    close = chart.close
+    assert isinstance(close, pd.Series)
+    assert close.name == "Close"
+    assert close.index.equals(chart.timestamp)
+    assert np.shares_memory(close.values, chart.close_array)
+    for name in ("open", "high", "low", "close", "volume"):
+        array = getattr(chart, f"{name}_array")
+        assert isinstance(array, np.ndarray)
+        assert np.array_equal(getattr(chart, name).values, array)
+
+
+def test_to_pandas(chart):
+    df = chart.to_pandas()
+    assert isinstance(df, pd.DataFrame)
+    assert list(df.columns) == ["Open", "High", "Low", "Close", "Volume"]
+    assert all(df["Close"].values == chart.close)
+    assert all(df.index == chart.timestamp)
+    assert Chart(df=df) == chart
+
+
+def test_latest_before():
+    chart = Chart(open=[1., 2., 3.],
+                  high=[2., 3., 4.],
+                  low=[.5, 1., 2.],
+                  close=[2., 3., 3.5])
+    time = chart.timestamp[1] + chart.timeframe.timedelta / 2
+    assert chart.latest_before(time) == chart[1]
+
+
+def test_missing_label(chart):
+    with pytest.raises(KeyError):
+        chart[chart.timestamp[0] - chart.timeframe.timedelta]
+
+
+def test_append_growth(chart):
+    expected = [*chart.close, *range(100)]
+    for i in range(100):
+        chart.append(Candle(i, i, i, i, datetime(2000, 1, 1) + timedelta(days=i), 1))
+    assert list(chart.close) == expected
+    assert chart[-1].close == 99
+
+
+def test_append_keeps_views(chart):
+    view = chart[:]
+    before = view.close.copy()
+    view.append(Candle(1, 1, 1, 1, datetime(2000, 1, 1), 1))
+    chart.append(Candle(2, 2, 2, 2, datetime(2000, 1, 1), 1))
+    assert all(chart[:-1].close == before)
+    assert chart[-1].close == 2
+    assert view[-1].close == 1
+
+
+@pytest.mark.parametrize("window", [1, 5, 50])
+def test_rolling_window(window):
+    chart = Chart(open=[0.], high=[0.], low=[0.], close=[0.],
+                  timeframe=DAY_1,
+                  window=window)
+    for i in range(1, 300):
+        chart.append(Candle(i, i, i, i, datetime(2000, 1, 1), 1))
+    assert len(chart) == window
+    assert list(chart.close) == list(range(300 - window, 300))
+
+
+@pytest.mark.parametrize("mmap", [True, False])
+def test_save_load(chart, tmp_path, mmap):
+    path = tmp_path / "chart.xchart"
+    chart.save(path, instrument=Instrument(Symbol("SOME/THING"), DAY_3))
+    loaded = Chart.load(path, mmap=mmap)
+
+    assert loaded == chart
+    assert loaded.timeframe == chart.timeframe
+    assert loaded.timeframe.name == chart.timeframe.name
+    assert loaded.timestamp.equals(chart.timestamp)
+    header = _binary.read_header(path)
+    assert header.symbol == "SOME/THING"
+    assert header.instrument_timeframe == DAY_3
+
+
+def test_load_mmap_is_read_only(chart, tmp_path):
+    path = tmp_path / "chart.xchart"
+    chart.save(path)
+    loaded = Chart.load(path)
+
+    assert isinstance(loaded.close_array.base, np.memmap)
+    with pytest.raises(ValueError):
+        loaded.close_array[0] = 1
+    # Appending copies the mapped columns instead of writing the file.
+    loaded.append(Candle(1, 1, 1, 1, datetime(2100, 1, 1), 1))
+    assert len(loaded) == len(chart) + 1
+    assert Chart.load(path) == chart
+
+
+def test_save_empty(tmp_path):
+    path = tmp_path / "chart.xchart"
+    Chart().save(path)
+    assert len(Chart.load(path)) == 0
+
+
+def test_load_invalid(tmp_path):
+    path = tmp_path / "chart.xchart"
+    path.write_bytes(b"not a chart")
+    with pytest.raises(InvalidChartFile):
+        Chart.load(path)
+
+
+@pytest.fixture
+def arrays(chart):
+    return dict(open=chart.open_array.copy(),
+                high=chart.high_array.copy(),
+                low=chart.low_array.copy(),
+                close=chart.close_array.copy(),
+                volume=chart.volume_array.copy(),
+                timestamp=chart.timestamp.values.copy())
+
+
+class TestFromArrays:
+    def test_equal(self, chart, arrays):
+        result = Chart.from_arrays(**arrays, timeframe=DAY_3)
+        assert result == chart
+        assert result.timeframe == DAY_3
+        assert result.timestamp.equals(chart.timestamp)
+
+    def test_no_copy(self, arrays):
+        result = Chart.from_arrays(**arrays)
+        for name in ("open", "high", "low", "close", "volume"):
+            assert np.shares_memory(getattr(result, f"{name}_array"),
+                                    arrays[name])
+        assert np.shares_memory(result._storage.timestamp,
+                                arrays["timestamp"])
+
+    def test_append_does_not_write_arrays(self, arrays):
+        close = arrays["close"][:-1].copy()
+        result = Chart.from_arrays(**{name: array[:-1]
+                                      for name, array in arrays.items()})
+        result.append(Candle(1, 1, 1, 1, datetime(2100, 1, 1), 1))
+        assert np.array_equal(arrays["close"][:-1], close)
+
+    def test_conversions(self, chart, arrays):
+        arrays["volume"] = None
+        arrays["close"] = arrays["close"].astype(np.float32)
+        arrays["timestamp"] = arrays["timestamp"].astype("datetime64[s]")
+        result = Chart.from_arrays(**arrays)
+        assert np.array_equal(result.volume, np.ones(len(chart)))
+        assert result.close.dtype == np.float64
+        assert result.timestamp.equals(chart.timestamp)
+
+    @pytest.mark.parametrize("name, value", [
+        ("close", [1.0, 2.0]),
+        ("close", np.ones((2, 2))),
+        ("close", np.array(["a", "b"])),
+        ("timestamp", np.arange(2.0)),
+    ])
+    def test_invalid(self, arrays, name, value):
+        arrays = {key: array[:2] for key, array in arrays.items()}
+        arrays[name] = value
+        with pytest.raises(InvalidChartParameters):
+            Chart.from_arrays(**arrays)
+
+    def test_invalid_length(self, arrays):
+        arrays["close"] = arrays["close"][:-1]
+        with pytest.raises(IncorrectChartLength):
+            Chart.from_arrays(**arrays)
+
+    def test_unsorted(self, arrays):
+        arrays["timestamp"] = arrays["timestamp"][::-1].copy()
+        with pytest.raises(InvalidChartParameters):
+            Chart.from_arrays(**arrays)
+
+    def test_check_ohlc(self):
+        chart = Chart(df=utils.random_df(50))
+        arrays = dict(open=chart.open_array.copy(),
+                      high=chart.high_array.copy(),
+                      low=chart.low_array.copy(),
+                      close=chart.close_array.copy(),
+                      timestamp=chart.timestamp.values)
+        Chart.from_arrays(**arrays, check_ohlc=True)
+        arrays["high"][3] = arrays["low"][3] - 1
+        Chart.from_arrays(**arrays)
+        with pytest.raises(InvalidChartParameters, match="Candle 3"):
+            Chart.from_arrays(**arrays, check_ohlc=True)
+
+    def test_from_records(self, chart, arrays):
+        records = np.rec.fromarrays(
+            [arrays[name] for name in ("open", "high", "low",
+                                       "close", "timestamp")],
+            names="open,high,low,close,timestamp"
+        )
+        result = Chart.from_records(records)
+        assert result == chart
+        assert np.array_equal(result.volume, np.ones(len(chart)))
+
+        with pytest.raises(InvalidChartParameters):
+            Chart.from_records(records[["open", "high", "low", "close"]])
+        with pytest.raises(InvalidChartParameters):
+            Chart.from_records(chart.to_pandas())
+
+
+@pytest.fixture
+def minutes():
+    # Gaps make some periods shorter than others.
+    chart = Chart(df=utils.random_df(2000), timeframe=MINUTE_1)
+    timestamp = chart.timestamp.values.astype("datetime64[m]").astype(int)
+    timestamp = (timestamp[0] + np.cumsum(np.arange(2000) % 7 // 6 + 1))
+    return Chart.from_arrays(open=chart.open_array,
+                             high=chart.high_array,
+                             low=chart.low_array,
+                             close=chart.close_array,
+                             volume=np.arange(2000.0),
+                             timestamp=timestamp.astype("datetime64[m]"),
+                             timeframe=MINUTE_1)
+
+
+def _pandas_resample(chart, timeframe):
+    return chart.to_pandas().resample(timeframe.timedelta,
+                                      origin="epoch").agg(
+        {"Open": "first", "High": "max", "Low": "min",
+         "Close": "last", "Volume": "sum"}
+    ).dropna()
+
+
+class TestResample:
+    @pytest.mark.parametrize("timeframe", [MINUTE_15, HOUR_1, HOUR_4, DAY_1])
+    def test_matches_pandas(self, minutes, timeframe):
+        result = minutes.resample(timeframe)
+        assert result.timeframe == timeframe
+        pd.testing.assert_frame_equal(result.to_pandas(),
+                                      _pandas_resample(minutes, timeframe),
+                                      check_freq=False)
+
+    def test_cached(self, minutes):
+        assert minutes.resample(HOUR_1) is minutes.resample(HOUR_1)
+        assert minutes.resample(MINUTE_1) is minutes
+
+    def test_smaller_timeframe(self, minutes):
+        with pytest.raises(ValueError):
+            minutes.resample(MINUTE_1 / 2)
+
+    @pytest.mark.parametrize("step", [1, 13, 500])
+    def test_incremental(self, minutes, step):
+        base = minutes[:0]
+        for stop in range(step, len(minutes) + step, step):
+            for candle in minutes[stop - step:stop]:
+                base.append(candle)
+            # Slices are new charts, which are resampled at once.
+            assert base.resample(HOUR_1) == minutes[:stop].resample(HOUR_1)
+        assert np.array_equal(base.resample(HOUR_1).volume,
+                              minutes.resample(HOUR_1).volume)
+
+    def test_window(self, minutes):
+        base = Chart(timeframe=MINUTE_1, window=120)
+        for candle in minutes:
+            base.append(candle)
+            result = base.resample(HOUR_1)
+        assert len(result) <= 3
+        assert result[-1] == minutes.resample(HOUR_1)[-1]
+
+    def test_pickle(self, minutes):
+        minutes.resample(HOUR_1)
+        loaded = pickle.loads(pickle.dumps(minutes))
+        assert loaded == minutes
+        assert loaded._resamplers is None
+
@@ -0,0 +1,78 @@
+# Copyright 2023 Vladyslav Kochetov. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# =============================================================================
+import pytest
+
+from xoney.generic.candlestick import (Chart,
+                                       BinaryChartSource,
+                                       CSVChartSource,
+                                       ParquetChartSource)
+from xoney.generic.timeframes import DAY_1, HOUR_1
+from tests import utils
+
+
+@pytest.fixture
+def chart():
+    return Chart(df=utils.random_df(250), timeframe=HOUR_1)
+
+
+def _joined(source):
+    blocks = list(source.blocks())
+    assert all(len(block) <= source.block_size for block in blocks)
+    assert all(block.timeframe == source.timeframe for block in blocks)
+    chart = Chart(timeframe=source.timeframe)
+    for candle in source:
+        chart.append(candle)
+    return blocks, chart
+
+
+@pytest.mark.parametrize("block_size", [1, 64, 250, 1000])
+def test_binary(chart, tmp_path, block_size):
+    path = tmp_path / "chart.xchart"
+    chart.save(path)
+    source = BinaryChartSource(path, block_size=block_size)
+
+    assert source.timeframe == HOUR_1
+    blocks, joined = _joined(source)
+    assert len(blocks) == -(-len(chart) // block_size)
+    assert joined == chart
+
+
+@pytest.mark.parametrize("block_size", [1, 64, 1000])
+def test_csv(chart, tmp_path, block_size):
+    path = tmp_path / "chart.csv"
+    chart.to_pandas().to_csv(path)
+    source = CSVChartSource(path,
+                            timeframe=HOUR_1,
+                            block_size=block_size,
+                            float_precision="round_trip")
+
+    blocks, joined = _joined(source)
+    assert len(blocks) == -(-len(chart) // block_size)
+    assert joined == chart
+
+
+def test_parquet(chart, tmp_path):
+    pytest.importorskip("pyarrow")
+    path = tmp_path / "chart.parquet"
+    chart.to_pandas().to_parquet(path)
+    source = ParquetChartSource(path, timeframe=HOUR_1, block_size=64)
+
+    _, joined = _joined(source)
+    assert joined == chart
+
+
+def test_invalid_block_size(tmp_path):
+    with pytest.raises(ValueError):
+        CSVChartSource(tmp_path / "chart.csv", timeframe=DAY_1, block_size=0)
@@ -12,6 +12,8 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 # =============================================================================
+import pickle
+
 import numpy as np
 import pytest
 
@@ -111,3 +113,57 @@ def test_op(equity_1d, op, equity_1d_2):
                          [2.5, 6, 1, 2])
 def test_op_float(op, equity_1d, val):
     assert op(equity_1d, val) == Equity(op(equity_1d.as_array(), val))
+
+
+@pytest.mark.parametrize("index", [0, 4, -1])
+def test_getitem_float(equity_1d, index):
+    balance = equity_1d[index]
+    assert type(balance) is float
+    assert balance == equity_1d.as_array()[index]
+
+
+def test_as_array_is_view(equity_1d):
+    array = equity_1d.as_array()
+    assert np.shares_memory(array, equity_1d.as_array())
+    with pytest.raises(ValueError):
+        array[0] = 100
+
+
+def test_update_keeps_views(equity_1d):
+    array = equity_1d.as_array()
+    equity_1d.append(11)
+    equity_1d.update(12)
+    equity_1d.update(13)
+    assert list(array) == list(range(1, 11))
+    assert list(equity_1d) == [*range(1, 11), 13]
+
+
+def test_reserve(equity_1d):
+    equity_1d.reserve(100)
+    buffer = equity_1d._buffer
+    for balance in range(11, 101):
+        equity_1d.append(balance)
+    assert equity_1d._buffer is buffer
+    assert list(equity_1d) == list(range(1, 101))
+
+
+def test_append_growth():
+    equity = Equity([])
+    for balance in range(1, 1000):
+        equity.append(balance)
+    assert equity.capacity >= len(equity) == 999
+    assert equity.as_array()[-1] == 999
+
+
+def test_update_empty():
+    with pytest.raises(IndexError):
+        Equity([]).update(1)
+
+
+def test_pickle(equity_1d):
+    equity_1d.reserve(1000)
+    copied = pickle.loads(pickle.dumps(equity_1d))
+    assert copied == equity_1d
+    assert copied.capacity == len(equity_1d)
+    copied.append(11)
+    assert len(copied) == len(equity_1d) + 1
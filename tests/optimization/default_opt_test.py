@@ -12,14 +12,32 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 # =============================================================================
+import numpy as np
 import pytest
+from optuna.pruners import BasePruner, MedianPruner
+from optuna.trial import TrialState
 
-from xoney.optimization import DefaultOptimizer
-from xoney.backtesting import Backtester
-from xoney.analysis.metrics import SharpeRatio
-from xoney.strategy import Parameter
+from xoney import TradingSystem, Symbol, Instrument, Chart
+from xoney.generic.routes import ChartContainer
+from xoney.optimization import (DefaultOptimizer,
+                                GeneticAlgorithmOptimizer,
+                                MemoryCache,
+                                ShelveCache,
+                                _processes)
+from xoney.optimization.cache import (metric_settings,
+                                      score_key,
+                                      system_signature)
+from xoney.backtesting import Backtester, VectorizedBacktester
+from xoney.analysis.metrics import SharpeRatio, MaxDrawDown, YearProfit
+from xoney.generic.timeframes import DAY_1
+from xoney.strategy import (Parameter,
+                            IntParameter,
+                            VectorizedStrategy,
+                            Signals)
 from xoney.system.exceptions import UnexpectedParameter
 
+from tests import utils
+
 
 @pytest.fixture
 def optimizer():
@@ -34,3 +52,273 @@ def test_parameter(optimizer, system, charts):
 def test_no_trials(optimizer, system, charts):
     with pytest.raises(ValueError):
         optimizer.run(system, charts, n_trials=None)
+
+
+class MomentumStrategy(VectorizedStrategy):
+    def __init__(self, lag=3):
+        super().__init__(lag=lag)
+        self.lag = lag
+
+    @property
+    def parameters(self):
+        return dict(lag=IntParameter(min=1, max=10))
+
+    def signals(self, chart):
+        position = np.zeros(len(chart))
+        position[self.lag:] = np.sign(chart.close_array[self.lag:]
+                                      - chart.close_array[:-self.lag])
+        return Signals(position=position)
+
+
+@pytest.fixture
+def momentum_instrument():
+    return Instrument(Symbol("SOME/THING"), DAY_1)
+
+
+@pytest.fixture
+def momentum_system(momentum_instrument):
+    return TradingSystem({MomentumStrategy(): [momentum_instrument]})
+
+
+@pytest.fixture
+def momentum_charts(momentum_instrument):
+    return {momentum_instrument: Chart(df=utils.random_df(100))}
+
+
+@pytest.mark.parametrize("batch_size", [None, 2, 5])
+def test_batch_size(batch_size, momentum_system, momentum_charts):
+    optimizer = DefaultOptimizer(VectorizedBacktester(), SharpeRatio,
+                                 n_jobs=1, batch_size=batch_size)
+    optimizer.run(momentum_system, momentum_charts, n_trials=5)
+    assert len(optimizer._study.trials) == 5
+    assert len(optimizer.best_systems(n=2)) == 2
+
+
+@pytest.mark.parametrize("batch_size", [None, 3])
+def test_processes(batch_size, momentum_system, momentum_charts):
+    optimizer = DefaultOptimizer(VectorizedBacktester(), SharpeRatio,
+                                 n_jobs=2, batch_size=batch_size,
+                                 use_processes=True)
+    optimizer.run(momentum_system, momentum_charts, n_trials=7)
+    trials = optimizer._study.trials
+    assert len(trials) == 7
+    assert all(trial.value is not None for trial in trials)
+
+    # Scores of the workers are the same as of the main process.
+    for trial in trials:
+        equity = optimizer._backtest(optimizer._trial_to_system(trial))
+        assert np.isclose(equity.evaluate(SharpeRatio), trial.value)
+
+
+@pytest.mark.parametrize("use_processes, batch_size",
+                         [(False, None), (False, 3), (True, None)])
+def test_multi_objective(use_processes, batch_size,
+                         momentum_system, momentum_charts):
+    optimizer = DefaultOptimizer(VectorizedBacktester(),
+                                 [YearProfit, MaxDrawDown],
+                                 n_jobs=2, batch_size=batch_size,
+                                 use_processes=use_processes)
+    optimizer.run(momentum_system, momentum_charts, n_trials=8)
+    assert optimizer.multi_objective
+    assert len(optimizer._study.directions) == 2
+
+    front = optimizer._best_trials(n=8)
+    assert {trial.number for trial in front} == \
+           {trial.number for trial in optimizer._study.best_trials}
+    profits = [trial.values[0] for trial in front]
+    assert profits == sorted(profits, reverse=True)
+    for trial in front:
+        equity = optimizer._backtest(optimizer._trial_to_system(trial))
+        assert np.allclose(trial.values, [equity.evaluate(YearProfit),
+                                          equity.evaluate(MaxDrawDown)])
+    assert len(optimizer.best_systems(n=1)) == 1
+
+
+def test_no_metrics():
+    with pytest.raises(ValueError):
+        DefaultOptimizer(Backtester(), [])
+
+
+def test_shared_charts():
+    instrument = Instrument(Symbol("SOME/THING"), DAY_1)
+    chart = Chart(df=utils.random_df(50))
+    charts = ChartContainer({instrument: chart})
+
+    with _processes.SharedCharts(charts) as shared:
+        blocks, attached = _processes.attach_charts(shared.handle)
+        assert attached[instrument] == chart
+        assert attached[instrument].timeframe == chart.timeframe
+        # Appending to an attached chart does not write into the block.
+        attached[instrument].append(chart[-1])
+        assert len(attached[instrument]) == len(chart) + 1
+        again, reattached = _processes.attach_charts(shared.handle)
+        assert reattached[instrument] == chart
+        del attached, reattached
+        blocks += again
+        for block in blocks:
+            block.close()
+
+
+@pytest.mark.parametrize("use_processes, batch_size",
+                         [(False, None), (False, 4), (True, 2)])
+def test_cache(use_processes, batch_size, momentum_system, momentum_charts):
+    cache = MemoryCache()
+    optimizer = DefaultOptimizer(VectorizedBacktester(), SharpeRatio,
+                                 n_jobs=1, batch_size=batch_size,
+                                 use_processes=use_processes, cache=cache)
+    # Only 10 lags can be suggested.
+    optimizer.run(momentum_system, momentum_charts, n_trials=30)
+    assert len(cache) <= 10
+    assert cache.hits + cache.misses == 30
+    assert cache.hits >= 10
+    for trial in optimizer._study.trials:
+        equity = optimizer._backtest(optimizer._trial_to_system(trial))
+        assert np.isclose(equity.evaluate(SharpeRatio), trial.value)
+
+
+def test_cache_fingerprint(momentum_instrument, momentum_system):
+    cache = MemoryCache()
+    optimizer = DefaultOptimizer(VectorizedBacktester(), SharpeRatio,
+                                 n_jobs=1, cache=cache)
+    for _ in range(2):
+        stored = len(cache)
+        charts = {momentum_instrument: Chart(df=utils.random_df(100))}
+        optimizer.run(momentum_system, charts, n_trials=10)
+        assert len(cache) > stored
+
+
+class ReversalStrategy(MomentumStrategy):
+    def signals(self, chart):
+        signals = super().signals(chart)
+        return Signals(position=-signals.position)
+
+
+def test_cache_strategies(momentum_instrument, momentum_charts):
+    cache = MemoryCache()
+    for strategy in (MomentumStrategy, ReversalStrategy):
+        optimizer = DefaultOptimizer(VectorizedBacktester(), SharpeRatio,
+                                     n_jobs=1, cache=cache)
+        optimizer.run(TradingSystem({strategy(): [momentum_instrument]}),
+                      momentum_charts,
+                      n_trials=15)
+        for trial in optimizer._study.trials:
+            equity = optimizer._backtest(optimizer._trial_to_system(trial))
+            assert np.isclose(equity.evaluate(SharpeRatio), trial.value,
+                              equal_nan=True)
+    assert len(cache) > 10
+
+
+def test_cache_key_settings(momentum_system):
+    other_instrument = Instrument(Symbol("OTHER/THING"), DAY_1)
+    flatten = {"s0p0": 1, "max_trades": 1}
+
+    def key(system=momentum_system, backtester=None, metric=SharpeRatio()):
+        return score_key(flatten=flatten,
+                         fingerprint="charts",
+                         signature=system_signature(system),
+                         backtester=backtester or VectorizedBacktester(),
+                         metrics=[metric_settings(metric)])
+
+    assert key() == key()
+    assert key() != key(system=TradingSystem(
+        {MomentumStrategy(): [other_instrument]}
+    ))
+    assert key() != key(backtester=VectorizedBacktester(time_adjustment=0.1))
+    assert key() != key(metric=SharpeRatio(risk_free=0.01))
+
+
+def test_memory_cache_lru():
+    cache = MemoryCache(maxsize=2)
+    cache.set("a", 1.0)
+    cache.set("b", 2.0)
+    assert cache.get("a") == 1.0
+    cache.set("c", 3.0)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1.0
+    assert (cache.hits, cache.misses) == (2, 1)
+
+
+def test_shelve_cache(tmp_path):
+    path = str(tmp_path / "scores")
+    with ShelveCache(path, maxsize=1) as cache:
+        cache.set("a", 1.0)
+        cache.set("b", (2.0, 3.0))
+    with ShelveCache(path) as cache:
+        assert cache.get("a") == 1.0
+        assert cache.get("b") == (2.0, 3.0)
+
+
+class _PruneAfter(BasePruner):
+    def __init__(self, step):
+        self.step = step
+
+    def prune(self, study, trial):
+        return trial.last_step is not None and trial.last_step >= self.step
+
+
+@pytest.mark.parametrize("optimizer_type", [DefaultOptimizer,
+                                            GeneticAlgorithmOptimizer])
+def test_pruner(optimizer_type, momentum_system, momentum_charts):
+    optimizer = optimizer_type(Backtester(), SharpeRatio, n_jobs=1,
+                               pruner=_PruneAfter(step=30),
+                               n_checkpoints=9)
+    optimizer.run(momentum_system, momentum_charts, n_trials=3)
+
+    trials = optimizer._study.trials
+    assert all(trial.state == TrialState.PRUNED for trial in trials)
+    # Checkpoints are at every 10th tick, the first after step 30 stops.
+    assert all(trial.last_step == 39 for trial in trials)
+    assert optimizer.best_systems(n=3) == []
+
+
+def test_median_pruner(momentum_system, momentum_charts):
+    optimizer = DefaultOptimizer(Backtester(), SharpeRatio, n_jobs=1,
+                                 pruner=MedianPruner(n_startup_trials=2))
+    optimizer.run(momentum_system, momentum_charts, n_trials=6)
+
+    states = {trial.state for trial in optimizer._study.trials}
+    assert states <= {TrialState.COMPLETE, TrialState.PRUNED}
+    assert len(optimizer.best_systems(n=6)) >= 2
+
+
+@pytest.mark.parametrize("kwargs", [dict(batch_size=2),
+                                    dict(use_processes=True),
+                                    dict(metric=[SharpeRatio, MaxDrawDown])])
+def test_pruner_options(kwargs):
+    kwargs = dict(dict(metric=SharpeRatio), **kwargs)
+    with pytest.raises(ValueError):
+        DefaultOptimizer(Backtester(), pruner=MedianPruner(), **kwargs)
+
+
+def test_pruner_vectorized():
+    with pytest.raises(ValueError):
+        DefaultOptimizer(VectorizedBacktester(),
+                         metric=SharpeRatio,
+                         pruner=MedianPruner())
+
+
+def test_genetic_positional_arguments():
+    optimizer = GeneticAlgorithmOptimizer(Backtester(), SharpeRatio, None,
+                                          1, 4, 10, None, 0.8, 0.4, 0)
+    assert optimizer.n_trials == 4
+    assert optimizer._study_params["sampler"]._population_size == 10
+    assert optimizer.batch_size is None
+    assert not optimizer.use_processes
+
+
+def test_clone(momentum_system, momentum_charts):
+    cache = MemoryCache()
+    optimizer = DefaultOptimizer(VectorizedBacktester(), SharpeRatio,
+                                 n_jobs=1, cache=cache)
+    optimizer.run(momentum_system, momentum_charts, n_trials=3)
+
+    clone = optimizer.clone()
+    assert not hasattr(clone, "_study")
+    assert not hasattr(clone, "_charts")
+    assert clone._backtester is not optimizer._backtester
+    assert clone._metric is not optimizer._metric
+    assert clone.cache is cache
+    assert len(optimizer._study.trials) == 3
+
+    clone.run(momentum_system, momentum_charts, n_trials=2)
+    assert len(clone._study.trials) == 2
@@ -16,6 +16,10 @@ import pytest
 
 from xoney.optimization.validation.walkforward import WFSampler
 from xoney.optimization.validation.validator import Validator
+from xoney.optimization.validation.executors import (SerialExecutor,
+                                                     ThreadExecutor,
+                                                     ProcessExecutor,
+                                                     ChunkedExecutor)
 from xoney.optimization import GeneticAlgorithmOptimizer, DefaultOptimizer
 from xoney.backtesting import Backtester
 from xoney.analysis.metrics import SharpeRatio
@@ -24,6 +28,8 @@ from xoney import TradingSystem
 from xoney.strategy import IntParameter
 from xoney.generic import Equity
 
+from tests import utils
+
 
 instrument = Instrument("SOME/THING", timeframes.DAY_1)
 
@@ -92,3 +98,40 @@ def test_equity(charts, system, sampler):
     equities = validator.equities
     for e in equities:
         assert isinstance(e, Equity)
+
+
+@pytest.mark.parametrize("executor", [SerialExecutor(),
+                                      ThreadExecutor(n_jobs=2),
+                                      ProcessExecutor(n_jobs=2),
+                                      ChunkedExecutor(n_jobs=2)])
+def test_executors(system, executor):
+    charts = ChartContainer({instrument: Chart(df=utils.random_df(60))})
+
+    def make_sampler():
+        return WFSampler(timeframes.DAY_1 * 10,
+                         timeframes.DAY_1 * 10,
+                         optimizer=GeneticAlgorithmOptimizer(
+                             backtester=Backtester(),
+                             metric=SharpeRatio,
+                             n_jobs=1,
+                             n_trials=2,
+                             # Unseeded samplers suggest other parameters
+                             # in every run, so the best systems and their
+                             # equities would differ between executors.
+                             # Every window clones the optimizer with its
+                             # sampler, so the seed gives every window the
+                             # same suggestions whichever executor runs it.
+                             seed=0),
+                         backtester=Backtester())
+
+    serial = Validator(charts=charts, sampler=make_sampler())
+    serial.test(system)
+    validator = Validator(charts=charts,
+                          sampler=make_sampler(),
+                          executor=executor)
+    validator.test(system)
+
+    assert len(validator.equities) == len(serial.equities) > 1
+    for equity, expected in zip(validator.equities, serial.equities):
+        assert equity == expected
+        assert list(equity._timestamp) == list(expected._timestamp)
@@ -12,6 +12,9 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 # =============================================================================
+import pickle
+
+import numpy as np
 import pytest
 
 from xoney import ChartContainer, Instrument, timeframes, Chart
@@ -47,3 +50,74 @@ def test_len_chartcontainer_custom(custom_charts):
 
 def test_iter_container(custom_charts, charts_dict):
     assert list(custom_charts) == list(charts_dict)
+
+
+def test_slice_cache(custom_charts, charts_dict):
+    start, stop = custom_charts.start, custom_charts.end
+    window = custom_charts[start:stop]
+    assert custom_charts[start:stop] is window
+    assert custom_charts[0:5] is not window
+    for instrument, chart in charts_dict.items():
+        assert window[instrument] == chart[start:stop]
+        assert np.shares_memory(window[instrument].close_array,
+                                chart.close_array)
+
+
+def test_slice_cache_append(custom_charts, charts_dict):
+    window = custom_charts[0:3]
+    for chart in charts_dict.values():
+        chart.append(chart[-1])
+    assert custom_charts[0:3] is not window
+
+
+def test_slice_cache_same_length(custom_charts, charts_dict):
+    window = custom_charts[0:3]
+    for chart in charts_dict.values():
+        last = chart[-1]
+        chart._storage.pop()
+        chart.append(last)
+    assert custom_charts[0:3] is not window
+
+
+def test_slice_cache_size(custom_charts):
+    custom_charts.slice_cache_size = 2
+    first = custom_charts[0:1]
+    custom_charts[0:2]
+    assert custom_charts[0:1] is first
+    custom_charts[0:3]
+    custom_charts[0:4]
+    assert len(custom_charts._slices) == 2
+    assert custom_charts[0:1] is not first
+
+
+def test_pickle_container(custom_charts):
+    custom_charts[0:3]
+    restored = pickle.loads(pickle.dumps(custom_charts))
+    assert list(restored) == list(custom_charts)
+    assert restored[0:3][list(restored)[0]] == custom_charts[0:3][
+        list(custom_charts)[0]
+    ]
+
+
+@pytest.mark.parametrize("mmap", [True, False])
+def test_save_load_container(custom_charts, charts_dict, tmp_path, mmap):
+    custom_charts.save(tmp_path)
+    loaded = ChartContainer.load(tmp_path, mmap=mmap)
+
+    assert len(loaded) == len(custom_charts)
+    for instrument, chart in charts_dict.items():
+        assert loaded[instrument] == chart
+        assert loaded[instrument].timeframe == chart.timeframe
+
+
+def test_from_base(dataframe):
+    base = Chart(df=dataframe, timeframe=timeframes.HOUR_1)
+    instruments = [Instrument("BTC/USD", timeframes.HOUR_1),
+                   Instrument("BTC/USD", timeframes.HOUR_4),
+                   Instrument("ETH/USD", timeframes.DAY_1)]
+    charts = ChartContainer.from_base(base, instruments)
+
+    assert charts[instruments[0]] is base
+    for instrument in instruments:
+        assert charts[instrument] == base.resample(instrument.timeframe)
+        assert charts[instrument].timeframe == instrument.timeframe
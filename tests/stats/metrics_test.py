@@ -143,3 +143,76 @@ def test_equity_method(equity_1d_15_pct_dd):
     by_evaluate = evaluate_metric(SortinoRatio, equity_1d_15_pct_dd)
     by_method = equity_1d_15_pct_dd.evaluate(SortinoRatio)
     assert is_equal(by_method, by_evaluate)
+
+
+class TestRunningMetrics:
+    pairs = [(RunningYearProfit, YearProfit),
+             (RunningMaxDrawDown, MaxDrawDown),
+             (RunningCalmarRatio, CalmarRatio),
+             (RunningSharpeRatio, SharpeRatio),
+             (RunningSortinoRatio, SortinoRatio)]
+
+    @pytest.mark.parametrize("running, default", pairs)
+    def test_calculate(self, equity_1d_15_pct_dd, running, default):
+        assert is_equal(evaluate_metric(running, equity_1d_15_pct_dd),
+                        evaluate_metric(default, equity_1d_15_pct_dd))
+
+    @pytest.mark.parametrize("running, default", pairs)
+    def test_track(self, equity_1d_15_pct_dd, running, default):
+        equity = Equity(equity_1d_15_pct_dd.as_array()[:2])
+        metric = equity.track(running())
+        for balance in equity_1d_15_pct_dd.as_array()[2:]:
+            equity.append(balance * 2)
+            equity.update(balance)
+        assert is_equal(metric.value,
+                        evaluate_metric(default, equity_1d_15_pct_dd))
+
+    @pytest.mark.parametrize("risk_free", [0.05, 0.2])
+    def test_risk_free(self, equity_1d_15_pct_dd, risk_free):
+        assert is_equal(
+            evaluate_metric(RunningSortinoRatio(risk_free=risk_free),
+                            equity_1d_15_pct_dd),
+            evaluate_metric(SortinoRatio(risk_free=risk_free),
+                            equity_1d_15_pct_dd)
+        )
+
+    def test_replace_empty(self):
+        with pytest.raises(ValueError):
+            RunningMaxDrawDown().replace(1.0)
+
+    def test_positive(self):
+        assert not RunningMaxDrawDown().positive
+        assert RunningSharpeRatio().positive
+
+
+class TestEvaluateMany:
+    metrics = [YearProfit, MaxDrawDown, CalmarRatio,
+               SharpeRatio, SortinoRatio, SortinoRatio(risk_free=0.1)]
+
+    def test_values(self, equity_1d_15_pct_dd):
+        values = equity_1d_15_pct_dd.evaluate_many(self.metrics)
+        assert list(values) == self.metrics
+        for metric, value in values.items():
+            assert is_equal(value, equity_1d_15_pct_dd.evaluate(metric))
+
+    def test_shared(self, equity_1d_15_pct_dd, monkeypatch):
+        calls = {"exponential_regression": 0, "change": 0}
+        for name in calls:
+            method = getattr(Equity, name)
+
+            def counted(self, method=method, name=name):
+                calls[name] += 1
+                return method(self)
+
+            monkeypatch.setattr(Equity, name, counted)
+
+        equity_1d_15_pct_dd.evaluate_many(self.metrics)
+        assert calls == {"exponential_regression": 1, "change": 1}
+
+    def test_read_only(self, equity_1d_15_pct_dd):
+        class Appending(MaxDrawDown):
+            def calculate(self, equity):
+                equity.append(1.0)
+
+        with pytest.raises(TypeError):
+            equity_1d_15_pct_dd.evaluate_many([Appending])
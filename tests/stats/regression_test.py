@@ -0,0 +1,73 @@
+# Copyright 2022 Vladyslav Kochetov. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# =============================================================================
+import numpy as np
+import pytest
+
+from xoney.analysis.regression import LinearRegression, ExponentialRegression
+
+
+@pytest.fixture
+def array():
+    rng = np.random.default_rng(0)
+    return np.cumprod(1 + rng.normal(0.001, 0.02, 1000))
+
+
+def test_linear_polyfit(array):
+    model = LinearRegression()
+    model.fit(array=array)
+    slope, intercept = np.polyfit(np.arange(len(array)), array, 1)
+
+    assert model.slope == pytest.approx(slope, rel=1e-9)
+    assert model.intercept == pytest.approx(intercept, rel=1e-9)
+    assert np.allclose(model.curve, np.arange(len(array)) * slope + intercept)
+
+
+def test_extend(array):
+    model = LinearRegression()
+    model.fit(array=array)
+    extended = LinearRegression()
+    for part in np.array_split(array, 7):
+        extended.extend(part)
+
+    assert extended.slope == pytest.approx(model.slope, rel=1e-9)
+    assert extended.intercept == pytest.approx(model.intercept, rel=1e-9)
+
+
+def test_append(array):
+    model = LinearRegression()
+    model.fit(array=array)
+    appended = LinearRegression()
+    for value in array:
+        appended.append(value)
+
+    assert appended.count == model.count == len(array)
+    assert appended.slope == pytest.approx(model.slope, rel=1e-9)
+    assert appended.intercept == pytest.approx(model.intercept, rel=1e-9)
+
+
+def test_refit(array):
+    model = LinearRegression()
+    model.fit(array=array[:10])
+    model.fit(array=array)
+
+    assert len(model.curve) == len(array)
+
+
+def test_exponential_growth():
+    model = ExponentialRegression()
+    model.fit(array=1.01 ** np.arange(50))
+
+    assert model.growth == pytest.approx(1.01)
+    assert np.allclose(model.curve, 1.01 ** np.arange(50))
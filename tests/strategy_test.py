@@ -125,3 +125,21 @@ def test_parameters_impl():
     strategy = BollingerTrendStrategy(length=50, dev=2)
     with pytest.warns(UserWarning):
         strategy.parameters
+
+
+def test_settings_not_shared():
+    first = BollingerTrendStrategy(length=10, dev=1)
+    second = BollingerTrendStrategy(length=20, dev=2)
+
+    assert first.settings == dict(length=10, dev=1)
+    assert second.settings == dict(length=20, dev=2)
+    assert "length" not in Strategy._settings
+
+
+def test_clone():
+    strategy = BollingerTrendStrategy(length=10, dev=1)
+    clone = strategy.clone()
+
+    assert type(clone) is BollingerTrendStrategy
+    assert clone is not strategy
+    assert clone.settings == strategy.settings
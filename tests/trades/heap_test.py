@@ -28,6 +28,7 @@ from xoney.generic.trades.levels import (
     AveragingEntry
 )
 
+from xoney.generic.symbol import Symbol
 from xoney.math import is_equal, is_zero
 
 
@@ -164,3 +165,98 @@ def test_cleanup_closed(trade_heap,
     assert not len(trade_heap.active)
     trade_heap.cleanup_closed()
     assert not len(trade_heap)
+
+
+def _closed_trade(trade):
+    trade.cleanup()
+    assert trade.status == TradeStatus.CLOSED
+    return trade
+
+
+def test_symbol_index(trade, trade_2, candle_below_entry):
+    trade._set_symbol(Symbol("SOME/THING"))
+    trade_heap = TradeHeap([trade, trade_2])
+    trade_2._set_symbol(Symbol("OTHER/THING"))
+
+    trade_heap.update_symbol_trades(candle_below_entry, Symbol("SOME/THING"))
+    assert not is_zero(trade.filled_volume)
+    assert is_zero(trade_2.filled_volume)
+
+    trade_heap.update_symbol_trades(candle_below_entry, Symbol("OTHER/THING"))
+    assert not is_zero(trade_2.filled_volume)
+    trade_heap.update_symbol_trades(candle_below_entry, Symbol("NO/THING"))
+
+
+def test_cleanup_all_closed(trade, trade_2, entries, breakouts):
+    third = Trade(side=TradeSide.SHORT,
+                  entries=copy.deepcopy(entries),
+                  breakouts=copy.deepcopy(breakouts),
+                  potential_volume=10.0)
+    trade_heap = TradeHeap([trade, trade_2, third])
+    _closed_trade(trade)
+    _closed_trade(trade_2)
+
+    assert list(trade_heap.closed) == [trade, trade_2]
+    assert list(trade_heap.active) == [third]
+    trade_heap.cleanup_closed()
+    assert list(trade_heap) == [third]
+    assert not len(trade_heap.closed)
+
+
+def test_remove_equal(trade, trade_2):
+    trade_heap = TradeHeap([trade, trade_2])
+    trade_heap.remove(copy.deepcopy(trade_2))
+    assert list(trade_heap) == [trade]
+    trade_heap.remove(trade)
+    assert not len(trade_heap)
+    assert not trade._heaps
+
+
+def test_copy_keeps_index(trade, trade_2):
+    trade._set_symbol(Symbol("SOME/THING"))
+    trade_heap = TradeHeap([trade, trade_2])
+    copied = copy.deepcopy(trade_heap)
+    assert copied == trade_heap
+
+    copied_trade = copied[0]
+    _closed_trade(copied_trade)
+    assert list(copied.closed) == [copied_trade]
+    assert not len(trade_heap.closed)
+    assert copied._by_symbol[Symbol("SOME/THING")] == \
+           {id(copied_trade): copied_trade}
+
+
+def test_cached_aggregates(trade, trade_2,
+                           candle_below_entry,
+                           candle_below_averaging_entry,
+                           candle_above_take_profit):
+    trade._set_symbol(Symbol("SOME/THING"))
+    trade_2._set_symbol(Symbol("OTHER/THING"))
+    trade_heap = TradeHeap([trade, trade_2])
+
+    def check():
+        trades = list(trade_heap)
+        for name in ("potential_volume", "filled_volume", "profit"):
+            expected = sum(getattr(t, name) for t in trades)
+            assert is_equal(getattr(trade_heap, name), expected)
+            assert is_equal(getattr(TradeHeap(trades, _bound=False), name),
+                            expected)
+
+    assert is_equal(trade_heap.potential_volume, 200)
+    trade_heap.update_trades(candle_below_entry)
+    check()
+    trade_heap.update_symbol_trades(candle_below_averaging_entry,
+                                    Symbol("SOME/THING"))
+    check()
+    trade_heap.mark_symbol_trades(33_000, Symbol("OTHER/THING"))
+    check()
+    trade_heap.update_symbol_trades(candle_above_take_profit,
+                                    Symbol("OTHER/THING"))
+    check()
+    trade.cleanup()
+    check()
+    assert trade_heap.count(TradeStatus.CLOSED) == 1
+    trade_heap.cleanup_closed()
+    check()
+    trade_heap.remove(trade_2)
+    assert trade_heap.profit == trade_heap.potential_volume == 0
@@ -14,10 +14,15 @@
 # =============================================================================
 import copy
 
+import numpy as np
 import pytest
 
 from xoney.generic.trades import Trade, TradeHeap
-from xoney.generic.trades.levels import StopLoss, TakeProfit, LevelHeap, SimpleEntry
+from xoney.generic.trades.levels import (StopLoss,
+                                         TakeProfit,
+                                         LevelHeap,
+                                         SimpleEntry,
+                                         AveragingEntry)
 from xoney.generic.enums import TradeSide
 from xoney.generic.candlestick import Candle
 from xoney.math import is_equal
@@ -171,8 +176,128 @@ def test_pending(trade_short):
     levels: LevelHeap = trade_short._Trade__breakouts
     assert levels.pending == levels
 
+    # Breakouts are checked from the candle after the entry.
+    trade_short.update(Candle(35_000, 35_000, 35_000, 35_000))
+    assert levels.pending == levels
     trade_short.update(Candle(1, 1, 1, 1))
     trade_short.update(Candle(99999, 99999, 99999, 99999))
 
     assert not len(levels.pending)
     assert len(levels.crossed) == 2
+
+
+class _Vectorized:
+    StopLoss = StopLoss
+    TakeProfit = TakeProfit
+    SimpleEntry = SimpleEntry
+    AveragingEntry = AveragingEntry
+
+
+class _Sequential:
+    # Subclasses of the default levels are updated one by one.
+    class StopLoss(StopLoss):
+        pass
+
+    class TakeProfit(TakeProfit):
+        pass
+
+    class SimpleEntry(SimpleEntry):
+        pass
+
+    class AveragingEntry(AveragingEntry):
+        pass
+
+
+def _random_trade(levels, side, rng):
+    entries = [levels.SimpleEntry(100, 0.2)]
+    entries += [levels.AveragingEntry(100 - side * step, 0.01)
+                for step in rng.uniform(0, 20, 50)]
+    breakouts = [levels.StopLoss(100 - side * 15, 0.5),
+                 levels.TakeProfit(100 + side * 10, 0.3),
+                 levels.StopLoss(100 - side * 25, 0.5)]
+    trade_side = TradeSide.LONG if side > 0 else TradeSide.SHORT
+    return Trade(trade_side,
+                 entries=LevelHeap(entries),
+                 breakouts=LevelHeap(breakouts),
+                 potential_volume=100)
+
+
+@pytest.mark.parametrize("side", [1, -1])
+def test_vectorized_update(side):
+    trades = []
+    breakouts = []
+    for levels in (_Vectorized, _Sequential):
+        trade = _random_trade(levels, side, np.random.default_rng(0))
+        crossed = []
+        for level in trade._levels:
+            level.add_on_breakout_callback(
+                lambda level, crossed=crossed:
+                crossed.append(level.trigger_price)
+            )
+        trades.append(trade)
+        breakouts.append(crossed)
+
+    rng = np.random.default_rng(1)
+    for close in 100 + np.cumsum(rng.normal(0, 2, 60)):
+        candle = Candle(close, close + 3, close - 3, close)
+        for trade in trades:
+            trade.update(candle)
+        vectorized, sequential = trades
+        assert is_equal(vectorized.filled_volume, sequential.filled_volume)
+        assert is_equal(vectorized.profit, sequential.profit)
+        for level, expected in zip(vectorized._levels, sequential._levels):
+            assert level.crossed == expected.crossed
+            assert is_equal(level.quote_volume, expected.quote_volume)
+    assert breakouts[0] == breakouts[1]
+    assert breakouts[0]
+
+
+def test_small_heaps_are_not_vectorized(trade_short):
+    trade_short.update(Candle(35_000, 35_000, 35_000, 35_000))
+    trade_short.update(Candle(35_000, 35_000, 35_000, 35_000))
+    assert trade_short._Trade__entries._arrays is None
+    assert trade_short._Trade__breakouts._arrays is None
+
+    trade = _random_trade(_Vectorized, 1, np.random.default_rng(0))
+    trade.update(Candle(100, 100, 100, 100))
+    assert trade._Trade__entries._arrays is not None
+
+
+def test_edit_price_invalidates(trade_short):
+    entries = trade_short._Trade__entries
+    stop_loss = trade_short._Trade__breakouts[0]
+    trade_short.update(Candle(35_000, 35_000, 35_000, 35_000))
+    stop_loss.edit_trigger_price(36_000)
+    trade_short.update(Candle(35_500, 36_500, 35_500, 36_000))
+    assert entries[0].crossed
+    assert stop_loss.crossed
+
+
+def test_copy_is_rebound(trade_short):
+    trade_short.update(Candle(35_000, 35_000, 35_000, 35_000))
+    breakouts = trade_short._Trade__breakouts
+    copied = copy.deepcopy(breakouts)
+    assert copied._arrays is None
+    assert all(level._heaps == [copied] for level in copied)
+    assert all(not level._heaps for level in breakouts.get_members())
+
+
+def test_crossed_volume_cache(trade_short):
+    entries = trade_short._Trade__entries
+    trade_short.update(Candle(1, 1, 1, 1))
+    assert entries._crossed_volumes is not None
+    assert is_equal(entries.crossed_quote_volume,
+                    entries.crossed.quote_volume)
+
+    # Snapshots are not bound and do not cache.
+    crossed = entries.crossed
+    assert not crossed._bound
+    crossed.crossed_quote_volume
+    assert crossed._crossed_volumes is None
+
+    stop_loss = trade_short._Trade__breakouts[0]
+    breakouts = trade_short._Trade__breakouts
+    volume = breakouts.crossed_quote_volume
+    trade_short.update(Candle(99_999, 99_999, 99_999, 99_999))
+    assert stop_loss.crossed
+    assert breakouts.crossed_quote_volume > volume
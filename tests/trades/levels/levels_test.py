@@ -13,6 +13,7 @@
 # limitations under the License.
 # =============================================================================
 import pytest
+from copy import deepcopy
 
 from xoney.generic.trades.levels import TakeProfit, Level
 from xoney.generic.enums import TradeSide
@@ -136,6 +137,36 @@ class TestCallbacks:
 
         assert callback_var == 5 + 3 + 7
 
+    def test_copy_keeps_callbacks(self,
+                                  take_profit,
+                                  candle_above,
+                                  callback_var):
+        @take_profit.add_on_breakout_callback
+        def callback_break(level):
+            nonlocal callback_var
+            callback_var += 3
+
+        trade = deepcopy(take_profit._trade)
+        trade.update(candle_above)
+
+        assert callback_var == 5 + 3
+        assert not take_profit.crossed
+
+
+def test_slots(take_profit):
+    assert not hasattr(take_profit, "__dict__")
+
+
+def test_subclass_without_slots():
+    class Custom(TakeProfit):
+        pass
+
+    level = Custom(price=30_000.0, trade_part=0.1)
+    level.note = "custom"
+    copied = deepcopy(level)
+    assert copied.note == "custom"
+    assert copied.trigger_price == level.trigger_price
+
 
 def test_repr(take_profit):
     assert repr(take_profit) == "<long TakeProfit on 30000.0. " \
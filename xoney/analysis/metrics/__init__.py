@@ -13,3 +13,4 @@
 # limitations under the License.
 # =============================================================================
 from xoney.analysis.metrics.defaults import *
+from xoney.analysis.metrics.online import *
@@ -19,7 +19,6 @@ from abc import ABC, abstractmethod
 import numpy as np
 
 from xoney import math
-from xoney.analysis.regression import ExponentialRegression
 
 
 class Metric(ABC):
@@ -39,15 +38,10 @@ class Metric(ABC):
 class YearProfit(Metric):
     _positive = True
 
-    def __init__(self):
-        self.__model = ExponentialRegression()
-
     def calculate(self, equity):
-        self.__model.fit(array=equity.as_array())
-
-        regression = self.__model.curve
+        regression = equity.exponential_regression()
 
-        profit_per_candle = regression[1] / regression[0]
+        profit_per_candle = regression.growth
         candles_per_year = equity.timeframe.candles_in_year
 
         profit_per_year = profit_per_candle ** candles_per_year
@@ -60,7 +54,7 @@ class MaxDrawDown(Metric):
 
     def calculate(self, equity):
         array = equity.as_array()
-        accumulation = np.maximum.accumulate(array)
+        accumulation = equity.running_max()
         max_dd = -np.min(array / accumulation - 1)
 
         self._value = max_dd
@@ -40,12 +40,8 @@ class Metric(ABC):
 
 
 class YearProfit(Metric):
-    __model: ExponentialRegression
-
-    def __init__(self):
-        ...
-
     def calculate(self, equity: Equity) -> None:
+        regression: ExponentialRegression
         profit_per_candle: float
         candles_per_year: float
         profit_per_year: float
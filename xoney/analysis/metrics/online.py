@@ -0,0 +1,228 @@
+# Copyright 2023 Vladyslav Kochetov. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# =============================================================================
+from __future__ import annotations
+
+import copy
+from abc import ABC, abstractmethod
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from xoney import math
+from xoney.analysis.metrics.defaults import Metric
+from xoney.analysis.regression import LinearRegression
+
+if TYPE_CHECKING:  # pragma: no cover
+    from xoney.generic.equity import Equity
+
+
+class RunningMetric(Metric, ABC):
+    """
+    Metric updated in O(1) for every balance of an equity, instead
+    of being recomputed over the whole history. ``Equity.track``
+    keeps a metric up to date while balances are appended, and
+    ``value`` can be read at any moment.
+
+    Values match the ones of the default metrics with the same name.
+    """
+    # Names of the attributes restored by ``replace``.
+    _fields: tuple[str, ...] = ()
+    _previous: tuple | None = None
+    _candles: float = 1.0
+
+    def reset(self, candles_in_year: float = 1.0) -> None:
+        self._candles = candles_in_year
+        self._previous = None
+        self._reset()
+
+    @abstractmethod
+    def _reset(self) -> None:  # pragma: no cover
+        ...
+
+    @abstractmethod
+    def _add(self, balance: float) -> None:  # pragma: no cover
+        ...
+
+    def push(self, balance: float) -> None:
+        self._previous = tuple(getattr(self, name) for name in self._fields)
+        self._add(balance)
+
+    def replace(self, balance: float) -> None:
+        """
+        Replace the last pushed balance, as ``Equity.update`` does.
+        """
+        if self._previous is None:
+            raise ValueError("There is no balance to replace")
+        for name, value in zip(self._fields, self._previous):
+            setattr(self, name, value)
+        self._add(balance)
+
+    def calculate(self, equity: Equity) -> None:
+        self.reset(candles_in_year=equity.timeframe.candles_in_year)
+        for balance in equity:
+            self.push(balance)
+
+    @property
+    def value(self) -> float:
+        return self._current()
+
+    @abstractmethod
+    def _current(self) -> float:  # pragma: no cover
+        ...
+
+
+class RunningMaxDrawDown(RunningMetric):
+    _positive = False
+    _fields = ("_peak", "_drawdown")
+
+    def __init__(self):
+        self.reset()
+
+    def _reset(self) -> None:
+        self._peak = -np.inf
+        self._drawdown = -np.inf
+
+    def _add(self, balance: float) -> None:
+        self._peak = max(self._peak, balance)
+        self._drawdown = max(self._drawdown, 1 - balance / self._peak)
+
+    def _current(self) -> float:
+        if self._drawdown == -np.inf:
+            return np.nan
+        return self._drawdown
+
+
+class RunningYearProfit(RunningMetric):
+    """
+    Exponential regression of the balances, fitted as a running
+    linear regression of their logarithm against the candle index.
+    """
+    _positive = True
+    _fields = ("_regression",)
+
+    def __init__(self):
+        self.reset()
+
+    def _reset(self) -> None:
+        self._regression = LinearRegression()
+
+    def _add(self, balance: float) -> None:
+        # A new regression, so the one kept for ``replace`` is not changed.
+        regression: LinearRegression = copy.copy(self._regression)
+        regression.append(np.log(balance))
+        self._regression = regression
+
+    def _current(self) -> float:
+        if self._regression.count < 2:
+            return np.nan
+        return np.exp(self._regression.slope * self._candles)
+
+
+class RunningCalmarRatio(RunningMetric):
+    _positive = True
+
+    def __init__(self):
+        self._profit = RunningYearProfit()
+        self._drawdown = RunningMaxDrawDown()
+
+    def _reset(self) -> None:
+        self._profit.reset(candles_in_year=self._candles)
+        self._drawdown.reset(candles_in_year=self._candles)
+
+    def _add(self, balance: float) -> None:
+        self._profit.push(balance)
+        self._drawdown.push(balance)
+
+    def replace(self, balance: float) -> None:
+        self._profit.replace(balance)
+        self._drawdown.replace(balance)
+
+    def _current(self) -> float:
+        return math.divide(self._profit.value, self._drawdown.value)
+
+
+class __RunningProfitStdMetric(RunningMetric, ABC):
+    """
+    Welford mean and variance of the returns, where the return of a
+    balance is its change from the previous one relative to itself.
+    """
+    _positive = True
+    _fields = ("_balance", "_count", "_mean", "_m2")
+
+    def __init__(self, risk_free: float = 0):
+        self._risk_free = risk_free
+        self.reset()
+
+    def _reset(self) -> None:
+        self._balance = 0.0
+        self._count = 0
+        self._mean = 0.0
+        self._m2 = 0.0
+
+    def _return(self, balance: float) -> float:
+        change: float = np.divide(balance - self._balance,
+                                  np.float64(balance))
+        self._balance = balance
+        return change
+
+    def _add_return(self, change: float) -> None:
+        self._count += 1
+        delta: float = change - self._mean
+        self._mean += delta / self._count
+        self._m2 += delta * (change - self._mean)
+
+    def _std(self) -> float:
+        if not self._count:
+            return np.nan
+        return np.sqrt(self._m2 / self._count)
+
+    @abstractmethod
+    def _profit(self) -> float:  # pragma: no cover
+        ...
+
+    def _current(self) -> float:
+        profit: float = self._profit() * self._candles - self._risk_free
+        return math.divide(profit, self._std() * np.sqrt(self._candles))
+
+
+class RunningSharpeRatio(__RunningProfitStdMetric):
+    def _add(self, balance: float) -> None:
+        self._add_return(self._return(balance))
+
+    def _profit(self) -> float:
+        return self._mean if self._count else np.nan
+
+
+class RunningSortinoRatio(__RunningProfitStdMetric):
+    """
+    The mean profit is taken over all returns, the deviation
+    only over the negative ones.
+    """
+    _fields = ("_balance", "_count", "_mean", "_m2", "_total", "_returns")
+
+    def _reset(self) -> None:
+        super()._reset()
+        self._total = 0.0
+        self._returns = 0
+
+    def _add(self, balance: float) -> None:
+        change: float = self._return(balance)
+        self._total += change
+        self._returns += 1
+        if change < 0:
+            self._add_return(change)
+
+    def _profit(self) -> float:
+        return self._total / self._returns if self._returns else np.nan
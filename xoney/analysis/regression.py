@@ -18,11 +18,10 @@ import numpy as np
 
 
 class RegressionModel(ABC):
-    _result: np.ndarray
-
     @property
-    def curve(self) -> np.ndarray:
-        return self._result
+    @abstractmethod
+    def curve(self) -> np.ndarray:  # pragma: no cover
+        ...
 
     @abstractmethod
     def fit(self, array: np.ndarray) -> None:  # pragma: no cover
@@ -30,16 +29,81 @@ class RegressionModel(ABC):
 
 
 class LinearRegression(RegressionModel):
+    """
+    Least squares line over x = 0, 1, ..., n - 1. As x is known,
+    the fit takes closed-form sums instead of ``np.polyfit``, and
+    ``extend`` adds new values without refitting the old ones.
+    """
+    _count: int
+    _sum_y: float
+    _sum_xy: float
+
+    def __init__(self):
+        self._count = 0
+        self._sum_y = 0.0
+        self._sum_xy = 0.0
+
     def fit(self, array: np.ndarray) -> None:
-        x = np.arange(0, len(array))
-        slope, intercept = np.polyfit(x, array, 1)
-        linear: np.ndarray = x * slope + intercept
+        self.__init__()
+        self.extend(array)
+
+    def extend(self, array: np.ndarray) -> None:
+        array = np.asarray(array, dtype=np.float64)
+        start: int = self._count
+        self._count += len(array)
+        x: np.ndarray = np.arange(start, self._count, dtype=np.float64)
+        self._sum_y += array.sum()
+        self._sum_xy += np.dot(x, array)
+
+    def append(self, value: float) -> None:
+        """
+        Add one value, without the array overhead of ``extend``.
+        """
+        self._sum_y += value
+        self._sum_xy += self._count * value
+        self._count += 1
+
+    @property
+    def count(self) -> int:
+        return self._count
+
+    @property
+    def slope(self) -> float:
+        n: int = self._count
+        # Sum of (x - mean x) ** 2 over 0..n-1.
+        variance_x: float = n * (n * n - 1) / 12
+        covariance: float = self._sum_xy - (n - 1) / 2 * self._sum_y
+        return np.divide(covariance, variance_x)
 
-        self._result = linear
+    @property
+    def intercept(self) -> float:
+        n: int = self._count
+        return (self._sum_y - self.slope * n * (n - 1) / 2) / n
+
+    @property
+    def curve(self) -> np.ndarray:
+        return np.arange(self._count) * self.slope + self.intercept
 
 
 class ExponentialRegression(RegressionModel):
+    _linear: LinearRegression
+
+    def __init__(self):
+        self._linear = LinearRegression()
+
     def fit(self, array: np.ndarray) -> None:
-        linear_model: LinearRegression = LinearRegression()
-        linear_model.fit(array=np.log(array))
-        self._result = np.exp(linear_model.curve)
+        self._linear.fit(array=np.log(array))
+
+    def extend(self, array: np.ndarray) -> None:
+        self._linear.extend(array=np.log(array))
+
+    @property
+    def growth(self) -> float:
+        """
+        Ratio of every value of the curve to the previous one.
+        """
+        return np.exp(self._linear.slope)
+
+    @property
+    def curve(self) -> np.ndarray:
+        return np.exp(self._linear.curve)
@@ -13,3 +13,4 @@
 # limitations under the License.
 # =============================================================================
 from xoney.backtesting.backtester import Backtester
+from xoney.backtesting.vectorized import VectorizedBacktester
@@ -15,12 +15,17 @@
 from __future__ import annotations
 from datetime import timedelta
 
+import numpy as np
 import pandas as pd
 
 from xoney.generic.timeframes import TimeFrame
 from xoney import Chart
+from xoney.generic.candlestick import ChartSource
+from xoney.generic.candlestick._storage import ColumnStorage, COLUMNS
+from xoney.generic.routes import Instrument, TradingSystem
+from xoney.strategy import Strategy
 
-from typing import Collection, Iterable
+from typing import Collection, Iterable, Iterator, Sequence
 
 
 def min_timeframe(charts: Iterable) -> TimeFrame:
@@ -54,3 +59,176 @@ def equity_timestamp(charts: Collection[Chart],
     return pd.date_range(start=start,
                          end=stop,
                          freq=timeframe.timedelta)
+
+
+def equity_clock(timestamp: pd.DatetimeIndex,
+                 timeframe: TimeFrame,
+                 adj: timedelta) -> pd.DatetimeIndex:
+    """
+    :return: Moment of every tick of the equity: the close of its
+    candle, later by the time adjustment, so that candles whose
+    timestamps are not aligned with the clock are still counted.
+    """
+    return timestamp + timeframe.timedelta + adj
+
+
+def chart_cursors(chart: Chart, clock: pd.DatetimeIndex) -> np.ndarray:
+    """
+    :return: For each moment of the clock, the number of
+    candles in the chart closed at or before it.
+    """
+    closes: pd.DatetimeIndex = chart.timestamp + chart.timeframe.timedelta
+    return closes.searchsorted(clock, side="right")
+
+
+def new_candle_flags(cursors: np.ndarray) -> np.ndarray:
+    """
+    :return: Whether a new candle appeared at each moment of the clock.
+    """
+    return np.diff(cursors, prepend=0) > 0
+
+
+def merge_events(ticks: Sequence[np.ndarray]
+                 ) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Merge the sorted ticks of new candles of every pair. The stable
+    sort finds the sorted runs and merges them, as a k-way merge does.
+
+    :return: Ticks of all events and the index of the pair of each.
+    Events of the same tick keep the order of the pairs.
+    """
+    if not len(ticks):
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+    merged: np.ndarray = np.concatenate(ticks)
+    pairs: np.ndarray = np.repeat(np.arange(len(ticks)),
+                                  [len(pair_ticks) for pair_ticks in ticks])
+    order: np.ndarray = np.argsort(merged, kind="stable")
+    return merged[order], pairs[order]
+
+
+def group_events(ticks: np.ndarray,
+                 pairs: np.ndarray) -> Iterator[tuple[int, list[int]]]:
+    """
+    :return: Every tick with events and the pairs dispatched on it.
+    """
+    if not len(ticks):
+        return
+    bounds: list[int] = [0,
+                         *(np.flatnonzero(np.diff(ticks)) + 1).tolist(),
+                         len(ticks)]
+    ticks_list: list[int] = ticks.tolist()
+    pairs_list: list[int] = pairs.tolist()
+    for start, stop in zip(bounds[:-1], bounds[1:]):
+        yield ticks_list[start], pairs_list[start:stop]
+
+
+def instrument_strategies(trading_system: TradingSystem
+                          ) -> dict[Instrument, list[Strategy]]:
+    """
+    :return: Strategies of every instrument, with the instruments in the
+    order of their first pair and strategies in the order of the pairs.
+    """
+    groups: dict[Instrument, list[Strategy]] = dict()
+    for strategy, instrument in trading_system.items:
+        groups.setdefault(instrument, []).append(strategy)
+    return groups
+
+
+def to_nanoseconds(delta: timedelta) -> int:
+    return pd.Timedelta(delta).value
+
+
+class StreamCursor:
+    """
+    Latest ``lookback`` candles of a ``ChartSource``,
+    which is read block by block as the clock advances.
+    The next block is read ahead, to know where the chart ends.
+    """
+    window: Chart
+    timeframe: TimeFrame
+    time_dtype: np.dtype
+    # Open time of the latest candle in the window, in nanoseconds.
+    last: int | None
+
+    def __init__(self, source: ChartSource, lookback: int):
+        self.timeframe = source.timeframe
+        self._duration: int = to_nanoseconds(source.timeframe.timedelta)
+        self.last = None
+        self._blocks: Iterator[Chart] = source.blocks()
+        self._block: ColumnStorage | None = None
+        self._upcoming: ColumnStorage | None = self._read_block()
+        self._position: int = 0
+        if not self._next_block():
+            raise ValueError(f"Chart source is empty: {source}")
+        block: ColumnStorage = self._block
+        self.time_dtype = block.time_dtype
+        empty: np.ndarray = np.empty(0)
+        self.window = Chart._from_storage(
+            storage=ColumnStorage(columns=(empty,) * len(COLUMNS),
+                                  timestamp=np.empty(0, dtype=np.int64),
+                                  time_dtype=self.time_dtype,
+                                  window=lookback),
+            timeframe=self.timeframe
+        )
+        self.window.reserve(2 * lookback)
+
+    @property
+    def first(self) -> int:
+        """
+        Open time of the next candle, in nanoseconds.
+        """
+        return int(self._block.timestamp[self._position])
+
+    @property
+    def end(self) -> int | None:
+        """
+        Open time of the last candle of the source, in nanoseconds,
+        or None until the last block is read.
+        """
+        if self._upcoming is not None:
+            return None
+        if self._block is not None:
+            return int(self._block.timestamp[-1])
+        return self.last
+
+    def _read_block(self) -> ColumnStorage | None:
+        block: Chart
+        for block in self._blocks:
+            if len(block):
+                return block._storage
+        return None
+
+    def _next_block(self) -> bool:
+        self._block = self._upcoming
+        self._position = 0
+        if self._block is None:
+            return False
+        self._upcoming = self._read_block()
+        return True
+
+    def advance(self, nanoseconds: int) -> bool:
+        """
+        Move the candles closed at or before ``nanoseconds``
+        into the window.
+
+        :return: Whether any candle was moved.
+        """
+        nanoseconds -= self._duration
+        moved: bool = False
+        window: ColumnStorage = self.window._storage
+        while self._block is not None:
+            block: ColumnStorage = self._block
+            start: int = self._position
+            stop: int = block.search(nanoseconds, side="right")
+            if stop > start:
+                moved = True
+                # Older candles would be dropped from the window anyway.
+                start = max(start, stop - window.window)
+                for *row, timestamp in block[start:stop].rows():
+                    window.append(row=row, nanoseconds=timestamp)
+                self.last = timestamp
+                self._position = stop
+            if stop < len(block):
+                break
+            self._next_block()
+        return moved
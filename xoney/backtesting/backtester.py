@@ -13,18 +13,23 @@
 # limitations under the License.
 # =============================================================================
 from __future__ import annotations
-from typing import Iterable
+from typing import Callable, Iterable, Sequence
+
+import copy
 
 from datetime import timedelta
 from itertools import chain
 
+import numpy as np
+import pandas as pd
 
-from xoney.generic.candlestick import Chart, Candle
+from xoney.generic.candlestick import Chart, Candle, ChartSource
 from xoney.generic.routes import Instrument, TradingSystem, ChartContainer
 from xoney.generic.timeframes.template import TimeFrame
 from xoney.generic.workers import EquityWorker
 from xoney.generic.trades import TradeHeap, Trade
 from xoney.generic.events import Event
+from xoney.generic.enums import TradeStatus
 from xoney.generic.equity import Equity
 
 
@@ -37,6 +42,8 @@ class Backtester(EquityWorker):  # TODO: stats support
     _equity: Equity
     _initial_depo: float
     _time_adj: float | TimeFrame | timedelta
+    # Whether ``run`` calls a reporter with the intermediate equity.
+    reports_progress: bool = True
 
     @property
     def equity(self) -> Equity:
@@ -54,17 +61,51 @@ class Backtester(EquityWorker):  # TODO: stats support
         self.commission = commission
         self._time_adj = time_adjustment
         self._initial_depo = initial_depo
+        self.reset()
+
+    def reset(self) -> None:
+        """
+        Forget the trades and the equity of the previous run.
+        """
+        self._free_balance = self._initial_depo
+        self._trades = TradeHeap()
+        self._equity = Equity([])
+        self.__dict__.pop("_trading_system", None)
+
+    def clone(self) -> Backtester:
+        """
+        :return: Backtester with the same settings and without the
+        state of previous runs. Unlike ``copy.deepcopy``, the trades,
+        equity and trading system of the last run are not copied.
+        """
+        backtester: Backtester = copy.copy(self)
+        backtester.reset()
+        return backtester
 
     def run(self,
             trading_system: TradingSystem,
             charts: dict[Instrument, Chart] | ChartContainer,
+            reporter: Callable[[int, Equity], None] | None = None,
+            n_checkpoints: int = 10,
             **kwargs) -> None:
+        """
+        Strategies run on the first tick at or after the close of each
+        candle of their charts. The tick of an equity timestamp is at
+        the close of the candle opened on it. After all strategies of
+        an instrument have run, its trades are updated once by the candle.
+
+        :param reporter: Called with the tick and the equity at
+        ``n_checkpoints`` evenly spaced ticks before the last one, e.g. to
+        report intermediate scores of an optimization trial. Exceptions
+        raised by the reporter stop the backtest.
+        """
         if not isinstance(charts, ChartContainer):
             charts = ChartContainer(charts=charts)
+        self.reset()
         self._trading_system = trading_system
         self.max_trades = trading_system.max_trades
-        self._free_balance = self._initial_depo
-        self._trades = TradeHeap()
+        for strategy in trading_system.strategies:
+            strategy.reset()
 
         equity_timeframe: TimeFrame = _utils.min_timeframe(charts.values)
         adj: timedelta = _utils.time_adjustment(
@@ -79,41 +120,205 @@ class Backtester(EquityWorker):  # TODO: stats support
                               timeframe=equity_timeframe,
                               timestamp=timestamp)
 
-        candle: Candle
-        prev_candles = {
-            instrument: Candle(0, 0, 0, 0)
-            for instrument in self._trading_system.instruments
-        }
+        clock = _utils.equity_clock(timestamp=timestamp,
+                                    timeframe=equity_timeframe,
+                                    adj=adj)
+        self._equity.reserve(len(clock))
+        # Cursors into every chart are found once, so
+        # each tick costs O(1) instead of slicing the history.
+        cursors: dict[Instrument, np.ndarray] = {}
+        candle_ticks: dict[Instrument, np.ndarray] = {}
+        for instrument in self._trading_system.instruments:
+            cursors[instrument] = _utils.chart_cursors(
+                chart=charts[instrument],
+                clock=clock
+            )
+            candle_ticks[instrument] = np.flatnonzero(
+                _utils.new_candle_flags(cursors[instrument])
+            )
+
+        # Every instrument is dispatched only on the ticks of its own
+        # candles, ticks without new candles just repeat the balance.
+        groups: list[tuple[Instrument, list[Strategy]]] = list(
+            _utils.instrument_strategies(self._trading_system).items()
+        )
+        event_ticks, event_groups = _utils.merge_events(
+            [candle_ticks[instrument] for instrument, _ in groups]
+        )
+
+        checkpoints: set[int] = set()
+        if reporter is not None:
+            checkpoints = set(np.linspace(0, len(clock) - 1,
+                                          n_checkpoints + 2,
+                                          dtype=int)[1:-1].tolist())
+
         instrument: Instrument
-        strategy: Strategy
+        strategies: list[Strategy]
         chart: Chart
+        stop: int
 
-        for curr_time in timestamp + adj:
-            self.__handle_closed_trades()
-            for strategy, instrument in self._trading_system.items:
+        tick: int
+        tick_groups: list[int]
+        for tick, tick_groups in _utils.group_events(event_ticks,
+                                                     event_groups):
+            self.__run_quiet_ticks(start=len(self._equity),
+                                   stop=tick,
+                                   checkpoints=checkpoints,
+                                   reporter=reporter)
+            for group in tick_groups:
+                instrument, strategies = groups[group]
                 chart = charts[instrument]
-                chart = chart[:curr_time]
-                candle = chart.latest_before(curr_time)
-                if candle.timestamp == prev_candles[instrument].timestamp:
-                    self._run_strategy(chart=chart,
-                                    candle=candle,
-                                    strategy=strategy,
-                                    instrument=instrument)
-                prev_candles[instrument] = candle
+                stop = cursors[instrument][tick]
+                self._run_instrument(chart=chart[:stop],
+                                     candle=chart[stop - 1],
+                                     strategies=strategies,
+                                     instrument=instrument)
             self._equity.append(self.total_balance)
+            if tick in checkpoints:
+                reporter(tick, self._equity)
+        self.__run_quiet_ticks(start=len(self._equity),
+                               stop=len(clock),
+                               checkpoints=checkpoints,
+                               reporter=reporter)
 
-    def _run_strategy(self,
-                      strategy: Strategy,
-                      chart: Chart,
-                      candle: Candle,
-                      instrument: Instrument):
+    def __run_quiet_ticks(self,
+                          start: int,
+                          stop: int,
+                          checkpoints: set[int],
+                          reporter: Callable[[int, Equity], None] | None
+                          ) -> None:
+        """
+        Ticks without new candles: trades are neither marked
+        nor changed, so the balance is found only once.
+        """
+        if start >= stop:
+            return
+        self.__handle_closed_trades()
+        balance: float = self.total_balance
+        for tick in range(start, stop):
+            self._equity.append(balance)
+            if tick in checkpoints:
+                reporter(tick, self._equity)
+
+    def run_stream(self,
+                   trading_system: TradingSystem,
+                   sources: dict[Instrument, ChartSource],
+                   lookback: int | None = None) -> None:
+        """
+        Backtest on charts read block by block, without loading them
+        into memory. Strategies get the latest ``lookback`` candles of
+        the chart instead of the whole history, by default the largest
+        ``min_candles`` of the strategies that trade the instrument.
+
+        The equity matches the one of ``run`` for strategies which
+        only look at the latest ``lookback`` candles.
+        """
+        if not sources:
+            raise ValueError("At least one chart source is required")
+        self.reset()
+        self._trading_system = trading_system
+        self.max_trades = trading_system.max_trades
+        for strategy in trading_system.strategies:
+            strategy.reset()
+
+        cursors: dict[Instrument, _utils.StreamCursor] = {}
+        for instrument in trading_system.instruments:
+            window: int | None = lookback
+            if window is None:
+                window = max(strategy.min_candles
+                             for strategy, item in trading_system.items
+                             if item == instrument)
+            cursors[instrument] = _utils.StreamCursor(
+                source=sources[instrument],
+                lookback=max(window, 1)
+            )
+
+        equity_timeframe: TimeFrame = _utils.min_timeframe(cursors.values())
+        step: int = _utils.to_nanoseconds(equity_timeframe.timedelta)
+        # Ticks are at the close of the candles, as in ``run``.
+        adj: int = step + _utils.to_nanoseconds(_utils.time_adjustment(
+            adj=self._time_adj,
+            timeframe=equity_timeframe
+        ))
+        start: int = max(cursor.first for cursor in cursors.values())
+        self._equity = Equity([], timeframe=equity_timeframe)
+
+        groups: dict[Instrument, list[Strategy]] = \
+            _utils.instrument_strategies(trading_system)
+        new_candles: dict[Instrument, bool] = {}
+        cursor: _utils.StreamCursor
+        time: int = start
+        # The clock goes on until the latest candle of all charts
+        # is opened. Candles closed after that are not run, as in ``run``.
+        while any(cursor.end is None or time <= cursor.end
+                  for cursor in cursors.values()):
+            for instrument, cursor in cursors.items():
+                new_candles[instrument] = cursor.advance(time + adj)
+
+            for instrument, strategies in groups.items():
+                if new_candles[instrument]:
+                    chart = cursors[instrument].window
+                    self._run_instrument(chart=chart[:],
+                                         candle=chart[-1],
+                                         strategies=strategies,
+                                         instrument=instrument)
+            self._equity.append(self.total_balance)
+            time += step
+
+        # Equity timestamps have the type of the first chart.
+        time_dtype: np.dtype = next(iter(cursors.values())).time_dtype
+        ticks: np.ndarray = start + step * np.arange(len(self._equity),
+                                                     dtype=np.int64)
+        self._equity = Equity(self._equity.as_array(),
+                              timeframe=equity_timeframe,
+                              timestamp=pd.Index(ticks.view(time_dtype)))
+
+    def run_batch(self,
+                  trading_systems: Sequence[TradingSystem],
+                  charts: dict[Instrument, Chart] | ChartContainer
+                  ) -> list[Equity]:
+        """
+        Backtest every system on the same charts without changing
+        the state of the backtester.
+
+        :return: Equity of every system, in the same order.
+        """
+        if not isinstance(charts, ChartContainer):
+            charts = ChartContainer(charts=charts)
+        equities: list[Equity] = []
+        for trading_system in trading_systems:
+            tester: Backtester = self.clone()
+            tester.run(trading_system=trading_system, charts=charts)
+            equities.append(tester.equity)
+        return equities
+
+    def _run_instrument(self,
+                        strategies: Sequence[Strategy],
+                        chart: Chart,
+                        candle: Candle,
+                        instrument: Instrument) -> None:
         self._set_instrument(instrument)
-        self._handle_chart(strategy=strategy,
-                           candle=candle,
-                           chart=chart)
+        # Open trades are revalued at the new close before
+        # the strategies get a chance to close them.
+        self._trades.mark_symbol_trades(price=candle.close,
+                                        symbol=instrument.symbol)
+        for strategy in strategies:
+            # Trades closed by breakouts return their volume
+            # before the next trades are opened.
+            self.__handle_closed_trades()
+            self._handle_chart(strategy=strategy, chart=chart)
+        # Every candle updates the trades of the symbol once, so
+        # trades opened on it are not checked against it again.
+        self._trades.update_symbol_trades(candle=candle,
+                                          symbol=instrument.symbol)
 
     def __handle_closed_trades(self) -> None:
-        self._free_balance += self._trades.closed.profit
+        if not self._trades.count(TradeStatus.CLOSED):
+            return
+        # Trades closed by their breakouts return their volume,
+        # trades closed by events have already returned it.
+        closed: TradeHeap = self._trades.closed
+        self._free_balance += closed.potential_volume + closed.profit
         self._trades.cleanup_closed()
 
     def _handle_event(self, event: Event) -> None:
@@ -127,7 +332,6 @@ class Backtester(EquityWorker):  # TODO: stats support
 
     def _handle_chart(self,
                       strategy: Strategy,
-                      candle: Candle,
                       chart: Chart) -> None:
         events: Iterable[Event]
 
@@ -139,7 +343,3 @@ class Backtester(EquityWorker):  # TODO: stats support
         # `events` is a nested list
         events = chain.from_iterable(events)
         self._handle_events(events=events)
-        self._trades.update_symbol_trades(
-            candle=candle,
-            symbol=self._current_instrument.symbol
-        )
@@ -0,0 +1,387 @@
+# Copyright 2023 Vladyslav Kochetov. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# =============================================================================
+from __future__ import annotations
+
+import heapq
+from dataclasses import dataclass
+from datetime import timedelta
+from typing import Callable, Sequence
+
+import numpy as np
+import pandas as pd
+
+from xoney.generic.candlestick import Chart
+from xoney.generic.routes import Instrument, TradingSystem, ChartContainer
+from xoney.generic.timeframes.template import TimeFrame
+from xoney.generic.equity import Equity
+from xoney.strategy.vectorized import VectorizedStrategy, Signals
+from xoney.backtesting.backtester import Backtester
+from xoney.backtesting import _utils
+
+
+_SIGNAL: int = 0
+_FILL: int = 1
+_LEVEL: int = 2
+
+
+@dataclass
+class _VectorTrade:
+    side: int
+    entry: float
+    volume: float
+    opened: int
+    closed: int | None = None
+
+    def value(self, price: float | np.ndarray) -> float | np.ndarray:
+        return self.volume * (1 + self.side * (price / self.entry - 1))
+
+
+class _PairTrack:
+    """
+    Signals of one (strategy, instrument) pair, sampled
+    at the ticks when the pair gets a new candle.
+    """
+    ticks: np.ndarray
+    candles: np.ndarray
+    positions: np.ndarray
+    changes: np.ndarray
+    marks: np.ndarray
+    trade: _VectorTrade | None
+
+    def __init__(self,
+                 strategy: VectorizedStrategy,
+                 chart: Chart,
+                 clock: pd.DatetimeIndex):
+        signals: Signals = strategy.signals(chart)
+        signals.validate(length=len(chart))
+        self._chart = chart
+        self._signals = signals
+
+        cursors: np.ndarray = _utils.chart_cursors(chart=chart, clock=clock)
+        self.marks = chart.close_array[cursors - 1]
+        self.ticks = np.flatnonzero(_utils.new_candle_flags(cursors))
+        self.candles = cursors[self.ticks] - 1
+        self.positions = np.sign(signals.position)[self.candles]
+        # Indices of the ticks on which the position changes.
+        previous: np.ndarray = np.concatenate(([0], self.positions[:-1]))
+        self.changes = np.flatnonzero(self.positions != previous)
+        self.trade = None
+
+    def next_change(self, index: int) -> int:
+        following: int = np.searchsorted(self.changes, index, side="right")
+        if following == len(self.changes):
+            return len(self.ticks)
+        return int(self.changes[following])
+
+    def level_exit(self,
+                   side: int,
+                   start: int,
+                   stop: int) -> tuple[int, float] | None:
+        """
+        Find the first candle in ``ticks[start+1:stop]`` which crosses
+        the stop loss or the take profit set when the trade was opened
+        on ``ticks[start]``.
+
+        :return: (tick index, level price) or None.
+        """
+        if start + 1 >= stop:
+            return None
+        chart: Chart = self._chart
+        opened_on: int = self.candles[start]
+        checked: np.ndarray = self.candles[start + 1:stop]
+        if side > 0:
+            against, by = chart.low_array[checked], chart.high_array[checked]
+        else:
+            against, by = -chart.high_array[checked], -chart.low_array[checked]
+
+        crossed = np.zeros(len(checked), dtype=bool)
+        prices = np.full(len(checked), np.nan)
+        # Take profit goes first, so that a candle crossing
+        # both levels is closed by the stop loss.
+        for levels, is_crossed in ((self._signals.take_profit,
+                                    lambda price: by >= side * price),
+                                   (self._signals.stop_loss,
+                                    lambda price: against <= side * price)):
+            if levels is None:
+                continue
+            price: float = levels[opened_on]
+            if np.isnan(price):
+                continue
+            hits: np.ndarray = is_crossed(price)
+            crossed |= hits
+            prices[hits] = price
+
+        if not crossed.any():
+            return None
+        first: int = int(np.argmax(crossed))
+        return start + 1 + first, float(prices[first])
+
+
+class VectorizedBacktester(Backtester):
+    """
+    Backtester for systems of ``VectorizedStrategy``. Signals are
+    computed once for every chart and the equity is built with NumPy,
+    without running strategies candle by candle.
+
+    For position signals the equity matches the one of ``Backtester``:
+    trades are opened and closed on the close of the candle where
+    the position changes, their volume follows ``DefaultDistributor``
+    and the commission is paid when a level is filled.
+    Stop losses and take profits are the ones of the candle where
+    the trade is opened, they are checked from the next candle and
+    fill at their own price.
+
+    ``run_batch`` evaluates parameter sets of a single-pair system
+    together, as a 2-D array of (parameter set x tick). The equity is
+    built at once, so ``run`` does not take a ``reporter`` and trials
+    backtested by it can not be pruned.
+    """
+    reports_progress: bool = False
+
+    def __clock(self, charts: ChartContainer) -> tuple:
+        equity_timeframe: TimeFrame = _utils.min_timeframe(charts.values)
+        adj: timedelta = _utils.time_adjustment(
+            adj=self._time_adj,
+            timeframe=equity_timeframe
+        )
+        timestamp = _utils.equity_timestamp(charts=charts.values,
+                                            timeframe=equity_timeframe)
+        clock = _utils.equity_clock(timestamp=timestamp,
+                                    timeframe=equity_timeframe,
+                                    adj=adj)
+        return equity_timeframe, timestamp, clock
+
+    def run(self,
+            trading_system: TradingSystem,
+            charts: dict[Instrument, Chart] | ChartContainer,
+            reporter: Callable[[int, Equity], None] | None = None,
+            **kwargs) -> None:
+        if reporter is not None:
+            raise ValueError("VectorizedBacktester builds the equity "
+                             "at once and can not report it")
+        if not isinstance(charts, ChartContainer):
+            charts = ChartContainer(charts=charts)
+        self._trading_system = trading_system
+        self.max_trades = trading_system.max_trades
+        equity_timeframe, timestamp, clock = self.__clock(charts)
+
+        tracks: list[_PairTrack] = [
+            _PairTrack(strategy=strategy,
+                       chart=charts[instrument],
+                       clock=clock)
+            for strategy, instrument in trading_system.items
+        ]
+        free_changes: np.ndarray = np.zeros(len(clock))
+        free_changes[0] = self._initial_depo
+        trades: list[tuple[_PairTrack, _VectorTrade]] = []
+
+        # Only position changes and level exits are visited in python,
+        # in the same order as ``Backtester`` handles events: by
+        # instrument, first the signals of its pairs, then the
+        # entry commissions and the levels, as the trades are updated.
+        order: list[Instrument] = list(
+            _utils.instrument_strategies(trading_system)
+        )
+        ranks: list[int] = [order.index(instrument)
+                            for _, instrument in trading_system.items]
+        queue: list[tuple] = []
+        for pair, track in enumerate(tracks):
+            for change in track.changes:
+                queue.append((track.ticks[change], ranks[pair],
+                              _SIGNAL, pair, change))
+        heapq.heapify(queue)
+
+        self._free_balance = self._initial_depo
+        active: int = 0
+        while queue:
+            tick, rank, kind, pair, payload = heapq.heappop(queue)
+            track = tracks[pair]
+            trade = track.trade
+            before: float = self._free_balance
+
+            if kind == _SIGNAL:
+                if trade is not None:
+                    self._free_balance += trade.value(track.marks[tick])
+                    active -= 1
+                    self.__close(track, tick)
+                position: int = int(track.positions[payload])
+                if position and self.max_trades > active:
+                    volume: float = self._free_balance / (self.max_trades
+                                                          - active)
+                    self._free_balance -= volume
+                    heapq.heappush(queue, (tick, rank, _FILL, pair,
+                                           volume * self.commission))
+                    trade = _VectorTrade(side=position,
+                                         entry=track.marks[tick],
+                                         volume=volume,
+                                         opened=tick)
+                    track.trade = trade
+                    trades.append((track, trade))
+                    active += 1
+                    self.__schedule_level_exit(queue=queue,
+                                               track=track,
+                                               rank=rank,
+                                               pair=pair,
+                                               index=payload)
+            elif kind == _FILL:
+                self._free_balance -= payload
+            else:
+                price, opened = payload
+                if trade is not None and trade.opened == opened:
+                    # The commission is paid on the sold base volume.
+                    sold: float = trade.volume * price / trade.entry
+                    self._free_balance += (trade.value(price)
+                                           - sold * self.commission)
+                    active -= 1
+                    self.__close(track, tick)
+
+            free_changes[tick] += self._free_balance - before
+
+        balance: np.ndarray = np.cumsum(free_changes)
+        for track, trade in trades:
+            closed: int = len(clock) if trade.closed is None else trade.closed
+            balance[trade.opened:closed] += trade.value(
+                track.marks[trade.opened:closed]
+            )
+
+        self._equity = Equity(balance,
+                              timeframe=equity_timeframe,
+                              timestamp=timestamp)
+
+    def run_batch(self,
+                  trading_systems: Sequence[TradingSystem],
+                  charts: dict[Instrument, Chart] | ChartContainer
+                  ) -> list[Equity]:
+        """
+        Backtest parameter sets of one system together. A batch is
+        evaluated in one pass over 2-D arrays only when:
+
+        - every system has a single (strategy, instrument) pair, with
+          the same ``VectorizedStrategy`` subclass and instrument;
+        - ``max_trades`` of every system is at least 1;
+        - the signals have no stop losses or take profits, which need
+          the trades to be followed one by one.
+
+        Other batches are backtested one system after another with
+        ``run``. Signals and balances of the batch are arrays of
+        (number of systems x number of candles) floats, so very large
+        batches should be split to bound the memory.
+
+        :return: Equity of every system, in the same order.
+        """
+        if not isinstance(charts, ChartContainer):
+            charts = ChartContainer(charts=charts)
+        if not self.__batchable(trading_systems):
+            return super().run_batch(trading_systems=trading_systems,
+                                     charts=charts)
+
+        (strategy, instrument), = trading_systems[0].items
+        chart: Chart = charts[instrument]
+        signals: Signals = type(strategy).batch_signals(
+            chart=chart,
+            strategies=[system.strategies[0] for system in trading_systems]
+        )
+        signals.validate(length=len(chart))
+        if any(levels is not None and not np.isnan(levels).all()
+               for levels in (signals.stop_loss, signals.take_profit)):
+            return super().run_batch(trading_systems=trading_systems,
+                                     charts=charts)
+
+        equity_timeframe, timestamp, clock = self.__clock(charts)
+        balance: np.ndarray = self.__batch_balance(
+            positions=np.sign(signals.position),
+            chart=chart,
+            clock=clock,
+            max_trades=np.array([system.max_trades
+                                 for system in trading_systems])
+        )
+        return [Equity(row, timeframe=equity_timeframe, timestamp=timestamp)
+                for row in balance]
+
+    @staticmethod
+    def __batchable(trading_systems: Sequence[TradingSystem]) -> bool:
+        items: set[tuple[type, Instrument]] = set()
+        for system in trading_systems:
+            if len(system.items) != 1 or system.max_trades < 1:
+                return False
+            (strategy, instrument), = system.items
+            items.add((type(strategy), instrument))
+        if len(items) != 1:
+            return False
+        (strategy_type, _), = items
+        return issubclass(strategy_type, VectorizedStrategy)
+
+    def __batch_balance(self,
+                        positions: np.ndarray,
+                        chart: Chart,
+                        clock: pd.DatetimeIndex,
+                        max_trades: np.ndarray) -> np.ndarray:
+        cursors: np.ndarray = _utils.chart_cursors(chart=chart, clock=clock)
+        marks: np.ndarray = chart.close_array[cursors - 1]
+        # Position held after every tick: the signal of the latest
+        # closed candle, which is the same until a new candle comes.
+        held: np.ndarray = np.where(cursors > 0,
+                                    positions[:, np.maximum(cursors - 1, 0)],
+                                    0)
+        previous: np.ndarray = np.zeros_like(held)
+        previous[:, 1:] = held[:, :-1]
+        changes: np.ndarray = held != previous
+
+        ticks: np.ndarray = np.arange(held.shape[1])
+        opened: np.ndarray = np.maximum.accumulate(
+            np.where(changes, ticks, 0), axis=1
+        )
+        entry: np.ndarray = marks[opened]
+        previous_entry: np.ndarray = np.empty_like(entry)
+        previous_entry[:, 0] = marks[0]
+        previous_entry[:, 1:] = entry[:, :-1]
+        max_trades = max_trades[:, np.newaxis]
+
+        def worth(side: np.ndarray, entry: np.ndarray) -> np.ndarray:
+            # Balance relative to the free balance before the trade
+            # was opened with 1 / max_trades of it.
+            profit: np.ndarray = side * (marks / entry - 1) - self.commission
+            return np.where(side != 0, 1 + profit / max_trades, 1.0)
+
+        # The balance is carried from trade to trade, so it is
+        # a running product of the worth at every position change.
+        carried: np.ndarray = np.where(changes,
+                                       worth(previous, previous_entry),
+                                       1.0)
+        return (self._initial_depo
+                * np.cumprod(carried, axis=1)
+                * worth(held, entry))
+
+    @staticmethod
+    def __close(track: _PairTrack, tick: int) -> None:
+        track.trade.closed = tick
+        track.trade = None
+
+    @staticmethod
+    def __schedule_level_exit(queue: list[tuple],
+                              track: _PairTrack,
+                              rank: int,
+                              pair: int,
+                              index: int) -> None:
+        level_exit = track.level_exit(side=track.trade.side,
+                                      start=index,
+                                      stop=track.next_change(index))
+        if level_exit is not None:
+            exit_index, price = level_exit
+            heapq.heappush(queue, (track.ticks[exit_index],
+                                   rank,
+                                   _LEVEL,
+                                   pair,
+                                   (price, track.trade.opened)))
@@ -14,3 +14,7 @@
 # =============================================================================
 from .candle import Candle
 from .chart import Chart
+from .sources import (ChartSource,
+                      BinaryChartSource,
+                      CSVChartSource,
+                      ParquetChartSource)
@@ -0,0 +1,170 @@
+# Copyright 2023 Vladyslav Kochetov. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# =============================================================================
+"""
+Columnar binary chart file:
+
+    magic (8 bytes) | header size (uint32) | JSON header | padding
+    | Open | High | Low | Close | Volume (float64) | Timestamp (int64)
+
+Columns start at a multiple of ``ALIGNMENT`` bytes, so they can
+be mapped into memory without copying.
+"""
+from __future__ import annotations
+
+import json
+import os
+import struct
+from dataclasses import dataclass
+
+import numpy as np
+
+from xoney.generic.candlestick._storage import ColumnStorage, COLUMNS
+from xoney.generic.timeframes import TimeFrame
+from xoney.system.exceptions import InvalidChartFile
+
+
+MAGIC: bytes = b"XONEYCHT"
+VERSION: int = 1
+ALIGNMENT: int = 64
+EXTENSION: str = ".xchart"
+
+_SIZE = struct.Struct("<I")
+_ITEM_SIZE: int = 8  # float64 columns and int64 timestamps
+
+
+@dataclass(frozen=True)
+class ChartHeader:
+    length: int
+    time_dtype: str
+    timeframe: TimeFrame
+    # Instrument of the chart, if it was saved with one.
+    symbol: str | None = None
+    instrument_timeframe: TimeFrame | None = None
+
+    def to_bytes(self) -> bytes:
+        header: bytes = json.dumps(dict(
+            version=VERSION,
+            length=self.length,
+            time_dtype=self.time_dtype,
+            timeframe=_timeframe_to_dict(self.timeframe),
+            symbol=self.symbol,
+            instrument_timeframe=_timeframe_to_dict(
+                self.instrument_timeframe
+            )
+        )).encode()
+        prefix: bytes = MAGIC + _SIZE.pack(len(header)) + header
+        padding: int = -len(prefix) % ALIGNMENT
+        return prefix + b" " * padding
+
+    @classmethod
+    def read(cls, file) -> tuple[ChartHeader, int]:
+        """
+        :return: The header and the offset of the columns in the file.
+        """
+        path = getattr(file, "name", file)
+        if file.read(len(MAGIC)) != MAGIC:
+            raise InvalidChartFile(path, "not a chart file")
+        size, = _SIZE.unpack(file.read(_SIZE.size))
+        header: dict = json.loads(file.read(size))
+        if header["version"] != VERSION:
+            raise InvalidChartFile(path,
+                                   f"unknown version {header['version']}")
+        prefix: int = len(MAGIC) + _SIZE.size + size
+        return cls(
+            length=header["length"],
+            time_dtype=header["time_dtype"],
+            timeframe=_dict_to_timeframe(header["timeframe"]),
+            symbol=header["symbol"],
+            instrument_timeframe=_dict_to_timeframe(
+                header["instrument_timeframe"]
+            )
+        ), prefix + -prefix % ALIGNMENT
+
+
+def _timeframe_to_dict(timeframe: TimeFrame | None) -> dict | None:
+    if timeframe is None:
+        return None
+    return dict(name=timeframe.name, seconds=timeframe.seconds)
+
+
+def _dict_to_timeframe(timeframe: dict | None) -> TimeFrame | None:
+    if timeframe is None:
+        return None
+    return TimeFrame(name=timeframe["name"], seconds=timeframe["seconds"])
+
+
+def save(storage: ColumnStorage,
+         timeframe: TimeFrame,
+         path: str | os.PathLike,
+         instrument=None) -> None:
+    header: ChartHeader = ChartHeader(
+        length=len(storage),
+        time_dtype=storage.time_dtype.str,
+        timeframe=timeframe,
+        symbol=None if instrument is None else str(instrument.symbol),
+        instrument_timeframe=getattr(instrument, "timeframe", None)
+    )
+    with open(path, "wb") as file:
+        file.write(header.to_bytes())
+        for column in storage.columns:
+            file.write(np.ascontiguousarray(column, dtype="<f8").tobytes())
+        file.write(np.ascontiguousarray(storage.timestamp,
+                                        dtype="<i8").tobytes())
+
+
+def read_header(path: str | os.PathLike) -> ChartHeader:
+    with open(path, "rb") as file:
+        header, _ = ChartHeader.read(file)
+    return header
+
+
+def load(path: str | os.PathLike,
+         mmap: bool = True) -> tuple[ChartHeader, ColumnStorage]:
+    """
+    :param mmap: Map the columns into memory instead of reading them.
+    Pages are read on first access and shared by all processes that
+    map the same file.
+    """
+    with open(path, "rb") as file:
+        header, offset = ChartHeader.read(file)
+        length: int = header.length
+        size: int = (len(COLUMNS) + 1) * length * _ITEM_SIZE
+        if os.fstat(file.fileno()).st_size < offset + size:
+            raise InvalidChartFile(path, "file is truncated")
+        if not length:
+            columns = np.empty((len(COLUMNS), 0), dtype=np.float64)
+            timestamp = np.empty(0, dtype=np.int64)
+        elif mmap:
+            columns = np.memmap(file, dtype="<f8", mode="r",
+                                offset=offset,
+                                shape=(len(COLUMNS), length))
+            timestamp = np.memmap(file, dtype="<i8", mode="r",
+                                  offset=offset + columns.nbytes,
+                                  shape=(length,))
+        else:
+            file.seek(offset)
+            columns = np.fromfile(file, dtype="<f8",
+                                  count=len(COLUMNS) * length)
+            columns = columns.reshape(len(COLUMNS), length)
+            timestamp = np.fromfile(file, dtype="<i8", count=length)
+
+    storage: ColumnStorage = ColumnStorage(
+        columns=tuple(columns),
+        timestamp=timestamp,
+        time_dtype=np.dtype(header.time_dtype),
+        # Mapped columns are read-only, appending copies them.
+        _owner=not mmap
+    )
+    return header, storage
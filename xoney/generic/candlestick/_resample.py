@@ -0,0 +1,91 @@
+# Copyright 2023 Vladyslav Kochetov. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# =============================================================================
+from __future__ import annotations
+
+import math
+
+import numpy as np
+import pandas as pd
+
+from xoney.generic.candlestick._storage import ColumnStorage, COLUMNS
+from xoney.generic.timeframes.template import TimeFrame
+
+
+def aggregate(storage: ColumnStorage,
+              step: int) -> tuple[tuple[np.ndarray, ...], np.ndarray]:
+    """
+    Group the rows by periods of ``step`` nanoseconds aligned
+    to the epoch, with one ``reduceat`` per column.
+
+    :return: OHLCV columns and the start of the period of every group.
+    """
+    labels: np.ndarray = storage.timestamp // step * step
+    starts: np.ndarray = np.flatnonzero(np.diff(labels, prepend=labels[0] - 1))
+    ends: np.ndarray = np.append(starts[1:], len(labels)) - 1
+    columns: tuple[np.ndarray, ...] = (
+        storage.open[starts],
+        np.maximum.reduceat(storage.high, starts),
+        np.minimum.reduceat(storage.low, starts),
+        storage.close[ends],
+        np.add.reduceat(storage.volume, starts),
+    )
+    return columns, labels[starts]
+
+
+class Resampler:
+    """
+    Candles of ``timeframe`` aggregated from a base chart. Every
+    ``update`` aggregates only the candles added to the base since
+    the previous one and merges them into the latest period.
+    """
+    storage: ColumnStorage
+    # Timestamp of the latest aggregated candle of the base.
+    _last: int | None
+
+    def __init__(self,
+                 timeframe: TimeFrame,
+                 base: ColumnStorage,
+                 base_timeframe: TimeFrame):
+        window: int | None = None
+        if base.window is not None:
+            window = math.ceil(base.window
+                               * base_timeframe.seconds
+                               / timeframe.seconds) + 1
+        empty: np.ndarray = np.empty(0)
+        self.storage = ColumnStorage(columns=(empty,) * len(COLUMNS),
+                                     timestamp=np.empty(0, dtype=np.int64),
+                                     time_dtype=base.time_dtype,
+                                     window=window)
+        self._step = pd.Timedelta(timeframe.timedelta).value
+        self._last = None
+
+    def update(self, base: ColumnStorage) -> None:
+        start: int = 0
+        if self._last is not None:
+            start = base.search(self._last, side="right")
+        if start == len(base):
+            return
+        columns, labels = aggregate(base[start:], step=self._step)
+
+        storage: ColumnStorage = self.storage
+        if len(storage) and storage.timestamp[-1] == labels[0]:
+            # The latest period got more candles.
+            open, high, low, _, volume, _ = storage.pop()
+            columns[0][0] = open
+            columns[1][0] = max(high, columns[1][0])
+            columns[2][0] = min(low, columns[2][0])
+            columns[4][0] += volume
+        storage.extend(columns=columns, nanoseconds=labels)
+        self._last = int(base.timestamp[-1])
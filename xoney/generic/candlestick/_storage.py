@@ -0,0 +1,203 @@
+# Copyright 2022 Vladyslav Kochetov. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# =============================================================================
+from __future__ import annotations
+
+from typing import Iterator
+
+import numpy as np
+import pandas as pd
+
+
+COLUMNS: tuple[str, ...] = ("Open", "High", "Low", "Close", "Volume")
+
+MIN_CAPACITY: int = 64
+
+
+class ColumnStorage:
+    """
+    Columnar OHLCV storage: a contiguous float64 array for each
+    column and int64 nanosecond timestamps. Slices share memory
+    with the storage they were taken from.
+
+    Rows are appended into preallocated buffers whose capacity doubles
+    when exhausted, so appending costs amortized O(1). With ``window``
+    set, only the latest ``window`` rows are kept.
+
+    ``version`` is increased whenever the rows or the buffers change,
+    so caches of the rows can tell when they are stale.
+    """
+    _buffers: tuple[np.ndarray, ...]
+    _start: int
+    _stop: int
+    _owner: bool
+    time_dtype: np.dtype
+    window: int | None
+    version: int
+
+    @property
+    def open(self) -> np.ndarray:
+        return self._buffers[0][self._start:self._stop]
+
+    @property
+    def high(self) -> np.ndarray:
+        return self._buffers[1][self._start:self._stop]
+
+    @property
+    def low(self) -> np.ndarray:
+        return self._buffers[2][self._start:self._stop]
+
+    @property
+    def close(self) -> np.ndarray:
+        return self._buffers[3][self._start:self._stop]
+
+    @property
+    def volume(self) -> np.ndarray:
+        return self._buffers[4][self._start:self._stop]
+
+    @property
+    def columns(self) -> tuple[np.ndarray, ...]:
+        return tuple(buffer[self._start:self._stop]
+                     for buffer in self._buffers[:-1])
+
+    @property
+    def timestamp(self) -> np.ndarray:
+        return self._buffers[-1][self._start:self._stop]
+
+    @property
+    def capacity(self) -> int:
+        return len(self._buffers[-1])
+
+    def __init__(self,
+                 columns: tuple[np.ndarray, ...],
+                 timestamp: np.ndarray,
+                 time_dtype: np.dtype,
+                 window: int | None = None,
+                 _owner: bool = True):
+        self._buffers = (*columns, timestamp)
+        self.time_dtype = time_dtype
+        self.window = window
+        self._owner = _owner
+        self.version = 0
+        self._stop = len(timestamp)
+        self._start = 0
+        if window is not None:
+            self._start = max(self._stop - window, 0)
+
+    def __len__(self) -> int:
+        return self._stop - self._start
+
+    def __getitem__(self, item: slice) -> ColumnStorage:
+        return ColumnStorage(
+            columns=tuple(column[item] for column in self.columns),
+            timestamp=self.timestamp[item],
+            time_dtype=self.time_dtype,
+            _owner=False
+        )
+
+    def row(self, index: int) -> tuple:
+        """
+        :return: (open, high, low, close, volume, timestamp) of the row
+        as python scalars.
+        """
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(f"Row index out of range: {index}")
+        index += self._start
+        return tuple(buffer[index].item() for buffer in self._buffers)
+
+    def rows(self) -> Iterator[tuple]:
+        arrays = (*self.columns, self.timestamp)
+        return zip(*(array.tolist() for array in arrays))
+
+    def search(self, nanoseconds: int, side: str = "left") -> int:
+        return int(np.searchsorted(self.timestamp, nanoseconds, side=side))
+
+    def reserve(self, capacity: int) -> None:
+        """
+        Move the rows into new buffers with room for at
+        least ``capacity`` rows. Views taken earlier keep
+        pointing to the old buffers.
+        """
+        length: int = len(self)
+        capacity = max(capacity, length)
+        buffers: list[np.ndarray] = []
+        for buffer in self._buffers:
+            new_buffer = np.empty(capacity, dtype=buffer.dtype)
+            new_buffer[:length] = buffer[self._start:self._stop]
+            buffers.append(new_buffer)
+        self._buffers = tuple(buffers)
+        self._start = 0
+        self._stop = length
+        self._owner = True
+        self.version += 1
+
+    def _grow(self) -> None:
+        if self.window is None:
+            capacity: int = 2 * len(self)
+        else:
+            # Keeping twice the window moves the rows once
+            # every ``window`` appends.
+            capacity = 2 * self.window
+        self.reserve(max(capacity, MIN_CAPACITY))
+
+    def append(self, row: tuple[float, ...], nanoseconds: int) -> None:
+        if not self._owner or self._stop == self.capacity:
+            self._grow()
+        stop: int = self._stop
+        for buffer, value in zip(self._buffers, (*row, nanoseconds)):
+            buffer[stop] = value
+        self._stop = stop + 1
+        if self.window is not None and len(self) > self.window:
+            self._start += 1
+        self.version += 1
+
+    def extend(self,
+               columns: tuple[np.ndarray, ...],
+               nanoseconds: np.ndarray) -> None:
+        """
+        Append the rows of the OHLCV ``columns`` at once.
+        """
+        count: int = len(nanoseconds)
+        if self.window is not None and count > self.window:
+            columns = tuple(column[-self.window:] for column in columns)
+            nanoseconds = nanoseconds[-self.window:]
+            count = self.window
+        if not self._owner or self._stop + count > self.capacity:
+            self.reserve(max(2 * (len(self) + count), MIN_CAPACITY))
+        stop: int = self._stop + count
+        for buffer, values in zip(self._buffers, (*columns, nanoseconds)):
+            buffer[self._stop:stop] = values
+        self._stop = stop
+        if self.window is not None:
+            self._start = max(self._start, stop - self.window)
+        self.version += 1
+
+    def pop(self) -> tuple:
+        """
+        Remove the last row.
+
+        :return: (open, high, low, close, volume, timestamp) of the row.
+        """
+        row: tuple = self.row(-1)
+        self._stop -= 1
+        self.version += 1
+        return row
+
+    def to_pandas(self) -> pd.DataFrame:
+        index = pd.Index(self.timestamp.view(self.time_dtype),
+                         name="Timestamp")
+        return pd.DataFrame(dict(zip(COLUMNS, self.columns)),
+                            index=index)
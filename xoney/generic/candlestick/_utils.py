@@ -55,7 +55,7 @@ def to_int_index(item, timestamp: list) -> int | slice:
 def equal_arrays(array_1: np.ndarray, array_2: np.ndarray) -> bool:
     if array_1.shape != array_2.shape:
         return False
-    return all(array_1 == array_2)
+    return bool((array_1 == array_2).all())
 
 
 def default_timestamp(length: int, timeframe: TimeFrame) -> pd.TimedeltaIndex:
@@ -68,8 +68,33 @@ def default_timestamp(length: int, timeframe: TimeFrame) -> pd.TimedeltaIndex:
     )
 
 
-def auto_loc_iloc(df: pd.DataFrame, index):
-    try:
-        return df.loc[index]
-    except:
-        return df.iloc[index]
+def to_nanoseconds(timestamp) -> tuple[np.ndarray, np.dtype]:
+    """
+    :return: int64 nanoseconds view of the timestamps and the
+    ``datetime64[ns]`` / ``timedelta64[ns]`` dtype they represent.
+    """
+    array = np.asarray(timestamp)
+    if array.dtype.kind not in "mM":
+        index = pd.Index(timestamp)
+        if index.dtype.kind not in "mM":
+            index = pd.to_datetime(index)
+        array = index.values
+    time_dtype = np.dtype(f"{array.dtype.kind}8[ns]")
+    nanoseconds = array.astype(time_dtype, copy=False).view(np.int64)
+    return nanoseconds, time_dtype
+
+
+def time_to_nanoseconds(value, time_dtype: np.dtype) -> int:
+    if time_dtype.kind == "m":
+        return pd.Timedelta(value).value
+    return pd.Timestamp(value).value
+
+
+def nanoseconds_to_time(value: int, time_dtype: np.dtype):
+    if time_dtype.kind == "m":
+        return pd.Timedelta(value)
+    return pd.Timestamp(value)
+
+
+def is_position(item) -> bool:
+    return isinstance(item, (int, np.integer)) and not isinstance(item, bool)
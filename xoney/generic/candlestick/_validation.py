@@ -18,6 +18,8 @@ from typing import Collection
 
 from numbers import Number
 
+import numpy as np
+
 from xoney.system.exceptions import (IncorrectChartLength,
                                      InvalidChartParameters)
 
@@ -44,3 +46,55 @@ def validate_chart_parameters(open,
         is_not_normal: bool = isinstance(collection, (str, dict, set))
         if not is_sequence or is_not_normal:
             raise InvalidChartParameters
+
+
+def validate_arrays(columns: dict[str, np.ndarray],
+                    timestamp: np.ndarray) -> None:
+    """
+    Check NumPy columns of a chart by their dtype and shape,
+    without looking at the values.
+    """
+    length: int = len(timestamp)
+    for name, column in (*columns.items(), ("Timestamp", timestamp)):
+        if not isinstance(column, np.ndarray):
+            raise InvalidChartParameters(f"{name} must be a NumPy array")
+        if column.ndim != 1:
+            raise InvalidChartParameters(
+                f"{name} must be one-dimensional, "
+                f"but has shape {column.shape}"
+            )
+    if len({len(column) for column in columns.values()} | {length}) > 1:
+        raise IncorrectChartLength([*map(len, columns.values()), length])
+    for name, column in columns.items():
+        if column.dtype.kind not in "fiu":
+            raise InvalidChartParameters(
+                f"{name} must be numeric, but has dtype {column.dtype}"
+            )
+    if timestamp.dtype.kind not in "mM":
+        raise InvalidChartParameters(
+            "Timestamp must be datetime64 or timedelta64, "
+            f"but has dtype {timestamp.dtype}"
+        )
+
+
+def validate_sorted(nanoseconds: np.ndarray) -> None:
+    if (nanoseconds[1:] < nanoseconds[:-1]).any():
+        raise InvalidChartParameters("Timestamps must be sorted")
+
+
+def validate_ohlc_arrays(open: np.ndarray,
+                         high: np.ndarray,
+                         low: np.ndarray,
+                         close: np.ndarray) -> None:
+    """
+    Check that high >= open, close >= low for every candle.
+    Candles with NaN prices are not checked.
+    """
+    body_high: np.ndarray = np.maximum(open, close)
+    body_low: np.ndarray = np.minimum(open, close)
+    invalid: np.ndarray = (high < body_high) | (low > body_low)
+    if invalid.any():
+        index: int = int(np.argmax(invalid))
+        raise InvalidChartParameters(
+            f"Candle {index} has high < open, close or low > open, close"
+        )
@@ -25,6 +25,8 @@ from xoney.generic.candlestick._validation import validate_ohlc
 
 
 class Candle:
+    __slots__ = ("open", "high", "low", "close", "volume", "timestamp")
+
     open: int | float
     high: int | float
     low: int | float
@@ -33,25 +35,19 @@ class Candle:
     volume: float | None
     timestamp: Any
 
-
-    @property
-    def _array(self):
-        return np.array([self.open,
-                         self.high,
-                         self.low,
-                         self.close])
-
     def __init__(self,
                  open: int | float,
                  high: int | float,
                  low: int | float,
                  close: int | float,
                  timestamp: Any = None,
-                 volume: float | None = None):
-        validate_ohlc(open=open,
-                      high=high,
-                      low=low,
-                      close=close)
+                 volume: float | None = None,
+                 validate: bool = True):
+        if validate:
+            validate_ohlc(open=open,
+                          high=high,
+                          low=low,
+                          close=close)
         self.open = open
         self.high = high
         self.low = low
@@ -59,8 +55,30 @@ class Candle:
         self.volume = volume
         self.timestamp = timestamp
 
+    @classmethod
+    def _trusted(cls,
+                 open: float,
+                 high: float,
+                 low: float,
+                 close: float,
+                 timestamp: Any = None,
+                 volume: float | None = None) -> Candle:
+        # Fields that are already known to be numbers, e.g. the rows
+        # of a chart, skip validation and the keyword arguments.
+        candle: Candle = cls.__new__(cls)
+        candle.open = open
+        candle.high = high
+        candle.low = low
+        candle.close = close
+        candle.volume = volume
+        candle.timestamp = timestamp
+        return candle
+
     def as_array(self) -> np.ndarray:
-        return self._array
+        return np.array([self.open,
+                         self.high,
+                         self.low,
+                         self.close])
 
     def __array_to_candle(self, array: np.ndarray):
         return self.__class__(*array,
@@ -68,13 +86,13 @@ class Candle:
                               volume=self.volume)
 
     def __neg__(self):
-        return self.__array_to_candle(-self._array)
+        return self.__array_to_candle(-self.as_array())
 
     def __pos__(self):
         return copy.deepcopy(self)
 
     def __abs__(self):
-        return self.__array_to_candle(abs(self._array))
+        return self.__array_to_candle(abs(self.as_array()))
 
     def __add__(self, other):
         if isinstance(other, Candle):
@@ -83,7 +101,7 @@ class Candle:
             raise TypeError("To add something to a candle, the "
                             "object must be of type <Candle>, "
                             "<numpy.ndarray> or <Number>")
-        return self.__array_to_candle(self._array + other)
+        return self.__array_to_candle(self.as_array() + other)
 
     def __sub__(self, other):
         if isinstance(other, Candle):
@@ -92,7 +110,7 @@ class Candle:
             raise TypeError("To subtract something from a candle, the "
                             "object must be of type <Candle>, "
                             "<numpy.ndarray> or <Number>")
-        return self.__array_to_candle(self._array - other)
+        return self.__array_to_candle(self.as_array() - other)
 
     def __mul__(self, other):
         if isinstance(other, Candle):
@@ -101,7 +119,7 @@ class Candle:
             raise TypeError("To multiply candle by something, the "
                             "object must be of type <Candle>, "
                             "<numpy.ndarray> or <Number>")
-        return self.__array_to_candle(self._array * other)
+        return self.__array_to_candle(self.as_array() * other)
 
     def __truediv__(self, other):
         if isinstance(other, Candle):
@@ -121,12 +139,14 @@ class Candle:
                             "<numpy.ndarray> or <Number>")
         else:
             divider = other
-        return self.__array_to_candle(self._array / divider)
+        return self.__array_to_candle(self.as_array() / divider)
 
     def __eq__(self, other):
         if isinstance(other, Candle):
-            matches = self._array == other.as_array()
-            return matches.all()
+            return (self.open == other.open
+                    and self.high == other.high
+                    and self.low == other.low
+                    and self.close == other.close)
         raise TypeError(f"Object is not candle: {other}")
 
     def __lt__(self, other):
@@ -17,43 +17,78 @@ from __future__ import annotations
 import operator
 from typing import Collection
 
+import numpy as np
 import pandas as pd
-from pandas.api.types import is_numeric_dtype
 
 from xoney.generic._series import TimeSeries
 from xoney.generic.candlestick import _validation
 from xoney.generic.candlestick import _utils
+from xoney.generic.candlestick import _binary
+from xoney.generic.candlestick import _resample
+from xoney.generic.candlestick._storage import ColumnStorage, COLUMNS
 from xoney.generic.candlestick import Candle
 from xoney.generic.timeframes import TimeFrame, DAY_1
+from xoney.system.exceptions import InvalidChartParameters
 
 
 class Chart(TimeSeries):
-    _df: pd.DataFrame
+    _storage: ColumnStorage
     timeframe: TimeFrame
+    _resamplers: dict[float, tuple[_resample.Resampler, Chart]] | None = None
+
+    # Columns as series indexed by the timestamps. The series are
+    # built on every access, ``*_array`` return the stored arrays.
 
     @property
     def close(self) -> pd.Series:
-        return self._df["Close"]
+        return self.__series(self._storage.close, "Close")
 
     @property
     def open(self) -> pd.Series:
-        return self._df["Open"]
+        return self.__series(self._storage.open, "Open")
 
     @property
     def high(self) -> pd.Series:
-        return self._df["High"]
+        return self.__series(self._storage.high, "High")
 
     @property
     def low(self) -> pd.Series:
-        return self._df["Low"]
+        return self.__series(self._storage.low, "Low")
 
     @property
     def volume(self) -> pd.Series:
-        return self._df["Volume"]
+        return self.__series(self._storage.volume, "Volume")
+
+    @property
+    def close_array(self) -> np.ndarray:
+        return self._storage.close
+
+    @property
+    def open_array(self) -> np.ndarray:
+        return self._storage.open
+
+    @property
+    def high_array(self) -> np.ndarray:
+        return self._storage.high
+
+    @property
+    def low_array(self) -> np.ndarray:
+        return self._storage.low
+
+    @property
+    def volume_array(self) -> np.ndarray:
+        return self._storage.volume
 
     @property
-    def timestamp(self) -> pd.Series:
-        return self._df.index
+    def timestamp(self) -> pd.Index:
+        storage: ColumnStorage = self._storage
+        return pd.Index(storage.timestamp.view(storage.time_dtype),
+                        name="Timestamp",
+                        copy=False)
+
+    def __series(self, column: np.ndarray, name: str) -> pd.Series:
+        # The series shares memory with the storage.
+        return pd.Series(column, index=self.timestamp, name=name, copy=False)
 
     def __init__(self,
                  open: Collection[float] | None = None,
@@ -63,7 +98,13 @@ class Chart(TimeSeries):
                  volume: Collection[float] | None = None,
                  timestamp: Collection | None = None,
                  df: pd.DataFrame = None,
-                 timeframe: TimeFrame = DAY_1):
+                 timeframe: TimeFrame = DAY_1,
+                 window: int | None = None):
+        """
+        :param window: Keep only the latest ``window`` candles,
+        dropping the oldest one on each ``append``. Useful
+        for live feeds that run for a long time.
+        """
         self.timeframe = timeframe
         if open is None:
             open = []
@@ -86,7 +127,10 @@ class Chart(TimeSeries):
                df["Volume"] = volume
             if "Timestamp" not in df.columns or df.index.name == "Timestamp":
                 df["Timestamp"] = timestamp
-            self._df = df
+            df.set_index('Timestamp', inplace=True)
+            open, high, low, close, volume = (df[column]
+                                              for column in COLUMNS)
+            timestamp = df.index
         else:
             _params: tuple = (open,
                               high,
@@ -97,34 +141,148 @@ class Chart(TimeSeries):
             _validation.validate_chart_parameters(*_params)
             _validation.validate_chart_length(*_params)
 
-            self._df = pd.DataFrame({'Open': open,
-                                     'High': high,
-                                     'Low': low,
-                                     'Close': close,
-                                     'Volume': volume,
-                                     'Timestamp': timestamp})
-        self._df.set_index('Timestamp', inplace=True)
+        nanoseconds, time_dtype = _utils.to_nanoseconds(timestamp)
+        columns: tuple[np.ndarray, ...] = tuple(
+            np.ascontiguousarray(column, dtype=np.float64)
+            for column in (open, high, low, close, volume)
+        )
+        self._storage = ColumnStorage(columns=columns,
+                                      timestamp=nanoseconds,
+                                      time_dtype=time_dtype,
+                                      window=window)
+
+    @classmethod
+    def _from_storage(cls,
+                      storage: ColumnStorage,
+                      timeframe: TimeFrame) -> Chart:
+        chart: Chart = cls.__new__(cls)
+        chart._storage = storage
+        chart.timeframe = timeframe
+        return chart
+
+    @classmethod
+    def from_arrays(cls,
+                    open: np.ndarray,
+                    high: np.ndarray,
+                    low: np.ndarray,
+                    close: np.ndarray,
+                    timestamp: np.ndarray,
+                    volume: np.ndarray | None = None,
+                    timeframe: TimeFrame = DAY_1,
+                    check_ohlc: bool = False) -> Chart:
+        """
+        Chart viewing NumPy arrays instead of copying them. Arrays are
+        checked by their dtype and shape, not element by element, and
+        timestamps must be sorted.
+
+        Contiguous float64 columns and datetime64[ns] or timedelta64[ns]
+        timestamps are used as they are, other numeric columns and time
+        units are converted. ``append`` copies the columns first, so
+        the arrays are never written.
+
+        :param volume: Ones by default.
+        :param check_ohlc: Also check that high >= open, close >= low.
+        """
+        columns: dict[str, np.ndarray] = dict(Open=open,
+                                              High=high,
+                                              Low=low,
+                                              Close=close)
+        if volume is not None:
+            columns["Volume"] = volume
+        _validation.validate_arrays(columns=columns, timestamp=timestamp)
+        if volume is None:
+            columns["Volume"] = np.ones(len(timestamp))
+
+        nanoseconds, time_dtype = _utils.to_nanoseconds(timestamp)
+        _validation.validate_sorted(nanoseconds)
+        arrays: tuple[np.ndarray, ...] = tuple(
+            np.ascontiguousarray(columns[name], dtype=np.float64)
+            for name in COLUMNS
+        )
+        if check_ohlc:
+            _validation.validate_ohlc_arrays(*arrays[:4])
+        storage: ColumnStorage = ColumnStorage(columns=arrays,
+                                               timestamp=nanoseconds,
+                                               time_dtype=time_dtype,
+                                               _owner=False)
+        return cls._from_storage(storage=storage, timeframe=timeframe)
+
+    @classmethod
+    def from_records(cls,
+                     records: np.ndarray,
+                     timeframe: TimeFrame = DAY_1,
+                     check_ohlc: bool = False) -> Chart:
+        """
+        Chart of a NumPy structured array with "Open", "High", "Low",
+        "Close", "Timestamp" and, optionally, "Volume" fields, in any case.
+        Fields of a structured array are strided, so every column is
+        copied once into a contiguous one.
+        """
+        if not isinstance(records, np.ndarray) or records.dtype.names is None:
+            raise InvalidChartParameters(
+                "Records must be a NumPy structured array"
+            )
+        fields: dict[str, str] = {name.lower(): name
+                                  for name in records.dtype.names}
+        arrays: dict[str, np.ndarray] = {}
+        for name in (*COLUMNS, "Timestamp"):
+            field: str | None = fields.get(name.lower())
+            if field is not None:
+                arrays[name.lower()] = records[field]
+            elif name != "Volume":
+                raise InvalidChartParameters(
+                    f"Records have no {name} field"
+                )
+        return cls.from_arrays(**arrays,
+                               timeframe=timeframe,
+                               check_ohlc=check_ohlc)
+
+    def save(self, path, instrument=None) -> None:
+        """
+        Write the chart to a columnar binary file, which
+        ``Chart.load`` maps into memory without parsing.
+
+        :param instrument: Its symbol and timeframe
+        are saved in the header of the file.
+        """
+        _binary.save(storage=self._storage,
+                     timeframe=self.timeframe,
+                     path=path,
+                     instrument=instrument)
+
+    @classmethod
+    def load(cls, path, mmap: bool = True) -> Chart:
+        """
+        Read a chart written by ``Chart.save``.
+
+        :param mmap: Map the columns with ``np.memmap`` instead of reading
+        them, so opening is instant and the pages are shared by processes.
+        The columns are read-only and ``append`` copies them first.
+        """
+        header, storage = _binary.load(path=path, mmap=mmap)
+        return cls._from_storage(storage=storage,
+                                 timeframe=header.timeframe)
+
+    def __with_columns(self, columns: tuple[np.ndarray, ...]) -> Chart:
+        storage: ColumnStorage = ColumnStorage(
+            columns=columns,
+            timestamp=self._storage.timestamp,
+            time_dtype=self._storage.time_dtype
+        )
+        return self._from_storage(storage=storage,
+                                  timeframe=self.timeframe)
 
     def __operation(self, other, func):
         if isinstance(other, Chart):
-            df = other._df
+            other_columns = other._storage.columns
         else:
-            df = pd.DataFrame({'Open': other,
-                               'High': other,
-                               'Low': other,
-                               'Close': other,
-                               'Volume': other},
-                              index=self._df.index)
-        result = self._df.copy()
-        for col in ['Open', 'High', 'Low', 'Close', 'Volume']:
-            if is_numeric_dtype(result[col]) and is_numeric_dtype(df[col]):
-                result[col] = func(result[col], df[col])
-        return Chart(open=result['Open'],
-                     high=result['High'],
-                     low=result['Low'],
-                     close=result['Close'],
-                     volume=result['Volume'],
-                     timestamp=result.index)
+            other_columns = (other,) * len(COLUMNS)
+        columns: tuple[np.ndarray, ...] = tuple(
+            np.asarray(func(column, other_column), dtype=np.float64)
+            for column, other_column in zip(self._storage.columns,
+                                            other_columns)
+        )
+        return self.__with_columns(columns)
 
     def __add__(self, other):
         return self.__operation(other=other, func=operator.add)
@@ -143,74 +301,154 @@ class Chart(TimeSeries):
         #   - new low = this low / other high
         #       as minimum possible price.
         if isinstance(other, Chart):
-            other = Chart(open=other._df['Open'],
-                          high=other._df['Low'],
-                          low=other._df['High'],
-                          close=other._df['Close'],
-                          volume=other._df['Volume'],
-                          timestamp=other._df.index,
-                          timeframe=self.timeframe)
+            other = other.__with_columns((other.open_array,
+                                          other.low_array,
+                                          other.high_array,
+                                          other.close_array,
+                                          other.volume_array))
         return self.__operation(other=other, func=operator.truediv)
 
+    def _position(self, item, side: str = "left") -> int:
+        if item is None or _utils.is_position(item):
+            return item
+        storage: ColumnStorage = self._storage
+        nanoseconds: int = _utils.time_to_nanoseconds(item,
+                                                      storage.time_dtype)
+        return storage.search(nanoseconds, side=side)
+
+    def _int_slice(self, item: slice) -> slice:
+        # Label bounds are both inclusive, as in ``pandas.DataFrame.loc``.
+        return slice(self._position(item.start, side="left"),
+                     self._position(item.stop, side="right"),
+                     item.step)
+
+    def _row(self, index: int) -> Candle:
+        storage: ColumnStorage = self._storage
+        open, high, low, close, volume, timestamp = storage.row(index)
+        return Candle._trusted(open,
+                               high,
+                               low,
+                               close,
+                               _utils.nanoseconds_to_time(timestamp,
+                                                          storage.time_dtype),
+                               volume)
+
     def __getitem__(self, item):
-        result = _utils.auto_loc_iloc(self._df, item)
-        if isinstance(result, pd.Series):
-            timestamp = result.name
-        else:
-            timestamp = result.index
-        init_params = dict(
-            open=result['Open'],
-            high=result['High'],
-            low=result['Low'],
-            close=result['Close'],
-            volume=result['Volume'],
-            timestamp=timestamp
-        )
         if isinstance(item, slice):
-            return Chart(**init_params, timeframe=self.timeframe)
-        else:
-            return Candle(**init_params)
+            return self._from_storage(
+                storage=self._storage[self._int_slice(item)],
+                timeframe=self.timeframe
+            )
+        if _utils.is_position(item):
+            return self._row(item)
+
+        index: int = self._position(item)
+        timestamp: np.ndarray = self._storage.timestamp
+        nanoseconds: int = _utils.time_to_nanoseconds(
+            item,
+            self._storage.time_dtype
+        )
+        if index == len(timestamp) or timestamp[index] != nanoseconds:
+            raise KeyError(item)
+        return self._row(index)
 
     def __iter__(self):
-        for row in self._df.itertuples():
-            yield Candle(open=row.Open,
-                         high=row.High,
-                         low=row.Low,
-                         close=row.Close,
-                         timestamp=row.Index,
-                         volume=row.Volume)
+        time_dtype: np.dtype = self._storage.time_dtype
+        to_time = _utils.nanoseconds_to_time
+        trusted = Candle._trusted
+        for open, high, low, close, volume, timestamp in self._storage.rows():
+            yield trusted(open,
+                          high,
+                          low,
+                          close,
+                          to_time(timestamp, time_dtype),
+                          volume)
 
     def __len__(self) -> int:
-        return len(self._df["Close"])
+        return len(self._storage)
 
     def __eq__(self, other: Chart) -> bool:
         if not isinstance(other, Chart):
             raise TypeError(f"Object is not chart: {other}")
 
-        should_eq: tuple[str, ...] = ("Open", "High", "Low", "Close")
+        should_eq: tuple[str, ...] = ("open", "high", "low", "close")
         for attr in should_eq:
-            if not _utils.equal_arrays(self._df[attr].values,
-                                       other._df[attr].values):
+            if not _utils.equal_arrays(getattr(self._storage, attr),
+                                       getattr(other._storage, attr)):
                 return False
 
-        if any(self.timestamp != other.timestamp):
+        if not _utils.equal_arrays(self._storage.timestamp,
+                                   other._storage.timestamp):
             return False
 
         return True
 
     def append(self, candle: Candle) -> None:
         if isinstance(candle, Candle):
-            df = pd.DataFrame(
-                    {"Open": [candle.open],
-                     "High": [candle.high],
-                     "Low": [candle.low],
-                     "Close": [candle.close],
-                     "Volume": [candle.volume],
-                     "Timestamp": [candle.timestamp]},
-                    ).set_index("Timestamp")
-            self._df = pd.concat([self._df, df])
+            volume: float = np.nan if candle.volume is None else candle.volume
+            nanoseconds: int = _utils.time_to_nanoseconds(
+                candle.timestamp,
+                self._storage.time_dtype
+            )
+            self._storage.append(row=(candle.open,
+                                      candle.high,
+                                      candle.low,
+                                      candle.close,
+                                      volume),
+                                 nanoseconds=nanoseconds)
         else:
             raise TypeError(f"Object is not candle: {candle}")
 
+    def reserve(self, capacity: int) -> None:
+        """
+        Preallocate room for ``capacity`` candles, so that
+        appending up to it does not reallocate the columns.
+        """
+        self._storage.reserve(capacity)
+
+    def resample(self, timeframe: TimeFrame) -> Chart:
+        """
+        Chart of ``timeframe`` candles, each aggregated from the candles
+        opened in its period: the first open, the highest high, the
+        lowest low, the last close and the sum of volumes. Periods
+        are aligned to the epoch, e.g. days start at midnight UTC.
+
+        The result is cached per timeframe. After ``append`` only the new
+        candles are aggregated into it, so charts of several timeframes
+        can share one base chart. The latest candle of the result is
+        updated in place until its period is over.
+        """
+        if timeframe == self.timeframe:
+            return self
+        if timeframe < self.timeframe:
+            raise ValueError(f"Can not resample {self.timeframe} "
+                             f"candles to smaller {timeframe} ones")
+        if self._resamplers is None:
+            self._resamplers = {}
+        if timeframe.seconds not in self._resamplers:
+            resampler = _resample.Resampler(timeframe=timeframe,
+                                            base=self._storage,
+                                            base_timeframe=self.timeframe)
+            self._resamplers[timeframe.seconds] = (
+                resampler,
+                self._from_storage(storage=resampler.storage,
+                                   timeframe=timeframe)
+            )
+        resampler, chart = self._resamplers[timeframe.seconds]
+        if len(self._storage):
+            resampler.update(self._storage)
+        return chart
+
+    def __getstate__(self) -> dict:
+        state: dict = self.__dict__.copy()
+        state.pop("_resamplers", None)
+        return state
+
     def latest_before(self, index) -> Candle:
         return self[:index][-1]
+
+    def to_pandas(self) -> pd.DataFrame:
+        """
+        :return: OHLCV columns as a new DataFrame indexed by "Timestamp".
+        """
+        return self._storage.to_pandas()
@@ -0,0 +1,144 @@
+# Copyright 2023 Vladyslav Kochetov. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# =============================================================================
+"""
+Charts read from disk block by block, so that histories which do not
+fit into memory can be backtested with ``Backtester.run_stream``.
+"""
+from __future__ import annotations
+
+import os
+from abc import ABC, abstractmethod
+from typing import Any, Iterator
+
+import pandas as pd
+
+from xoney.generic.candlestick import _binary
+from xoney.generic.candlestick.candle import Candle
+from xoney.generic.candlestick.chart import Chart
+from xoney.generic.candlestick._storage import ColumnStorage
+from xoney.generic.timeframes import TimeFrame, DAY_1
+
+
+DEFAULT_BLOCK_SIZE: int = 65536
+
+
+def _parquet():
+    try:
+        import pyarrow.parquet
+    except ImportError as error:
+        raise ImportError("Reading parquet charts requires pyarrow: "
+                          "pip install pyarrow") from error
+    return pyarrow.parquet
+
+
+class ChartSource(ABC):
+    """
+    Chart split into blocks of at most ``block_size`` candles,
+    which are read one after another in the order of time.
+    """
+    timeframe: TimeFrame
+    block_size: int
+
+    def __init__(self,
+                 timeframe: TimeFrame = DAY_1,
+                 block_size: int = DEFAULT_BLOCK_SIZE):
+        if block_size < 1:
+            raise ValueError("Block size must be positive, "
+                             f"but received: {block_size}")
+        self.timeframe = timeframe
+        self.block_size = block_size
+
+    @abstractmethod
+    def blocks(self) -> Iterator[Chart]:  # pragma: no cover
+        ...
+
+    def __iter__(self) -> Iterator[Candle]:
+        for block in self.blocks():
+            yield from block
+
+
+class BinaryChartSource(ChartSource):
+    """
+    Chart saved by ``Chart.save``. The file is mapped into memory and
+    every block is a view of it, so only the pages of the blocks that
+    were read are loaded.
+    """
+    path: str | os.PathLike
+
+    def __init__(self,
+                 path: str | os.PathLike,
+                 block_size: int = DEFAULT_BLOCK_SIZE):
+        header: _binary.ChartHeader = _binary.read_header(path)
+        super().__init__(timeframe=header.timeframe, block_size=block_size)
+        self.path = path
+
+    def blocks(self) -> Iterator[Chart]:
+        storage: ColumnStorage
+        _, storage = _binary.load(self.path, mmap=True)
+        for start in range(0, len(storage), self.block_size):
+            yield Chart._from_storage(
+                storage=storage[start:start + self.block_size],
+                timeframe=self.timeframe
+            )
+
+
+class CSVChartSource(ChartSource):
+    """
+    CSV file with "Open", "High", "Low", "Close", "Timestamp" and,
+    optionally, "Volume" columns, read with ``pandas.read_csv``
+    in chunks of ``block_size`` rows.
+
+    :param read_options: Other keyword arguments of ``pandas.read_csv``.
+    """
+    path: str | os.PathLike
+
+    def __init__(self,
+                 path: str | os.PathLike,
+                 timeframe: TimeFrame = DAY_1,
+                 block_size: int = DEFAULT_BLOCK_SIZE,
+                 **read_options: Any):
+        super().__init__(timeframe=timeframe, block_size=block_size)
+        self.path = path
+        self._read_options = read_options
+
+    def blocks(self) -> Iterator[Chart]:
+        with pd.read_csv(self.path,
+                         chunksize=self.block_size,
+                         **self._read_options) as reader:
+            df: pd.DataFrame
+            for df in reader:
+                df["Timestamp"] = pd.to_datetime(df["Timestamp"])
+                yield Chart(df=df, timeframe=self.timeframe)
+
+
+class ParquetChartSource(ChartSource):
+    """
+    Parquet file with the columns of ``CSVChartSource``, read in
+    record batches of ``block_size`` rows. Requires ``pyarrow``.
+    """
+    path: str | os.PathLike
+
+    def __init__(self,
+                 path: str | os.PathLike,
+                 timeframe: TimeFrame = DAY_1,
+                 block_size: int = DEFAULT_BLOCK_SIZE):
+        _parquet()  # fail early without pyarrow
+        super().__init__(timeframe=timeframe, block_size=block_size)
+        self.path = path
+
+    def blocks(self) -> Iterator[Chart]:
+        file = _parquet().ParquetFile(self.path)
+        for batch in file.iter_batches(batch_size=self.block_size):
+            yield Chart(df=batch.to_pandas(), timeframe=self.timeframe)
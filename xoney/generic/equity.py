@@ -15,6 +15,7 @@
 import operator
 
 from xoney.analysis.metrics import evaluate_metric
+from xoney.analysis.regression import ExponentialRegression
 from xoney.generic._series import TimeSeries
 from xoney.generic.candlestick import _utils
 from xoney.generic.timeframes import DAY_1
@@ -22,9 +23,22 @@ from xoney.generic.timeframes import DAY_1
 import numpy as np
 
 
+MIN_CAPACITY: int = 64
+
+
 class Equity(TimeSeries):
+    """
+    Balances are kept in a float64 buffer whose capacity doubles when
+    exhausted, so ``append`` costs amortized O(1). ``as_array`` returns
+    a read-only view of the buffer instead of a copy. Appended balances
+    are written past the end of the views, and ``update`` copies the
+    buffer once it was viewed, so the views never change.
+    """
     def as_array(self):
-        return np.array(self._list)
+        array = self._buffer[:self._length]
+        array.flags.writeable = False
+        self._exposed = True
+        return array
 
     def __init__(self,
                  iterable,
@@ -34,26 +48,67 @@ class Equity(TimeSeries):
             timestamp = []
         self.timeframe = timeframe
         self._timestamp = timestamp
-        self._list = list(iterable)
+        if isinstance(iterable, np.ndarray):
+            self._buffer = np.array(iterable, dtype=np.float64)
+        else:
+            self._buffer = np.fromiter(iterable, dtype=np.float64)
+        self._length = len(self._buffer)
+        self._exposed = False
+        self._metrics = []
+
+    @property
+    def capacity(self):
+        return len(self._buffer)
+
+    def reserve(self, capacity):
+        """
+        Move the balances into a new buffer with room
+        for at least ``capacity`` of them.
+        """
+        buffer = np.empty(max(capacity, self._length), dtype=np.float64)
+        buffer[:self._length] = self._buffer[:self._length]
+        self._buffer = buffer
+        self._exposed = False
 
     def __eq__(self, other):
         if not isinstance(other, Equity):
             raise TypeError(f"Object is not Equity: {other}")
-        if any(other.as_array() != self.as_array()):
+        if not np.array_equal(other.as_array(), self.as_array()):
             return False
         if self.timeframe != other.timeframe:
             return False
         return True
 
     def append(self, balance):
-        self._list.append(balance)
+        if self._length == self.capacity:
+            self.reserve(max(2 * self._length, MIN_CAPACITY))
+        self._buffer[self._length] = balance
+        self._length += 1
+        for metric in self._metrics:
+            metric.push(balance)
 
     def update(self, balance):
         """
 
         Replaces the last value of the deposit in equity
         """
-        self._list[-1] = balance
+        if not self._length:
+            raise IndexError("Can not update an empty equity")
+        if self._exposed:
+            self.reserve(self.capacity)
+        self._buffer[self._length - 1] = balance
+        for metric in self._metrics:
+            metric.replace(balance)
+
+    def track(self, metric):
+        """
+        Keep a ``RunningMetric`` up to date with every appended
+        or updated balance. Its value is available at any moment
+        as ``metric.value``.
+        """
+        metric.calculate(self)
+        self._metrics.append(metric)
+        return metric
 
     def change(self):
         array = self.as_array()
@@ -64,10 +119,18 @@ class Equity(TimeSeries):
                               timestamp=self._timestamp)
 
     def log(self):
-        return self.__class__(iterable=np.log(self._list),
+        return self.__class__(iterable=np.log(self.as_array()),
                               timeframe=self.timeframe,
                               timestamp=self._timestamp)
 
+    def running_max(self):
+        return np.maximum.accumulate(self.as_array())
+
+    def exponential_regression(self):
+        model = ExponentialRegression()
+        model.fit(array=self.as_array())
+        return model
+
     def mean(self):
         return self.as_array().mean()
 
@@ -77,11 +140,14 @@ class Equity(TimeSeries):
     def __getitem__(self, item):
         item = _utils.to_int_index(item=item,
                                    timestamp=self._timestamp)
+        # The slice is copied by the new equity, so the buffer
+        # is not exposed and ``update`` does not have to copy it.
+        balances = self._buffer[:self._length]
         if isinstance(item, slice):
-            return self.__class__(iterable=self._list[item],
+            return self.__class__(iterable=balances[item],
                                   timestamp=self._timestamp[item],
                                   timeframe=self.timeframe)
-        return self._list[item]
+        return float(balances[item])
 
     def __op(self, fn, other):
         if isinstance(other, Equity):
@@ -105,12 +171,83 @@ class Equity(TimeSeries):
         return self.__op(operator.truediv, other)
 
     def __iter__(self):
-        for deposit in self._list:
+        for deposit in self.as_array().tolist():
             yield deposit
 
     def __len__(self):
-        return len(self._list)
+        return self._length
+
+    def __getstate__(self):
+        # The spare capacity of the buffer is not pickled.
+        state = self.__dict__.copy()
+        state["_buffer"] = self._buffer[:self._length].copy()
+        state["_exposed"] = False
+        return state
 
     def evaluate(self, metric):
         return evaluate_metric(metric=metric,
                                equity=self)
+
+    def evaluate_many(self, metrics):
+        """
+        Evaluate several metrics at once. The array, returns, log curve,
+        regression and running maximum of the balances are computed once
+        and shared by the metrics, as well as metrics that evaluate other
+        metric types, like ``CalmarRatio``.
+
+        :return: Value of every metric, keyed by the metric as passed.
+        """
+        cached = _CachedEquity._of(self)
+        return {metric: cached.evaluate(metric) for metric in metrics}
+
+
+class _CachedEquity(Equity):
+    """
+    Read-only equity which memoizes its derived series and the
+    values of metric types. It shares the buffer of the equity
+    it was made from, which must not change while it is used.
+    """
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._cache = {}
+
+    @classmethod
+    def _of(cls, equity):
+        cached = cls.__new__(cls)
+        cached.__dict__.update(equity.__dict__)
+        cached._metrics = []
+        cached._cache = {}
+        return cached
+
+    def __cached(self, key, fn):
+        if key not in self._cache:
+            self._cache[key] = fn()
+        return self._cache[key]
+
+    def as_array(self):
+        return self.__cached("array", super().as_array)
+
+    def change(self):
+        return self.__cached("change", super().change)
+
+    def log(self):
+        return self.__cached("log", super().log)
+
+    def running_max(self):
+        return self.__cached("running_max", super().running_max)
+
+    def exponential_regression(self):
+        return self.__cached("exponential_regression",
+                             super().exponential_regression)
+
+    def evaluate(self, metric):
+        if not isinstance(metric, type):
+            return super().evaluate(metric)
+        return self.__cached(metric, lambda: super(_CachedEquity,
+                                                   self).evaluate(metric))
+
+    def append(self, balance):
+        raise TypeError("Cached equity can not be changed")
+
+    def update(self, balance):
+        raise TypeError("Cached equity can not be changed")
@@ -14,19 +14,27 @@
 # =============================================================================
 from __future__ import annotations
 
-from typing import Iterable, Callable
+from typing import Iterable, Callable, Any
 
-from xoney.analysis.metrics import Metric
+from xoney.analysis.metrics import Metric, RunningMetric
+from xoney.analysis.regression import ExponentialRegression
 from xoney.generic._series import TimeSeries
 from xoney.generic.timeframes import TimeFrame, DAY_1
 
 import numpy as np
 
 
+MIN_CAPACITY: int
+
+
 class Equity(TimeSeries):
-    _list: list[float]
+    _buffer: np.ndarray
+    _length: int
+    _exposed: bool
+    _metrics: list[RunningMetric]
 
     def as_array(self) -> np.ndarray:
+        array: np.ndarray
         ...
 
     def __init__(self,
@@ -35,6 +43,14 @@ class Equity(TimeSeries):
                  timeframe: TimeFrame = DAY_1):
         ...
 
+    @property
+    def capacity(self) -> int:
+        ...
+
+    def reserve(self, capacity: int) -> None:
+        buffer: np.ndarray
+        ...
+
     def __eq__(self, other: object):
         ...
 
@@ -44,6 +60,9 @@ class Equity(TimeSeries):
     def update(self, balance: float) -> None:
         ...
 
+    def track(self, metric: RunningMetric) -> RunningMetric:
+        ...
+
     def change(self) -> Equity:
         array: np.ndarray
         diff: np.ndarray
@@ -53,6 +72,13 @@ class Equity(TimeSeries):
     def log(self) -> Equity:
         ...
 
+    def running_max(self) -> np.ndarray:
+        ...
+
+    def exponential_regression(self) -> ExponentialRegression:
+        model: ExponentialRegression
+        ...
+
     def mean(self) -> float:
         ...
 
@@ -85,5 +111,35 @@ class Equity(TimeSeries):
     def __len__(self) -> int:
         ...
 
+    def __getstate__(self) -> dict:
+        state: dict
+        ...
+
     def evaluate(self, metric: Metric | type) -> float:
         ...
+
+    def evaluate_many(self, metrics: Iterable[Metric | type]
+                      ) -> dict[Metric | type, float]:
+        cached: _CachedEquity
+        ...
+
+
+class _CachedEquity(Equity):
+    _cache: dict[str | type, Any]
+
+    def __init__(self, *args, **kwargs):
+        ...
+
+    @classmethod
+    def _of(cls, equity: Equity) -> _CachedEquity:
+        cached: _CachedEquity
+        ...
+
+    def __cached(self, key: str | type, fn: Callable[[], Any]) -> Any:
+        ...
+
+    def append(self, balance: float) -> None:
+        ...
+
+    def update(self, balance: float) -> None:
+        ...
@@ -126,3 +126,16 @@ class CloseStrategyTrades(Event):
         close_trades = CloseTrades()
         close_trades.set_worker(self._worker)
         close_trades.handle_trades(trades=trades)
+
+
+class CloseStrategySymbolTrades(CloseStrategyTrades):
+    """
+    Close the trades of a strategy on the symbol of the
+    instrument whose chart the strategy has run on.
+    """
+    def handle_trades(self, trades: TradeHeap) -> None:
+        symbol = self._worker._current_instrument.symbol
+        super().handle_trades(trades=[
+            trade for trade in trades
+            if getattr(trade, "_symbol", None) == symbol
+        ])
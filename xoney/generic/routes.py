@@ -15,6 +15,9 @@
 from __future__ import annotations
 
 import itertools
+import os
+import re
+from collections import OrderedDict
 from typing import Iterable
 from dataclasses import dataclass
 from datetime import datetime, timedelta
@@ -23,7 +26,9 @@ from xoney.generic.timeframes import TimeFrame
 from xoney.strategy import Strategy
 from xoney.generic.symbol import Symbol
 from xoney.generic.candlestick import Chart
+from xoney.generic.candlestick import _binary
 from xoney.generic.events import Event
+from xoney.system.exceptions import InvalidChartFile
 
 
 
@@ -101,6 +106,9 @@ class TradingSystem:
 
 class ChartContainer:
     _charts: dict[Instrument, Chart]
+    _slices: OrderedDict[tuple, ChartContainer]
+    # Number of the latest slices kept by the container.
+    slice_cache_size: int = 32
 
     @property
     def start(self) -> datetime:
@@ -110,10 +118,17 @@ class ChartContainer:
     def end(self) -> datetime:
         return max(c.timestamp[-1] for c in self._charts.values())
 
+    @property
+    def values(self):
+        return self._charts.values()
+
+    @property
+    def pairs(self):
+        return self._charts.items()
+
     def __init__(self, charts: dict[Instrument, Chart]) -> None:
         self._charts = charts
-        self.values = charts.values()
-        self.pairs = charts.items()
+        self._slices = OrderedDict()
 
     def __getitem__(self, item) -> ChartContainer:
         i: Instrument
@@ -121,10 +136,82 @@ class ChartContainer:
 
         if isinstance(item, Instrument):
             return self._charts[item]
+        if isinstance(item, slice):
+            return self.__slice(item)
         return ChartContainer({i: c[item] for i, c in self._charts.items()})
 
+    def __slice(self, item: slice) -> ChartContainer:
+        # The same windows are sliced for every trial of a walk-forward
+        # validation, so the views of the charts are made once per slice.
+        # Storages are kept in the key, together with their versions,
+        # so slices of changed or replaced storages are not reused.
+        key: tuple = (item.start, item.stop, item.step,
+                      *((c._storage, c._storage.version)
+                        for c in self._charts.values()))
+        sliced: ChartContainer | None = self._slices.get(key)
+        if sliced is None:
+            sliced = ChartContainer(
+                {i: c[item] for i, c in self._charts.items()}
+            )
+            self._slices[key] = sliced
+            if len(self._slices) > self.slice_cache_size:
+                self._slices.popitem(last=False)
+        self._slices.move_to_end(key)
+        return sliced
+
+    def __getstate__(self) -> dict:
+        state: dict = self.__dict__.copy()
+        state["_slices"] = OrderedDict()
+        return state
+
     def __len__(self) -> int:
         return len(self._charts)
 
+    @classmethod
+    def from_base(cls,
+                  chart: Chart,
+                  instruments: Iterable[Instrument]) -> ChartContainer:
+        """
+        Charts of the instruments resampled from one base chart, e.g. of
+        1 minute candles, to their timeframes. After appending to the
+        base, call again to get the charts with the new candles.
+        """
+        return cls({instrument: chart.resample(instrument.timeframe)
+                    for instrument in instruments})
+
+    def save(self, directory: str | os.PathLike) -> None:
+        """
+        Save every chart into a binary file of ``directory``,
+        with its instrument in the header.
+        """
+        os.makedirs(directory, exist_ok=True)
+        for instrument, chart in self._charts.items():
+            name: str = re.sub(r"[^\w.-]+", "-",
+                               f"{instrument.symbol}_{instrument.timeframe}")
+            chart.save(path=os.path.join(directory,
+                                         name + _binary.EXTENSION),
+                       instrument=instrument)
+
+    @classmethod
+    def load(cls,
+             directory: str | os.PathLike,
+             mmap: bool = True) -> ChartContainer:
+        """
+        Load the charts saved by ``ChartContainer.save``
+        with the instruments in the headers of the files.
+        """
+        charts: dict[Instrument, Chart] = dict()
+        for name in sorted(os.listdir(directory)):
+            if not name.endswith(_binary.EXTENSION):
+                continue
+            path: str = os.path.join(directory, name)
+            header: _binary.ChartHeader = _binary.read_header(path)
+            if header.symbol is None:
+                raise InvalidChartFile(path, "the instrument is not saved")
+            instrument: Instrument = Instrument(Symbol(header.symbol),
+                                                header.instrument_timeframe)
+            charts[instrument] = Chart.load(path=path, mmap=mmap)
+        return cls(charts=charts)
+
     def __iter__(self):
         return iter(self._charts)
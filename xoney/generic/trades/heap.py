@@ -14,38 +14,168 @@
 # =============================================================================
 from __future__ import annotations
 
+from typing import Iterable
 
 from xoney.generic.trades import Trade
 from xoney.generic.heap import Heap
 from xoney.generic.candlestick import Candle
 from xoney.generic.enums import TradeStatus
-from xoney.generic.routes import Symbol
+from xoney.generic.symbol import Symbol
+
+
+_AGGREGATES: tuple[str, ...] = ("potential_volume",
+                                "filled_volume",
+                                "profit")
 
 
 class TradeHeap(Heap):
+    """
+    Trades are kept by their id in the order they were added and
+    are indexed by symbol and by status. Candles of an instrument
+    update only its trades, and trades are removed in O(1).
+
+    Volumes and profit of the trades are cached, together with their
+    sums. Trades report their changes, so only the changed ones
+    are recomputed when a sum is requested.
+    """
+    _trades: dict[int, Trade]
+    _order: dict[int, int]
+    _keys: dict[int, tuple[Symbol | None, TradeStatus]]
+    _by_symbol: dict[Symbol | None, dict[int, Trade]]
+    _by_status: dict[TradeStatus, dict[int, Trade]]
+    _bound: bool
+    _counter: int
+    _values: dict[str, dict[int, float]]
+    _sums: dict[str, float]
+    _dirty: dict[str, dict[int, Trade]]
+
+    @property
+    def _members(self) -> list[Trade]:
+        return list(self._trades.values())
+
+    def __init__(self,
+                 members: Iterable[Trade] | None = None,
+                 _bound: bool = True):
+        self._trades = dict()
+        self._order = dict()
+        self._keys = dict()
+        self._by_symbol = dict()
+        self._by_status = {status: dict() for status in TradeStatus}
+        self._bound = _bound
+        self._counter = 0
+        self._values = {name: dict() for name in _AGGREGATES}
+        self._sums = dict.fromkeys(_AGGREGATES, 0.0)
+        self._dirty = {name: dict() for name in _AGGREGATES}
+        for trade in members or ():
+            self.add(trade)
+
+    def __iter__(self):
+        # Trades can be removed from the heap while iterating.
+        return iter(list(self._trades.values()))
+
+    def __len__(self) -> int:
+        return len(self._trades)
+
+    def __index(self, trade: Trade) -> None:
+        key = (getattr(trade, "_symbol", None), trade.status)
+        self._keys[id(trade)] = key
+        self._by_symbol.setdefault(key[0], dict())[id(trade)] = trade
+        self._by_status[key[1]][id(trade)] = trade
+
+    def __unindex(self, trade: Trade) -> None:
+        symbol, status = self._keys.pop(id(trade))
+        del self._by_status[status][id(trade)]
+        trades: dict[int, Trade] = self._by_symbol[symbol]
+        del trades[id(trade)]
+        if not trades:
+            del self._by_symbol[symbol]
+
+    def _reindex(self, trade: Trade) -> None:
+        self.__unindex(trade)
+        self.__index(trade)
+
+    def add(self, new: Trade) -> None:
+        if id(new) in self._trades:
+            return
+        self._trades[id(new)] = new
+        self._order[id(new)] = self._counter
+        self._counter += 1
+        self.__index(new)
+        if self._bound:
+            new._bind_heap(self)
+            self._trade_changed(new)
+
+    def __discard(self, trade: Trade) -> None:
+        del self._trades[id(trade)]
+        del self._order[id(trade)]
+        self.__unindex(trade)
+        if self._bound:
+            trade._unbind_heap(self)
+            for name in _AGGREGATES:
+                self._dirty[name].pop(id(trade), None)
+                if id(trade) in self._values[name]:
+                    self._sums[name] -= self._values[name].pop(id(trade))
+            if not self._trades:
+                # Start again from exact zeros.
+                self._sums = dict.fromkeys(_AGGREGATES, 0.0)
+
+    def _trade_changed(self, trade: Trade) -> None:
+        for name in _AGGREGATES:
+            self._dirty[name][id(trade)] = trade
+
+    def __aggregate(self, name: str) -> float:
+        trade: Trade
+        if not self._bound:
+            return sum(getattr(trade, name) for trade in self)
+
+        dirty: dict[int, Trade] = self._dirty[name]
+        values: dict[int, float] = self._values[name]
+        # Values are computed before anything is changed,
+        # so an exception leaves the cache consistent.
+        changed: list[tuple[int, float]] = [
+            (key, getattr(trade, name)) for key, trade in dirty.items()
+        ]
+        for key, value in changed:
+            self._sums[name] += value - values.get(key, 0.0)
+            values[key] = value
+        dirty.clear()
+        return self._sums[name]
+
+    def remove(self, member: Trade) -> None:
+        if id(member) in self._trades:
+            self.__discard(member)
+            return
+        for trade in self._trades.values():
+            if member == trade:
+                self.__discard(trade)
+                break
+
     def update_trades(self, candle: Candle) -> None:
         trade: Trade
-        for trade in self._members:
+        for trade in self:
             trade.update(candle=candle)
 
+    def __symbol_trades(self, symbol: Symbol) -> list[Trade]:
+        return list(self._by_symbol.get(symbol, dict()).values())
+
     def update_symbol_trades(self, candle: Candle, symbol: Symbol) -> None:
-        for trade in self._members:
-            if trade._symbol == symbol:
-                trade.update(candle=candle)
+        for trade in self.__symbol_trades(symbol):
+            trade.update(candle=candle)
+
+    def mark_symbol_trades(self, price: float, symbol: Symbol) -> None:
+        for trade in self.__symbol_trades(symbol):
+            trade.mark(price=price)
 
     def cleanup_closed(self) -> None:
         trade: Trade
-        for trade in self._members:
-            if trade.status == TradeStatus.CLOSED:
-                self.remove(member=trade)
+        for trade in list(self._by_status[TradeStatus.CLOSED].values()):
+            self.__discard(trade)
 
     def _filter_by_status(self, status: TradeStatus) -> TradeHeap:
-        trade: Trade
-        return self.__class__(
-            trade
-            for trade in self
-            if trade.status == status
-        )
+        trades: list[Trade] = sorted(self._by_status[status].values(),
+                                     key=lambda trade: self._order[id(trade)])
+        # Filtered heaps are snapshots, so their trades are not bound.
+        return self.__class__(trades, _bound=False)
 
     @property
     def closed(self) -> TradeHeap:
@@ -55,23 +185,23 @@ class TradeHeap(Heap):
     def active(self) -> TradeHeap:
         return self._filter_by_status(TradeStatus.ACTIVE)
 
+    def count(self, status: TradeStatus) -> int:
+        return len(self._by_status[status])
+
     @property
     def filled_volume(self) -> float:
-        trade: Trade
-
-        return sum(trade.filled_volume
-                   for trade in self._members)
+        return self.__aggregate("filled_volume")
 
     @property
     def potential_volume(self) -> float:
-        trade: Trade
-
-        return sum(trade.potential_volume
-                   for trade in self._members)
+        return self.__aggregate("potential_volume")
 
     @property
     def profit(self) -> float:
-        trade: Trade
+        return self.__aggregate("profit")
+
+    def __getstate__(self) -> dict:
+        return {"trades": self._members, "bound": self._bound}
 
-        return sum(trade.profit
-                   for trade in self._members)
+    def __setstate__(self, state: dict) -> None:
+        self.__init__(state["trades"], _bound=state["bound"])
@@ -16,17 +16,30 @@ from abc import ABC
 
 from xoney.generic.candlestick import Candle
 from xoney.generic.trades.levels import Level
-from xoney.generic.trades.levels.utils import CheckLevelBreakout
+from xoney.generic.trades.levels.utils import (CheckLevelBreakout,
+                                              BREAKOUT_RULES,
+                                              BY_TRADE_SIDE,
+                                              AGAINST_TRADE_SIDE)
 
 
 class BaseBreakout(Level, ABC):
+    __slots__ = ()
+
+    @property
+    def _volume_factor(self) -> float:
+        return self.trade_part * self.trigger_price
+
     def _update_trade_volume(self) -> None:
-        # TODO
+        # The level sells its part of the filled base volume
+        # at the trigger price, so a breakout with the whole
+        # trade part closes the trade.
         if not self.crossed:
-            self._trade_volume = self._trade.filled_volume + self._trade.profit
+            self._trade_volume = self._trade.filled_volume_base
 
 
 class StopLoss(BaseBreakout):
+    __slots__ = ()
+
     def check_breaking(self, candle: Candle) -> bool:
         return CheckLevelBreakout.against_trade_side(
             level=self,
@@ -34,7 +47,13 @@ class StopLoss(BaseBreakout):
 
 
 class TakeProfit(BaseBreakout):
+    __slots__ = ()
+
     def check_breaking(self, candle: Candle) -> bool:
         return CheckLevelBreakout.by_trade_side(
             level=self,
             candle=candle)
+
+
+BREAKOUT_RULES[StopLoss] = AGAINST_TRADE_SIDE
+BREAKOUT_RULES[TakeProfit] = BY_TRADE_SIDE
@@ -16,22 +16,35 @@ from abc import ABC
 
 from xoney.generic.candlestick.candle import Candle
 from xoney.generic.trades.levels import Level
-from xoney.generic.trades.levels.utils import CheckLevelBreakout
+from xoney.generic.trades.levels.utils import (CheckLevelBreakout,
+                                              BREAKOUT_RULES,
+                                              ALWAYS,
+                                              AGAINST_TRADE_SIDE)
 
 
 class BaseEntry(Level, ABC):
+    __slots__ = ()
+
     def _update_trade_volume(self) -> None:
         if not self.crossed:
             self._trade_volume = self._trade.potential_volume
 
 
 class SimpleEntry(BaseEntry):
+    __slots__ = ()
+
     def check_breaking(self, candle: Candle) -> bool:
         return True
 
 
 class AveragingEntry(BaseEntry):
+    __slots__ = ()
+
     def check_breaking(self, candle: Candle) -> bool:
         return CheckLevelBreakout.against_trade_side(
             level=self,
             candle=candle)
+
+
+BREAKOUT_RULES[SimpleEntry] = ALWAYS
+BREAKOUT_RULES[AveragingEntry] = AGAINST_TRADE_SIDE
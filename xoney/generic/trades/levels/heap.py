@@ -14,52 +14,256 @@
 # =============================================================================
 from __future__ import annotations
 
+from typing import Iterable
+
+import numpy as np
+
 from xoney.generic.candlestick import Candle
+from xoney.generic.enums import TradeSide
 from xoney.generic.trades.levels import Level
+from xoney.generic.trades.levels.utils import (CheckLevelBreakout,
+                                               BREAKOUT_RULES)
 from xoney.generic.heap import Heap
 
 
+class _LevelArrays:
+    """
+    Structure of arrays of the levels in a heap.
+
+    Levels get their volume from their trade, which changes when
+    a level is crossed. So the levels are updated in segments that
+    end with a crossed level, and the volumes of each segment are
+    found with one multiplication.
+    """
+    levels: list[Level]
+    prices: np.ndarray
+    factors: np.ndarray
+    signs: np.ndarray
+    rules: np.ndarray
+    crossed: np.ndarray
+    volumes: np.ndarray
+    groups: np.ndarray
+
+    def __init__(self, levels: list[Level]):
+        self.levels = list(levels)
+        self.prices = np.array([level.trigger_price for level in levels],
+                               dtype=float)
+        self.factors = np.array([level._volume_factor for level in levels],
+                                dtype=float)
+        self.signs = np.array([1 if level.side == TradeSide.LONG else -1
+                               for level in levels])
+        self.rules = np.array([BREAKOUT_RULES[type(level)]
+                               for level in levels])
+        self.crossed = np.array([level.crossed for level in levels],
+                                dtype=bool)
+        self.volumes = np.array([level.quote_volume for level in levels],
+                                dtype=float)
+        # Levels of a group get the same volume from the same trade.
+        keys: dict[tuple, int] = dict()
+        self.groups = np.array([
+            keys.setdefault((type(level)._update_trade_volume,
+                             id(level._trade)),
+                            len(keys))
+            for level in levels
+        ])
+
+    @staticmethod
+    def supports(levels: Iterable[Level]) -> bool:
+        for level in levels:
+            if type(level) not in BREAKOUT_RULES \
+                    or level.side not in (TradeSide.LONG, TradeSide.SHORT) \
+                    or level._update_callbacks:
+                return False
+        return True
+
+    def _update_volumes(self, start: int, stop: int) -> None:
+        pending: np.ndarray = np.flatnonzero(~self.crossed[start:stop]) + start
+        if not len(pending):
+            return
+        trade_volumes: np.ndarray = np.empty(len(pending))
+        groups: np.ndarray = self.groups[pending]
+        for group in np.unique(groups):
+            in_group: np.ndarray = groups == group
+            first: Level = self.levels[pending[np.argmax(in_group)]]
+            first._update_trade_volume()
+            trade_volumes[in_group] = first._trade_volume
+        volumes: np.ndarray = trade_volumes * self.factors[pending]
+        changed: np.ndarray = volumes != self.volumes[pending]
+        for index, volume in zip(pending[changed], volumes[changed]):
+            self.levels[index]._set_quote_volume(volume)
+        self.volumes[pending] = volumes
+
+    def update(self, candle: Candle, heap: LevelHeap) -> int | None:
+        """
+        :return: None if all levels are updated, otherwise the index
+        of the first level that was not, because a breakout callback
+        has changed the levels.
+        """
+        hits: np.ndarray = ~self.crossed & CheckLevelBreakout.mask(
+            rules=self.rules,
+            signs=self.signs,
+            prices=self.prices,
+            candle=candle
+        )
+        start: int = 0
+        for hit in np.flatnonzero(hits):
+            self._update_volumes(start=start, stop=hit + 1)
+            self.crossed[hit] = True
+            self.levels[hit]._cross()
+            start = hit + 1
+            if heap._arrays is not self:
+                return start
+        self._update_volumes(start=start, stop=len(self.levels))
+        return None
+
+
 class LevelHeap(Heap):
+    """
+    Heap of levels. Unless it is a snapshot of another heap, levels
+    are bound to it and report their changes, so the heap can keep
+    the arrays of its levels and the volume of crossed levels
+    between updates.
+    """
+    _arrays: _LevelArrays | None
+    _crossed_volumes: tuple[float, float] | None
+    _bound: bool
+    _updating: bool
+    # Smaller heaps, like the few levels of most trades, are
+    # updated faster one by one than through the arrays.
+    min_array_levels: int = 32
+
+    def __init__(self,
+                 members: Iterable[Level] | None = None,
+                 _bound: bool = True):
+        super().__init__(members=members)
+        self._bound = _bound
+        self._updating = False
+        self._invalidate()
+        self.__bind_members()
+
+    def __bind_members(self) -> None:
+        if self._bound:
+            for level in self._members:
+                level._bind_heap(self)
+
+    def add(self, new: Level) -> None:
+        super().add(new)
+        if self._bound:
+            new._bind_heap(self)
+        self._invalidate()
+
+    def remove(self, member: Level) -> None:
+        level: Level
+        for level in self._members:
+            if member == level:
+                self._members.remove(level)
+                if self._bound and not any(other is level
+                                           for other in self._members):
+                    level._unbind_heap(self)
+                break
+        self._invalidate()
+
+    def _invalidate(self) -> None:
+        self._arrays = None
+        self._crossed_volumes = None
+
+    def _level_crossed(self) -> None:
+        self._crossed_volumes = None
+        if not self._updating:
+            self._arrays = None
+
+    def _level_changed(self) -> None:
+        if not self._updating:
+            self._arrays = None
+
+    def __get_arrays(self) -> _LevelArrays | None:
+        # Only bound heaps learn about changes of their levels.
+        if self._arrays is None and self._bound and \
+                len(self._members) >= self.min_array_levels and \
+                _LevelArrays.supports(self._members):
+            self._arrays = _LevelArrays(self._members)
+        return self._arrays
+
     def update(self, candle: Candle) -> None:
         """
         Update the state of all levels in the heap.
         :param candle: Candle by which the crossing of each
         of the levels will be checked.
         """
+        start: int | None = 0
+        arrays: _LevelArrays | None = self.__get_arrays()
+        if arrays is not None:
+            self._updating = True
+            try:
+                start = arrays.update(candle=candle, heap=self)
+            finally:
+                self._updating = False
+        if start is None:
+            return
 
         level: Level
-        for level in self._members:
+        for level in self._members[start:]:
             level.update(candle=candle)
 
+    def __getstate__(self) -> dict:
+        state: dict = self.__dict__.copy()
+        state["_arrays"] = None
+        state["_crossed_volumes"] = None
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        self.__bind_members()
+
+    def __filter_crossed(self, crossed: bool) -> LevelHeap:
+        if self._arrays is not None:
+            indices: np.ndarray = np.flatnonzero(self._arrays.crossed
+                                                 == crossed)
+            members = [self._members[index] for index in indices]
+        else:
+            members = [level for level in self._members
+                       if level.crossed == crossed]
+        return LevelHeap(members, _bound=False)
+
     @property
     def crossed(self) -> LevelHeap:
         """
         :return: Already crossed levels.
         """
-
-        crossed: LevelHeap = LevelHeap()
-
-        level: Level
-        for level in self._members:
-            if level.crossed:
-                crossed.add(level)
-
-        return crossed
+        return self.__filter_crossed(crossed=True)
 
     @property
     def pending(self) -> LevelHeap:
         """
         :return: Levels waiting to be crossed.
         """
+        return self.__filter_crossed(crossed=False)
 
-        pending: LevelHeap = LevelHeap()
+    def __get_crossed_volumes(self) -> tuple[float, float]:
+        # Volumes of crossed levels do not change,
+        # so the sums are kept until a level is crossed.
+        if self._crossed_volumes is not None:
+            return self._crossed_volumes
+        crossed: LevelHeap = self.crossed
+        volumes: tuple[float, float] = (crossed.quote_volume,
+                                        crossed.base_volume)
+        if self._bound:
+            self._crossed_volumes = volumes
+        return volumes
 
-        level: Level
-        for level in self._members:
-            if not level.crossed:
-                pending.add(level)
+    @property
+    def crossed_quote_volume(self) -> float:
+        """
+        :return: ``crossed.quote_volume``, cached in bound heaps.
+        """
+        return self.__get_crossed_volumes()[0]
 
-        return pending
+    @property
+    def crossed_base_volume(self) -> float:
+        """
+        :return: ``crossed.base_volume``, cached in bound heaps.
+        """
+        return self.__get_crossed_volumes()[1]
 
     @property
     def quote_volume(self) -> float:
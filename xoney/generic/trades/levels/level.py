@@ -14,33 +14,51 @@
 # =============================================================================
 from __future__ import annotations
 
-from functools import wraps
-
 from abc import ABC, abstractproperty
 
 
-class Level(ABC):
-    def _on_update_callback(self):
-        pass
+def _slot_names(cls):
+    names = []
+    for klass in cls.__mro__:
+        slots = klass.__dict__.get("__slots__", ())
+        if isinstance(slots, str):
+            slots = (slots,)
+        for name in slots:
+            if name.startswith("__") and not name.endswith("__"):
+                name = f"_{klass.__name__.lstrip('_')}{name}"
+            names.append(name)
+    return names
 
-    def _on_breakout_callback(self):
-        pass
 
-    def __set_callback(self, callback_name, fn):
-        prev_callback = getattr(self, callback_name)
+class Level(ABC):
+    # Default levels are slotted, levels of other
+    # subclasses without __slots__ get a __dict__.
+    __slots__ = ("__trigger_price",
+                 "__trade_part",
+                 "__cross_flag",
+                 "__quote_volume",
+                 "__side",
+                 "_trade",
+                 "_trade_volume",
+                 "_heaps",
+                 "_update_callbacks",
+                 "_breakout_callbacks")
 
-        @wraps(prev_callback)
-        def new_callback():
-            prev_callback()
-            fn(self)
+    def _on_update_callback(self):
+        for callback in self._update_callbacks:
+            callback(self)
 
-        setattr(self, callback_name, new_callback)
+    def _on_breakout_callback(self):
+        for callback in self._breakout_callbacks:
+            callback(self)
 
     def add_on_breakout_callback(self, fn):
-        self.__set_callback("_on_breakout_callback", fn=fn)
+        self._breakout_callbacks = (*self._breakout_callbacks, fn)
+        self._invalidate_heaps()
 
     def add_on_update_callback(self, fn):
-        self.__set_callback("_on_update_callback", fn=fn)
+        self._update_callbacks = (*self._update_callbacks, fn)
+        self._invalidate_heaps()
 
     @property
     def trade_part(self):
@@ -58,6 +76,11 @@ class Level(ABC):
     def crossed(self):
         return self.__cross_flag
 
+    @property
+    def _volume_factor(self):
+        # Quote volume of the level per unit of ``_trade_volume``.
+        return self.__trade_part
+
     @abstractproperty
     def _update_trade_volume(self):  # pragma: no cover
         ...
@@ -69,29 +92,72 @@ class Level(ABC):
         self.__trade_part = trade_part
         self.__cross_flag = False
         self.__quote_volume = 0.0
+        self._heaps = []
+        self._update_callbacks = ()
+        self._breakout_callbacks = ()
+
+    def _bind_heap(self, heap):
+        if not any(bound is heap for bound in self._heaps):
+            self._heaps.append(heap)
+
+    def _unbind_heap(self, heap):
+        self._heaps = [bound for bound in self._heaps if bound is not heap]
+
+    def _invalidate_heaps(self):
+        # Heaps keep arrays of the levels, which must be
+        # rebuilt after a level is changed outside of them.
+        for heap in self._heaps:
+            heap._invalidate()
 
     def edit_trigger_price(self, price: float):
         if not self.crossed:
             self.__trigger_price = price
+            self._invalidate_heaps()
 
     def check_breaking(self, candle):  # pragma: no cover
         return self.__trigger_price in candle
 
     def update(self, candle):
+        quote_volume = self.__quote_volume
         self._update_trade_volume()
         self._update_volume()
+        if self.__quote_volume != quote_volume:
+            for heap in self._heaps:
+                heap._level_changed()
         self._on_update_callback()
         if not self.crossed and self.check_breaking(candle):
-            self.__cross_flag = True
-            self._on_breakout_callback()
+            self._cross()
+
+    def _cross(self):
+        self.__cross_flag = True
+        for heap in self._heaps:
+            heap._level_crossed()
+        self._on_breakout_callback()
 
     def _update_volume(self):
         if not self.crossed:
-            self.__quote_volume = self._trade_volume * self.trade_part
+            self.__quote_volume = self._trade_volume * self._volume_factor
+
+    def _set_quote_volume(self, volume):
+        self.__quote_volume = volume
 
     def _bind_trade(self, trade):
         self._trade = trade
         self.__side = trade.side
+        self._invalidate_heaps()
+
+    def __getstate__(self):
+        state = {name: getattr(self, name)
+                 for name in _slot_names(type(self))
+                 if hasattr(self, name)}
+        state.update(getattr(self, "__dict__", {}))
+        # Copies are not bound to the heaps of the original.
+        state["_heaps"] = []
+        return state
+
+    def __setstate__(self, state):
+        for name, value in state.items():
+            object.__setattr__(self, name, value)
 
     @property
     def quote_volume(self):
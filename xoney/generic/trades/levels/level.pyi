@@ -20,9 +20,16 @@ from typing import Callable
 from xoney.generic.candlestick import Candle
 from xoney.generic.enums import TradeSide
 from xoney.generic.trades import Trade
+from xoney.generic.trades.levels import LevelHeap
+
+
+def _slot_names(cls: type) -> list[str]:
+    names: list[str]
+    ...
 
 
 class Level(ABC):
+    __slots__: tuple[str, ...]
     __trigger_price: float
     __side: TradeSide
     __trade_part: float
@@ -30,6 +37,9 @@ class Level(ABC):
     __quote_volume: float
     _trade: Trade
     _trade_volume: float
+    _heaps: list[LevelHeap]
+    _update_callbacks: tuple[Callable[[Level], None], ...]
+    _breakout_callbacks: tuple[Callable[[Level], None], ...]
 
     @property
     def trade_part(self) -> float:
@@ -47,6 +57,10 @@ class Level(ABC):
     def crossed(self) -> bool:
         ...
 
+    @property
+    def _volume_factor(self) -> float:
+        ...
+
     def _update_trade_volume(self) -> None:
         ...
 
@@ -55,6 +69,15 @@ class Level(ABC):
                  trade_part: float):
         ...
 
+    def _bind_heap(self, heap: LevelHeap) -> None:
+        ...
+
+    def _unbind_heap(self, heap: LevelHeap) -> None:
+        ...
+
+    def _invalidate_heaps(self) -> None:
+        ...
+
     def edit_trigger_price(self, price: float) -> None:
         ...
 
@@ -62,14 +85,28 @@ class Level(ABC):
         ...
 
     def update(self, candle: Candle) -> None:
+        quote_volume: float
+        ...
+
+    def _cross(self) -> None:
         ...
 
     def _update_volume(self) -> None:
         ...
 
+    def _set_quote_volume(self, volume: float) -> None:
+        ...
+
     def _bind_trade(self, trade: Trade) -> None:
         ...
 
+    def __getstate__(self) -> dict:
+        state: dict
+        ...
+
+    def __setstate__(self, state: dict) -> None:
+        ...
+
     @property
     def quote_volume(self) -> float:
         ...
@@ -94,13 +131,6 @@ class Level(ABC):
     def _on_breakout_callback(self) -> None:
         ...
 
-    def __set_callback(self,
-                       callback_name: str,
-                       fn: Callable[[Level], None]) -> None:
-        prev_callback: Callable[[], None]
-        new_callback: Callable[[], None]
-        ...
-
     def add_on_breakout_callback(self, fn: Callable[[Level], None]) -> None:
         ...
 
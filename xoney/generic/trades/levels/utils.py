@@ -12,6 +12,8 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 # =============================================================================
+import numpy as np
+
 from xoney.generic.candlestick import Candle
 from xoney.generic.enums import TradeSide
 from xoney.generic.trades.levels import Level
@@ -19,6 +21,16 @@ from xoney.generic.trades.levels import Level
 from xoney.system.exceptions import UnexpectedTradeSideError
 
 
+# Rules by which ``LevelHeap`` checks the crossing of levels with NumPy.
+ALWAYS: int = 0
+AGAINST_TRADE_SIDE: int = 1
+BY_TRADE_SIDE: int = 2
+
+# Level types and their rules. Levels of other types,
+# including subclasses, are updated one by one.
+BREAKOUT_RULES: dict[type, int] = {}
+
+
 # Here we don't check just the crossing with the candle,
 # because there may be a market gap on the trigger price.
 class CheckLevelBreakout:
@@ -43,3 +55,27 @@ class CheckLevelBreakout:
             return candle.low <= level.trigger_price
         else:
             raise UnexpectedTradeSideError(level.side)
+
+    @classmethod
+    def mask(cls,
+             rules: np.ndarray,
+             signs: np.ndarray,
+             prices: np.ndarray,
+             candle: Candle) -> np.ndarray:
+        """
+        Vectorized checks for arrays of levels.
+
+        :param rules: ``BREAKOUT_RULES`` value of every level.
+        :param signs: 1 for levels of long trades, -1 for short ones.
+        :return: Which levels the candle crosses.
+        """
+        long: np.ndarray = signs > 0
+        against: np.ndarray = np.where(long,
+                                       candle.low <= prices,
+                                       candle.high >= prices)
+        by: np.ndarray = np.where(long,
+                                  candle.high >= prices,
+                                  candle.low <= prices)
+        return np.where(rules == AGAINST_TRADE_SIDE,
+                        against,
+                        np.where(rules == BY_TRADE_SIDE, by, True))
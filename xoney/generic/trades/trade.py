@@ -39,6 +39,7 @@ class Trade:
     __opened: bool
     __update_price: float
     _symbol: Symbol  # TODO: move to MetaInfo
+    _heaps: list
     meta_info: TradeMetaInfo | None
 
     @property
@@ -51,7 +52,7 @@ class Trade:
 
     @property
     def _levels(self) -> LevelHeap:
-        return LevelHeap((*self.__entries, *self.__breakouts))
+        return LevelHeap((*self.__entries, *self.__breakouts), _bound=False)
 
     def __init__(self,
                  side: TradeSide,
@@ -64,6 +65,7 @@ class Trade:
         self.__status = TradeStatus.ACTIVE
         self.__potential_volume = potential_volume
         self.meta_info = meta_info
+        self._heaps = []
 
         self.__opened = False
 
@@ -89,28 +91,50 @@ class Trade:
     def set_potential_volume(self, potential_volume: float) -> None:
         if self.__potential_volume is None:
             self.__potential_volume = potential_volume
+            self.__changed()
 
     def _set_symbol(self, symbol: Symbol) -> None:
         self._symbol = symbol
+        self.__reindex()
+
+    def _bind_heap(self, heap) -> None:
+        self._heaps.append(heap)
+
+    def _unbind_heap(self, heap) -> None:
+        self._heaps = [bound for bound in self._heaps if bound is not heap]
+
+    def __reindex(self) -> None:
+        # Heaps index trades by symbol and status.
+        for heap in self._heaps:
+            heap._reindex(self)
+
+    def __changed(self) -> None:
+        # Heaps keep the volumes and the profit of their trades.
+        for heap in self._heaps:
+            heap._trade_changed(self)
 
     def _bind_levels(self) -> None:
         for level in (*self.__entries, *self.__breakouts):
             level._bind_trade(trade=self)
 
     def _update_levels(self, candle: Candle) -> None:
+        was_filled: bool = not math.is_zero(self.filled_volume_base)
         self.__entries.update(candle=candle)
-        self.__breakouts.update(candle=candle)
+        # A trade filled by the candle is filled on its close,
+        # so the breakouts are checked from the next candle.
+        if was_filled or math.is_zero(self.filled_volume_base):
+            self.__breakouts.update(candle=candle)
 
     @property
     def filled_volume(self) -> float:
-        entries_vol: float = self.__entries.crossed.quote_volume
-        breakouts_vol: float = self.__breakouts.crossed.quote_volume
+        entries_vol: float = self.__entries.crossed_quote_volume
+        breakouts_vol: float = self.__breakouts.crossed_quote_volume
         return entries_vol - breakouts_vol
 
     @property
     def filled_volume_base(self) -> float:
-        entries_vol: float = self.__entries.crossed.base_volume
-        breakouts_vol: float = self.__breakouts.crossed.base_volume
+        entries_vol: float = self.__entries.crossed_base_volume
+        breakouts_vol: float = self.__breakouts.crossed_base_volume
         return entries_vol - breakouts_vol
 
     @property
@@ -131,15 +155,27 @@ class Trade:
         return self.__potential_volume
 
     def _update_status(self) -> None:
-        if not self.__opened and not math.is_zero(self.filled_volume):
+        # Breakouts sell the base volume at their own price, so the
+        # quote volume of a closed trade is minus its profit.
+        if not self.__opened and not math.is_zero(self.filled_volume_base):
             self.__opened = True
-        elif math.is_zero(self.filled_volume):
+        elif math.is_zero(self.filled_volume_base) and \
+                self.__status != TradeStatus.CLOSED:
             self.__status = TradeStatus.CLOSED
+            self.__reindex()
+
+    def mark(self, price: float) -> None:
+        """
+        Revalue the trade at the price without checking its levels.
+        """
+        self.__update_price = price
+        self.__changed()
 
     def update(self, candle: Candle) -> None:
         self.__update_price = candle.close
         self._update_levels(candle=candle)
         self._update_status()
+        self.__changed()
 
     def _cleanup_callback(self):
         pass
@@ -159,6 +195,14 @@ class Trade:
         # heaps are set empty, but of the same type.
 
         self._update_status()
+        self.__changed()
+
+
+    def __getstate__(self) -> dict:
+        # Copies are not bound to the heaps of the original.
+        state: dict = self.__dict__.copy()
+        state["_heaps"] = []
+        return state
 
 
 def _validate_trade_side(side) -> None:
@@ -16,6 +16,8 @@ from __future__ import annotations
 
 from abc import abstractproperty, abstractmethod, ABC
 
+from xoney.generic.enums import TradeStatus
+
 
 class Worker(ABC):
     @abstractmethod
@@ -32,7 +34,7 @@ class EquityWorker(Worker, ABC):
 
     @property
     def opened_trades(self):
-        return len(self._trades.active)
+        return self._trades.count(TradeStatus.ACTIVE)
 
     @property
     def total_balance(self):
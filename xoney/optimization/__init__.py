@@ -13,4 +13,5 @@
 # limitations under the License.
 # =============================================================================
 from xoney.optimization.optimizer import Optimizer
+from xoney.optimization.cache import ScoreCache, MemoryCache, ShelveCache
 from xoney.optimization.optimizers import DefaultOptimizer, GeneticAlgorithmOptimizer
@@ -0,0 +1,155 @@
+# Copyright 2023 Vladyslav Kochetov. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# =============================================================================
+from __future__ import annotations
+
+from dataclasses import dataclass
+from multiprocessing.shared_memory import SharedMemory
+from typing import Any
+
+import numpy as np
+
+from xoney.analysis.metrics import Metric
+from xoney.backtesting import Backtester
+from xoney.generic.candlestick import Chart
+from xoney.generic.candlestick._storage import ColumnStorage, COLUMNS
+from xoney.generic.routes import Instrument, ChartContainer
+from xoney.generic.timeframes.template import TimeFrame
+from xoney.optimization._system_parsing import Parser
+from xoney.optimization.optimizer import score
+
+
+_ITEM_SIZE: int = 8  # float64 columns and int64 timestamps
+
+
+@dataclass(frozen=True)
+class SharedChart:
+    """
+    Picklable reference to a chart published into shared memory.
+    The block holds the OHLCV columns followed by the timestamps.
+    """
+    name: str
+    length: int
+    time_dtype: str
+    timeframe: TimeFrame
+
+    def _arrays(self, buffer: memoryview) -> tuple[np.ndarray, np.ndarray]:
+        columns = np.ndarray((len(COLUMNS), self.length),
+                             dtype=np.float64,
+                             buffer=buffer)
+        timestamp = np.ndarray((self.length,),
+                               dtype=np.int64,
+                               buffer=buffer,
+                               offset=len(COLUMNS) * self.length * _ITEM_SIZE)
+        return columns, timestamp
+
+    def attach(self) -> tuple[SharedMemory, Chart]:
+        """
+        :return: The shared memory block, which must be kept alive,
+        and a chart viewing its buffers without copying them.
+        """
+        memory: SharedMemory = SharedMemory(name=self.name)
+        columns, timestamp = self._arrays(memory.buf)
+        storage: ColumnStorage = ColumnStorage(
+            columns=tuple(columns),
+            timestamp=timestamp,
+            time_dtype=np.dtype(self.time_dtype),
+            # Appending copies the rows instead of
+            # writing into memory of other processes.
+            _owner=False
+        )
+        return memory, Chart._from_storage(storage=storage,
+                                           timeframe=self.timeframe)
+
+
+class SharedCharts:
+    """
+    Copy the arrays of a ``ChartContainer`` into shared memory once,
+    so worker processes can attach to them instead of unpickling
+    the charts for every trial. Blocks are freed on ``close``.
+    """
+    handle: dict[Instrument, SharedChart]
+    _blocks: list[SharedMemory]
+
+    def __init__(self, charts: ChartContainer):
+        self.handle = {}
+        self._blocks = []
+        instrument: Instrument
+        chart: Chart
+        for instrument, chart in charts.pairs:
+            length: int = len(chart)
+            size: int = (len(COLUMNS) + 1) * max(length, 1) * _ITEM_SIZE
+            memory: SharedMemory = SharedMemory(create=True, size=size)
+            self._blocks.append(memory)
+            shared: SharedChart = SharedChart(
+                name=memory.name,
+                length=length,
+                time_dtype=chart._storage.time_dtype.str,
+                timeframe=chart.timeframe
+            )
+            columns, timestamp = shared._arrays(memory.buf)
+            columns[:] = chart._storage.columns
+            timestamp[:] = chart._storage.timestamp
+            self.handle[instrument] = shared
+
+    def close(self) -> None:
+        for memory in self._blocks:
+            memory.close()
+            memory.unlink()
+        self._blocks = []
+
+    def __enter__(self) -> SharedCharts:
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+
+# State of a worker process, set once by ``initialize_worker``.
+_worker: dict[str, Any] = {}
+
+
+def attach_charts(handle: dict[Instrument, SharedChart]
+                  ) -> tuple[list[SharedMemory], ChartContainer]:
+    blocks: list[SharedMemory] = []
+    charts: dict[Instrument, Chart] = {}
+    for instrument, shared in handle.items():
+        memory, charts[instrument] = shared.attach()
+        blocks.append(memory)
+    return blocks, ChartContainer(charts=charts)
+
+
+def initialize_worker(handle: dict[Instrument, SharedChart],
+                      backtester: Backtester,
+                      metrics: list[Metric],
+                      parser: Parser) -> None:
+    _worker["blocks"], _worker["charts"] = attach_charts(handle)
+    _worker["backtester"] = backtester
+    _worker["metrics"] = metrics
+    _worker["parser"] = parser
+
+
+def score_flattens(flattens: list[dict[str, Any]]
+                   ) -> list[float | tuple[float, ...]]:
+    """
+    Backtest the systems of flatten parameters on the
+    attached charts and evaluate the metrics of each.
+    """
+    parser: Parser = _worker["parser"]
+    backtester: Backtester = _worker["backtester"]
+    systems = [parser.as_system(flatten=flatten) for flatten in flattens]
+    equities = backtester.run_batch(trading_systems=systems,
+                                    charts=_worker["charts"])
+    return [score(equity=equity, metrics=_worker["metrics"])
+            for equity in equities]
@@ -0,0 +1,207 @@
+# Copyright 2023 Vladyslav Kochetov. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# =============================================================================
+from __future__ import annotations
+
+import hashlib
+import shelve
+import threading
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Sequence, Tuple, Union
+
+from xoney.analysis.metrics import Metric
+from xoney.backtesting import Backtester
+from xoney.generic.routes import ChartContainer, TradingSystem
+
+
+Score = Union[float, Tuple[float, ...]]
+
+
+def charts_fingerprint(charts: ChartContainer) -> str:
+    """
+    Hash of the instruments and the OHLCV data of the charts.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    for instrument, chart in sorted(charts.pairs,
+                                    key=lambda pair: repr(pair[0])):
+        digest.update(repr(instrument).encode())
+        for column in (*chart._storage.columns, chart._storage.timestamp):
+            digest.update(column.tobytes())
+    return digest.hexdigest()
+
+
+# Attributes of a backtester which hold the state of its last run.
+_RUN_STATE: frozenset[str] = frozenset({"_free_balance",
+                                        "_trades",
+                                        "_equity",
+                                        "_trading_system",
+                                        "_current_instrument",
+                                        "max_trades"})
+
+
+def system_signature(trading_system: TradingSystem) -> str:
+    """
+    Canonical repr of the strategy classes, their parameter
+    names and the instruments of every strategy.
+    """
+    return repr(tuple(
+        (f"{type(strategy).__module__}.{type(strategy).__qualname__}",
+         tuple(sorted(strategy.parameters)),
+         tuple(sorted(map(repr, instruments))))
+        for strategy, instruments in zip(trading_system.strategies,
+                                         trading_system._strategy_instruments)
+    ))
+
+
+def _settings(obj: Any, exclude: frozenset[str] = frozenset()) -> tuple:
+    return (f"{type(obj).__module__}.{type(obj).__qualname__}",
+            tuple(sorted((name, repr(value))
+                         for name, value in vars(obj).items()
+                         if name not in exclude)))
+
+
+def metric_settings(metric: Metric) -> tuple:
+    """
+    Type and attributes of a metric. Metrics keep the results of
+    ``calculate`` in their attributes, so the settings should be
+    taken before the metric is evaluated.
+    """
+    return _settings(metric)
+
+
+def score_key(flatten: dict[str, Any],
+              fingerprint: str,
+              signature: str,
+              backtester: Backtester,
+              metrics: Sequence[tuple]) -> str:
+    """
+    Key of the score of the system with ``signature`` and ``flatten``
+    parameters on the charts with ``fingerprint``. Every setting of
+    the backtester is part of the key.
+
+    :param metrics: ``metric_settings`` of the metrics.
+    """
+    key = (fingerprint,
+           signature,
+           _settings(backtester, exclude=_RUN_STATE),
+           tuple(metrics),
+           tuple(sorted(flatten.items())))
+    return hashlib.blake2b(repr(key).encode(),
+                           digest_size=16).hexdigest()
+
+
+class ScoreCache(ABC):
+    """
+    Scores of already evaluated systems, so optimizers skip
+    the backtests of parameters that are suggested again.
+    """
+    hits: int = 0
+    misses: int = 0
+
+    def __init__(self):
+        self._lock = threading.Lock()
+
+    @abstractmethod
+    def _get(self, key: str) -> Score | None:  # pragma: no cover
+        ...
+
+    @abstractmethod
+    def _set(self, key: str, score: Score) -> None:  # pragma: no cover
+        ...
+
+    def get(self, key: str) -> Score | None:
+        with self._lock:
+            score: Score | None = self._get(key)
+            if score is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+            return score
+
+    def set(self, key: str, score: Score) -> None:
+        with self._lock:
+            self._set(key, score)
+
+
+class MemoryCache(ScoreCache):
+    """
+    Scores of the latest ``maxsize`` systems,
+    the least recently used are dropped first.
+    """
+    maxsize: int | None
+
+    def __init__(self, maxsize: int | None = 4096):
+        super().__init__()
+        self.maxsize = maxsize
+        self._scores: OrderedDict[str, Score] = OrderedDict()
+
+    def _get(self, key: str) -> Score | None:
+        score: Score | None = self._scores.get(key)
+        if score is not None:
+            self._scores.move_to_end(key)
+        return score
+
+    def _set(self, key: str, score: Score) -> None:
+        self._scores[key] = score
+        self._scores.move_to_end(key)
+        if self.maxsize is not None and len(self._scores) > self.maxsize:
+            self._scores.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._scores)
+
+
+class ShelveCache(MemoryCache):
+    """
+    Scores saved to a ``shelve`` database at ``path``, so resumed
+    or repeated studies skip systems evaluated in earlier runs.
+    The latest ``maxsize`` scores are also kept in memory.
+    """
+    path: str
+
+    def __init__(self, path: str, maxsize: int | None = 4096):
+        super().__init__(maxsize=maxsize)
+        self.path = path
+        self._shelf: shelve.Shelf | None = None
+
+    @property
+    def shelf(self) -> shelve.Shelf:
+        if self._shelf is None:
+            self._shelf = shelve.open(self.path)
+        return self._shelf
+
+    def _get(self, key: str) -> Score | None:
+        score: Score | None = super()._get(key)
+        if score is None:
+            score = self.shelf.get(key)
+            if score is not None:
+                super()._set(key, score)
+        return score
+
+    def _set(self, key: str, score: Score) -> None:
+        super()._set(key, score)
+        self.shelf[key] = score
+
+    def close(self) -> None:
+        with self._lock:
+            if self._shelf is not None:
+                self._shelf.close()
+                self._shelf = None
+
+    def __enter__(self) -> ShelveCache:
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
@@ -16,6 +16,7 @@ from __future__ import annotations
 
 import copy
 from abc import ABC, abstractmethod
+from typing import Any, Sequence
 
 from xoney.analysis.metrics import Metric
 from xoney.generic.routes import TradingSystem, Instrument, ChartContainer
@@ -24,24 +25,76 @@ from xoney.generic.candlestick import Chart
 from xoney.backtesting import Backtester
 from xoney.generic.equity import Equity
 from xoney.strategy import IntParameter
+from xoney.optimization.cache import (ScoreCache,
+                                      charts_fingerprint,
+                                      metric_settings,
+                                      score_key,
+                                      system_signature)
 
 from xoney.system.exceptions import UnexpectedParameter
 
 
+def score(equity: Equity,
+          metrics: Sequence[Metric]) -> float | tuple[float, ...]:
+    """
+    :return: Value of the metric, or values of several metrics
+    computed together with ``Equity.evaluate_many``.
+    """
+    if len(metrics) == 1:
+        return equity.evaluate(metrics[0])
+    values: dict[Metric, float] = equity.evaluate_many(metrics)
+    return tuple(values[metric] for metric in metrics)
+
+
 class Optimizer(Worker, ABC):
+    """
+    Several metrics can be optimized at once, each in the direction
+    of its ``Metric.positive``. Every trial is scored by all of them
+    from a single backtest.
+    """
     _backtester: Backtester
     _charts: ChartContainer
     _metric: Metric
+    _metrics: list[Metric]
+    _metrics_settings: tuple[tuple, ...]
     _trading_system: TradingSystem
     _max_trades_param: IntParameter | None
+    cache: ScoreCache | None
+    _fingerprint: tuple[ChartContainer, str] | None = None
+    _signature: tuple[TradingSystem, str] | None = None
 
     def __init__(self,
                  backtester: Backtester,
-                 metric: Metric | type,
-                 max_trades: IntParameter | None = None):
+                 metric: Metric | type | Sequence[Metric | type],
+                 max_trades: IntParameter | None = None,
+                 cache: ScoreCache | None = None):
         self._backtester = backtester
         self.set_metric(metric=metric)
         self._max_trades_param = max_trades
+        self.cache = cache
+
+    def reset(self) -> None:
+        """
+        Forget the charts, the trading system and the results
+        of the previous run. The cache is kept.
+        """
+        for name in ("_charts", "_trading_system", "_max_trades"):
+            self.__dict__.pop(name, None)
+        self._fingerprint = None
+        self._signature = None
+
+    def clone(self) -> Optimizer:
+        """
+        :return: Optimizer with the same settings and without the state
+        of previous runs. The backtester and the metrics are cloned,
+        the cache is shared.
+        """
+        optimizer: Optimizer = copy.copy(self)
+        optimizer._backtester = self._backtester.clone()
+        optimizer._metrics = [copy.copy(metric) for metric in self._metrics]
+        optimizer._metric = optimizer._metrics[0]
+        optimizer.reset()
+        return optimizer
 
     def _initialize_max_trades(self):
         # During the optimization process, the parameter of the maximum
@@ -57,23 +110,114 @@ class Optimizer(Worker, ABC):
         if not isinstance(self._max_trades, IntParameter):
             raise UnexpectedParameter(self._max_trades)
 
-    def __initialize_metric(self, metric: Metric | type) -> None:
+    @staticmethod
+    def __initialize_metric(metric: Metric | type) -> Metric:
         if isinstance(metric, type):
             metric = metric()
-        self._metric = metric
+        return metric
+
+    def set_metric(self,
+                   metric: Metric | type | Sequence[Metric | type]) -> None:
+        if not isinstance(metric, Sequence):
+            metric = [metric]
+        if not metric:
+            raise ValueError("At least one metric must be optimized")
+        self._metrics = [self.__initialize_metric(metric=item)
+                         for item in metric]
+        self._metric = self._metrics[0]
+        # Taken before the metrics keep results of evaluations.
+        self._metrics_settings = tuple(metric_settings(item)
+                                       for item in self._metrics)
+
+    @property
+    def multi_objective(self) -> bool:
+        return len(self._metrics) > 1
 
-    def set_metric(self, metric: Metric) -> None:
-        self.__initialize_metric(metric=metric)
+    @property
+    def _directions(self) -> list[str]:
+        return ["maximize" if metric.positive else "minimize"
+                for metric in self._metrics]
 
-    def _backtest(self, trading_system: TradingSystem) -> Equity:
-        tester: Backtester = copy.deepcopy(self._backtester)
+    def _backtest(self,
+                  trading_system: TradingSystem,
+                  **kwargs) -> Equity:
+        tester: Backtester = self._backtester.clone()
         tester.run(charts=self._charts,
-                   trading_system=trading_system)
+                   trading_system=trading_system,
+                   **kwargs)
         return tester.equity
 
+    def _backtest_many(self,
+                       trading_systems: list[TradingSystem]) -> list[Equity]:
+        return self._backtester.run_batch(trading_systems=trading_systems,
+                                          charts=self._charts)
+
+    def _cache_key(self, flatten: dict[str, Any]) -> str:
+        # The charts and the system are described once for every run.
+        if self._fingerprint is None or \
+                self._fingerprint[0] is not self._charts:
+            self._fingerprint = (self._charts,
+                                 charts_fingerprint(self._charts))
+        if self._signature is None or \
+                self._signature[0] is not self._trading_system:
+            self._signature = (self._trading_system,
+                               system_signature(self._trading_system))
+        return score_key(flatten=flatten,
+                         fingerprint=self._fingerprint[1],
+                         signature=self._signature[1],
+                         backtester=self._backtester,
+                         metrics=self._metrics_settings)
+
+    def _system_score(self,
+                      trading_system: TradingSystem,
+                      flatten: dict[str, Any] | None = None,
+                      **kwargs) -> float | tuple[float, ...]:
+        """
+        :param flatten: Parameters the system was built from. If given,
+        the score is looked up in and saved to ``cache``.
+        :param kwargs: Passed to ``Backtester.run``.
+        """
+        return self._systems_scores(
+            trading_systems=[trading_system],
+            flattens=None if flatten is None else [flatten],
+            batch=False,
+            **kwargs
+        )[0]
+
+    def _systems_scores(self,
+                        trading_systems: list[TradingSystem],
+                        flattens: list[dict[str, Any]] | None = None,
+                        batch: bool = True,
+                        **kwargs) -> list[float | tuple[float, ...]]:
+        keys: list[str | None] = [None] * len(trading_systems)
+        scores: list = [None] * len(trading_systems)
+        if self.cache is not None and flattens is not None:
+            keys = [self._cache_key(flatten) for flatten in flattens]
+            scores = [self.cache.get(key) for key in keys]
+
+        # Systems with the same key are backtested once.
+        missing: dict[str | int, list[int]] = dict()
+        for i, value in enumerate(scores):
+            if value is None:
+                missing.setdefault(i if keys[i] is None else keys[i],
+                                   []).append(i)
+        systems: list[TradingSystem] = [trading_systems[indices[0]]
+                                        for indices in missing.values()]
+        if not systems:
+            equities: list[Equity] = []
+        elif batch:
+            equities = self._backtest_many(systems)
+        else:
+            equities = [self._backtest(system, **kwargs)
+                        for system in systems]
 
-    def _system_score(self, trading_system: TradingSystem) -> float:
-        return self._backtest(trading_system).evaluate(self._metric)
+        for indices, equity in zip(missing.values(), equities):
+            value = score(equity=equity, metrics=self._metrics)
+            for i in indices:
+                scores[i] = value
+            if keys[indices[0]] is not None:
+                self.cache.set(keys[indices[0]], value)
+        return scores
 
     @abstractmethod
     def best_systems(self,
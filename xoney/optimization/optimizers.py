@@ -14,9 +14,15 @@
 # =============================================================================
 from __future__ import annotations
 
-from typing import Callable, Any
+import copy
 
-from optuna.trial import FrozenTrial
+from concurrent.futures import (Future,
+                                ProcessPoolExecutor,
+                                wait,
+                                FIRST_COMPLETED)
+from typing import Callable, Any, Sequence
+
+from optuna.trial import FrozenTrial, TrialState
 from xoney.backtesting import Backtester
 from xoney.backtesting.backtester import Backtester
 
@@ -24,17 +30,21 @@ from xoney.optimization import Optimizer
 from xoney.generic.routes import TradingSystem, Instrument, ChartContainer
 from xoney.generic.candlestick import Chart
 from xoney.analysis.metrics import Metric
+from xoney.generic.equity import Equity
 from xoney.strategy import (Parameter,
                             IntParameter,
                             FloatParameter,
                             CategoricalParameter)
 
 from xoney.optimization._system_parsing import Parser
+from xoney.optimization import _processes
+from xoney.optimization.cache import ScoreCache
 
 from xoney.system.exceptions import UnexpectedParameter
 from xoney.config import n_processes
 
-from optuna import Study, create_study, Trial
+from optuna import Study, create_study, Trial, TrialPruned
+from optuna.pruners import BasePruner
 from optuna.samplers import NSGAIISampler
 
 
@@ -63,43 +73,169 @@ class DefaultOptimizer(Optimizer):
     _max_trades: IntParameter
     n_jobs: int
     n_trials: int | None
+    batch_size: int | None
+    use_processes: bool
+    pruner: BasePruner | None
+    n_checkpoints: int
 
     def __init__(self,
                  backtester: Backtester,
-                 metric: Metric,
+                 metric: Metric | type | Sequence[Metric | type],
                  max_trades: IntParameter | None = None,
                  n_jobs: int | None = None,
-                 n_trials: int | None = None):
+                 n_trials: int | None = None,
+                 batch_size: int | None = None,
+                 use_processes: bool = False,
+                 cache: ScoreCache | None = None,
+                 pruner: BasePruner | None = None,
+                 n_checkpoints: int = 10):
+        """
+        :param metric: Metric to optimize, or a list of metrics
+        for multi-objective optimization.
+        :param batch_size: If specified, trials are asked from the study
+        in batches of this size and every batch is backtested with
+        one ``Backtester.run_batch`` call instead of ``n_jobs`` threads.
+        :param use_processes: Run trials in ``n_jobs`` worker processes
+        instead of threads. Charts are published into shared memory
+        once and workers read them without copying.
+        :param cache: Scores of evaluated parameters, e.g. ``MemoryCache``
+        or ``ShelveCache``. Parameters suggested again are not backtested.
+        :param pruner: Optuna pruner of the study. The metric of the equity
+        is reported to it at ``n_checkpoints`` ticks of every backtest,
+        and trials it prunes are stopped. It needs trials backtested one
+        by one, so can not be used with several metrics, ``batch_size``
+        or ``use_processes``, nor with backtesters which do not report
+        the intermediate equity, like ``VectorizedBacktester``.
+        """
         if n_jobs is None:
             n_jobs = n_processes
         self.n_jobs = n_jobs
         self.n_trials = n_trials
+        self.batch_size = batch_size
+        self.use_processes = use_processes
+        self.pruner = pruner
+        self.n_checkpoints = n_checkpoints
         super().__init__(backtester=backtester,
                          metric=metric,
-                         max_trades=max_trades)
+                         max_trades=max_trades,
+                         cache=cache)
+        if pruner is not None and (self.multi_objective
+                                   or batch_size is not None
+                                   or use_processes):
+            raise ValueError("Pruning works with a single metric and "
+                             "without batch_size and use_processes")
+        if pruner is not None and not backtester.reports_progress:
+            raise ValueError(f"{type(backtester).__name__} does not report "
+                             "the intermediate equity, so trials "
+                             "can not be pruned")
 
     def __initialize_parser(self, trading_system: TradingSystem) -> None:
         self._parser = Parser(system_signature=trading_system)
 
-    def _system_to_objective(self, trading_system: TradingSystem) -> Callable[[Trial], float]:
+    def _suggest_flatten(self, trial: Trial) -> dict[str, Any]:
+        flatten: dict[str, Any] = dict()
+        for path, parameter in self._parser.parameters.items():
+            flatten[path] = _parameter_to_value(
+                parameter=parameter,
+                path=path,
+                trial=trial
+            )
+        flatten["max_trades"] = _parameter_to_value(parameter=self._max_trades,
+                                                    path="max_trades",
+                                                    trial=trial)
+        return flatten
+
+    def _trial_reporter(self,
+                        trial: Trial) -> Callable[[int, Equity], None]:
+        def report(tick: int, equity: Equity) -> None:
+            trial.report(equity.evaluate(self._metric), step=tick)
+            if trial.should_prune():
+                raise TrialPruned(f"Pruned at tick {tick}")
+
+        return report
+
+    def _system_to_objective(self, trading_system: TradingSystem) -> Callable[[Trial], float | tuple[float, ...]]:
         self.__initialize_parser(trading_system=trading_system)
 
-        def objective(trial: Trial) -> float:
-            flatten: dict[str, Any] = dict()
-            for path, parameter in self._parser.parameters.items():
-                flatten[path] = _parameter_to_value(
-                    parameter=parameter,
-                    path=path,
-                    trial=trial
-                )
-            flatten["max_trades"] = _parameter_to_value(parameter=self._max_trades,
-                                                        path="max_trades",
-                                                        trial=trial)
+        def objective(trial: Trial) -> float | tuple[float, ...]:
+            flatten: dict[str, Any] = self._suggest_flatten(trial)
             system: TradingSystem = self._parser.as_system(flatten=flatten)
-            return self._system_score(trading_system=system)
+            if self.pruner is None:
+                return self._system_score(trading_system=system,
+                                          flatten=flatten)
+            return self._system_score(trading_system=system,
+                                      flatten=flatten,
+                                      reporter=self._trial_reporter(trial),
+                                      n_checkpoints=self.n_checkpoints)
 
         return objective
 
+    def _optimize_batches(self, n_trials: int) -> None:
+        while n_trials > 0:
+            size: int = min(self.batch_size, n_trials)
+            trials: list[Trial] = [self._study.ask() for _ in range(size)]
+            flattens: list[dict[str, Any]] = [self._suggest_flatten(trial)
+                                              for trial in trials]
+            systems: list[TradingSystem] = [
+                self._parser.as_system(flatten=flatten)
+                for flatten in flattens
+            ]
+            scores = self._systems_scores(trading_systems=systems,
+                                          flattens=flattens)
+            for trial, score in zip(trials, scores):
+                self._study.tell(trial, score)
+            n_trials -= size
+
+    def _optimize_processes(self, n_trials: int) -> None:
+        size: int = 1 if self.batch_size is None else self.batch_size
+        pending: dict[Future, list[tuple[Trial, str | None]]] = dict()
+
+        with _processes.SharedCharts(self._charts) as shared, \
+                ProcessPoolExecutor(
+                    max_workers=self.n_jobs,
+                    initializer=_processes.initialize_worker,
+                    initargs=(shared.handle,
+                              self._backtester,
+                              self._metrics,
+                              self._parser)
+                ) as pool:
+
+            def submit() -> None:
+                # Trials with cached scores are told at once,
+                # until a batch of new parameters is collected.
+                nonlocal n_trials
+                trials: list[tuple[Trial, str | None]] = []
+                flattens: list[dict[str, Any]] = []
+                while n_trials > 0 and len(trials) < size:
+                    n_trials -= 1
+                    trial: Trial = self._study.ask()
+                    flatten: dict[str, Any] = self._suggest_flatten(trial)
+                    key: str | None = None
+                    if self.cache is not None:
+                        key = self._cache_key(flatten)
+                        score = self.cache.get(key)
+                        if score is not None:
+                            self._study.tell(trial, score)
+                            continue
+                    trials.append((trial, key))
+                    flattens.append(flatten)
+                if trials:
+                    future = pool.submit(_processes.score_flattens, flattens)
+                    pending[future] = trials
+
+            while n_trials > 0 and len(pending) < self.n_jobs:
+                submit()
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    trials = pending.pop(future)
+                    for (trial, key), score in zip(trials, future.result()):
+                        self._study.tell(trial, score)
+                        if key is not None:
+                            self.cache.set(key, score)
+                    if n_trials > 0:
+                        submit()
+
     def run(self,
             trading_system: TradingSystem,
             charts: dict[Instrument, Chart] | ChartContainer,
@@ -114,44 +250,77 @@ class DefaultOptimizer(Optimizer):
         self._trading_system = trading_system
         self._initialize_max_trades()
 
-        self._opt_params.update(
-            dict(n_jobs=self.n_jobs,
-                 n_trials=n_trials)
-        )
-        direction: str = "maximize" if self._metric.positive else "minimize"
-        self._study = create_study(direction=direction,
-                                   **self._study_params)
+        self._opt_params = dict(self._opt_params,
+                                n_jobs=self.n_jobs,
+                                n_trials=n_trials)
+        study_params: dict[str, Any] = dict(self._study_params)
+        if self.pruner is not None:
+            study_params["pruner"] = self.pruner
+        self._study = create_study(directions=self._directions,
+                                   **study_params)
         objective = self._system_to_objective(
             trading_system=trading_system
         )
-        self._study.optimize(func=objective,
-                             **self._opt_params)
+        if self.use_processes:
+            self._optimize_processes(n_trials=n_trials)
+        elif self.batch_size is None:
+            self._study.optimize(func=objective,
+                                 **self._opt_params)
+        else:
+            self._optimize_batches(n_trials=n_trials)
 
     def _best_trials(self, n: int) -> list[FrozenTrial]:
-        # length of values is 1, because only 1 metric
-        # can be used in optimization
+        # Systems are ordered by the first metric. With several
+        # metrics only the trials of the Pareto front are returned.
         trial_score: Callable = lambda trial: trial.values[0]
-        trials: list[FrozenTrial] = self._study.trials
+        if self.multi_objective:
+            trials: list[FrozenTrial] = self._study.best_trials
+        else:
+            trials = self._study.get_trials(states=(TrialState.COMPLETE,))
         # TODO: debug. Trials now is just a list of best trials
         sorted_trials: list = sorted(trials,
                                      key=trial_score,
                                      reverse=self._metric.positive)
         return sorted_trials[:n] # The best systems should come first
 
+    def reset(self) -> None:
+        """
+        Also forget the study and the parser of the previous run.
+        """
+        super().reset()
+        for name in ("_study", "_parser"):
+            self.__dict__.pop(name, None)
+
+    def clone(self) -> DefaultOptimizer:
+        optimizer: DefaultOptimizer = super().clone()
+        # Samplers keep a random state of their own.
+        optimizer._study_params = copy.deepcopy(self._study_params)
+        return optimizer
+
     def _trial_to_system(self, trial: FrozenTrial) -> TradingSystem:
         settings: dict[str, Any] = trial.params
         return self._parser.as_system(flatten=settings)
 
     def best_systems(self, n: int = 1) -> list[TradingSystem]:
+        """
+        :return: Up to ``n`` best systems. When several metrics are
+        optimized, these are systems of the Pareto front, which no
+        other system beats by every metric.
+        """
         systems: map = map(self._trial_to_system,
                            self._best_trials(n=n))
         return list(systems)
 
 
 class GeneticAlgorithmOptimizer(DefaultOptimizer):
+    """
+    Optimization with the NSGA-II sampler. With ``batch_size`` equal
+    to ``population_size`` every generation is backtested in one
+    ``Backtester.run_batch`` call.
+    """
     def __init__(self,
                  backtester: Backtester,
-                 metric: Metric,
+                 metric: Metric | type | Sequence[Metric | type],
                  max_trades: IntParameter | None = None,
                  n_jobs: int | None = None,
                  n_trials: int | None = None,
@@ -160,6 +329,11 @@ class GeneticAlgorithmOptimizer(DefaultOptimizer):
                  crossover_prob: float = 0.9,
                  swapping_prob: float = 0.5,
                  seed: int | None = None,
+                 batch_size: int | None = None,
+                 use_processes: bool = False,
+                 cache: ScoreCache | None = None,
+                 pruner: BasePruner | None = None,
+                 n_checkpoints: int = 10,
                  **NSGA2_sampler_kwargs):
         self._study_params = dict(
             sampler=NSGAIISampler(population_size=population_size,
@@ -173,4 +347,9 @@ class GeneticAlgorithmOptimizer(DefaultOptimizer):
                          metric=metric,
                          max_trades=max_trades,
                          n_jobs=n_jobs,
-                         n_trials=n_trials)
+                         n_trials=n_trials,
+                         batch_size=batch_size,
+                         use_processes=use_processes,
+                         cache=cache,
+                         pruner=pruner,
+                         n_checkpoints=n_checkpoints)
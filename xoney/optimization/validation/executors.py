@@ -0,0 +1,98 @@
+# Copyright 2023 Vladyslav Kochetov. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# =============================================================================
+from __future__ import annotations
+
+import math
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from typing import Callable, Any
+
+from xoney.config import n_processes
+
+
+class PairExecutor(ABC):
+    """
+    Strategy of mapping a function over the sample pairs of
+    a ``Validator``. Results are returned in the order of pairs.
+    """
+    @abstractmethod
+    def map(self,
+            function: Callable[[Any], Any],
+            items: list) -> list:  # pragma: no cover
+        ...
+
+
+class SerialExecutor(PairExecutor):
+    def map(self, function: Callable[[Any], Any], items: list) -> list:
+        return [function(item) for item in items]
+
+
+class ThreadExecutor(PairExecutor):
+    """
+    Pairs are validated in threads. Useful when the backtests
+    release the GIL, e.g. with ``VectorizedBacktester``.
+    """
+    n_jobs: int
+
+    def __init__(self, n_jobs: int | None = None):
+        if n_jobs is None:
+            n_jobs = n_processes
+        self.n_jobs = n_jobs
+
+    def map(self, function: Callable[[Any], Any], items: list) -> list:
+        with ThreadPoolExecutor(max_workers=self.n_jobs) as pool:
+            return list(pool.map(function, items))
+
+
+class ProcessExecutor(PairExecutor):
+    """
+    Pairs are validated in worker processes, so pure python
+    backtests scale with cores. The function and the pairs
+    must be picklable, and the optimizers of the pairs can not
+    start processes of their own.
+
+    :param chunk_size: Number of pairs sent to a worker at once.
+    """
+    n_jobs: int
+    chunk_size: int
+
+    def __init__(self,
+                 n_jobs: int | None = None,
+                 chunk_size: int = 1):
+        if n_jobs is None:
+            n_jobs = n_processes
+        self.n_jobs = n_jobs
+        self.chunk_size = chunk_size
+
+    def _chunk_size(self, items: list) -> int:
+        return self.chunk_size
+
+    def map(self, function: Callable[[Any], Any], items: list) -> list:
+        with ProcessPoolExecutor(max_workers=self.n_jobs) as pool:
+            return list(pool.map(function,
+                                 items,
+                                 chunksize=self._chunk_size(items)))
+
+
+class ChunkedExecutor(ProcessExecutor):
+    """
+    Pairs are split into ``n_jobs`` contiguous chunks and every worker
+    process validates one of them, which pickles the least data.
+    """
+    def __init__(self, n_jobs: int | None = None):
+        super().__init__(n_jobs=n_jobs)
+
+    def _chunk_size(self, items: list) -> int:
+        return max(math.ceil(len(items) / self.n_jobs), 1)
@@ -14,30 +14,47 @@
 # =============================================================================
 from __future__ import annotations
 
+from functools import partial
+
 from xoney import ChartContainer, TradingSystem
 from xoney.optimization.validation.sampling import Sampler, SamplePair
+from xoney.optimization.validation.executors import (PairExecutor,
+                                                     SerialExecutor)
 from xoney.generic.equity import Equity
 
 
+def _validate(pair: SamplePair, system: TradingSystem) -> Equity:
+    # Module level function, so it can be sent to worker processes.
+    pair.training.optimize(system=system)
+    best = pair.training.best_system()
+    return pair.validation.backtest(best)
+
+
 class Validator:
     _pairs: list[SamplePair]
     _equities: list[Equity]
+    _executor: PairExecutor
 
     def __init__(self,
                  charts: ChartContainer,
-                 sampler: Sampler) -> None:
+                 sampler: Sampler,
+                 executor: PairExecutor | None = None) -> None:
+        """
+        :param executor: How the sample pairs are validated,
+        ``SerialExecutor`` by default.
+        """
         self._pairs = sampler.samples(charts=charts)
+        if executor is None:
+            executor = SerialExecutor()
+        self._executor = executor
 
     def test(self,
-             system: TradingSystem) -> None:  # TODO: support parallel computing
-        self._equities = [self._validate(pair=pair, system=system)
-                          for pair in self._pairs]
-
+             system: TradingSystem) -> None:
+        self._equities = self._executor.map(partial(_validate, system=system),
+                                            self._pairs)
 
     def _validate(self, pair: SamplePair, system: TradingSystem) -> Equity:
-        pair.training.optimize(system=system)
-        best = pair.training.best_system()
-        return pair.validation.backtest(best)
+        return _validate(pair=pair, system=system)
 
     @property
     def equities(self) -> list[Equity]:
@@ -15,7 +15,6 @@
 from __future__ import annotations
 
 from datetime import timedelta, datetime
-from copy import deepcopy
 
 from xoney import ChartContainer, TradingSystem
 from xoney.backtesting import Backtester
@@ -35,10 +34,9 @@ class InSample(TrainingSample):
                  optimizer: Optimizer) -> None:
         self._source_charts = charts
         self._period = period
-        self._optimizer = deepcopy(optimizer)
+        self._optimizer = optimizer.clone()
 
     def optimize(self, system: TradingSystem) -> None:
-        # TODO: optimize for small datasets
         self._charts = self._source_charts[self._period]
         return super().optimize(system)
 
@@ -53,7 +51,7 @@ class OutOfSample(ValidationSample):
                  backtester: Backtester) -> None:
         self._source_charts = charts
         self._period = period
-        self._backtester = deepcopy(backtester)
+        self._backtester = backtester.clone()
 
     def backtest(self, system: TradingSystem) -> Equity:
         idx = slice(
@@ -17,3 +17,4 @@ from xoney.strategy.parameters import (Parameter,
                                        IntParameter,
                                        FloatParameter,
                                        CategoricalParameter)
+from xoney.strategy.vectorized import VectorizedStrategy, Signals
@@ -16,7 +16,6 @@ from __future__ import annotations
 
 from warnings import warn
 
-import copy
 from abc import ABC, abstractmethod
 
 from time import time
@@ -42,7 +41,23 @@ class Strategy(ABC):
         Important: name of parameter will contains in _settings of the strategy
 
         """
-        self._settings.update(settings)
+        # A new dict, so the default of the class is never changed
+        # and strategies do not share their settings.
+        self._settings = {**self._settings, **settings}
+
+    def reset(self):
+        """
+        Forget the state of previous runs. Strategies
+        which keep state between runs should extend it.
+        """
+
+    def clone(self):
+        """
+        :return: New strategy of the same type and settings, without
+        the state of previous runs. Strategies whose constructor does
+        not take their settings as keyword arguments should override it.
+        """
+        return type(self)(**self._settings)
 
     @abstractmethod
     def run(self, chart):  # pragma: no cover
@@ -63,7 +78,7 @@ class Strategy(ABC):
 
     @property
     def settings(self):
-        return copy.deepcopy(self._settings)
+        return dict(self._settings)
 
     def __hash__(self):
         return hash(tuple(self._settings.items()))
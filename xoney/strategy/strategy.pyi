@@ -37,6 +37,12 @@ class Strategy(ABC):
                       settings: dict[str, object]) -> None:
         ...
 
+    def reset(self) -> None:
+        ...
+
+    def clone(self) -> Strategy:
+        ...
+
     @abstractmethod
     def run(self, chart: Chart) -> None:
         ...
@@ -0,0 +1,151 @@
+# Copyright 2023 Vladyslav Kochetov. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# =============================================================================
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Iterable, Sequence
+
+import numpy as np
+
+from xoney.generic.candlestick import Chart
+from xoney.generic.enums import TradeSide
+from xoney.generic.events import (Event,
+                                  OpenTrade,
+                                  CloseStrategySymbolTrades)
+from xoney.generic.trades import Trade, TradeMetaInfo
+from xoney.generic.trades.levels import (Level,
+                                         LevelHeap,
+                                         SimpleEntry,
+                                         StopLoss,
+                                         TakeProfit)
+from xoney.strategy.strategy import Strategy
+
+
+@dataclass
+class Signals:
+    """
+    Decisions of a vectorized strategy for every candle of a chart.
+
+    :param position: 1 to hold a long trade after the close of
+    the candle, -1 to hold a short one and 0 to stay out of the market.
+    :param stop_loss: Stop loss price of a trade opened on the candle,
+    NaN for none. The levels of a trade stay where they were set until
+    it is closed, later values matter only for the next trades.
+    :param take_profit: Take profit price of a trade opened on the candle,
+    NaN for none.
+
+    Signals of a batch of parameter sets are 2-D, with a row for each set.
+    """
+    position: np.ndarray
+    stop_loss: np.ndarray | None = None
+    take_profit: np.ndarray | None = None
+
+    def validate(self, length: int) -> None:
+        for array in (self.position, self.stop_loss, self.take_profit):
+            if array is not None and np.shape(array)[-1] != length:
+                raise ValueError("Signals must have one value for "
+                                 f"each of {length} candles, "
+                                 f"but received {np.shape(array)[-1]}")
+
+
+class VectorizedStrategy(Strategy, ABC):
+    """
+    Strategy that is a function of the whole chart. It can be tested
+    by ``VectorizedBacktester`` in one pass and still runs candle
+    by candle in ``Backtester`` and live trading.
+
+    The position held before a candle is the signal of the previous
+    candle of the same chart, so a strategy trading several instruments
+    keeps a position for each and changes only the trades of the
+    instrument whose signal has changed.
+    """
+    _events: list[Event] = []
+
+    @abstractmethod
+    def signals(self, chart: Chart) -> Signals:  # pragma: no cover
+        ...
+
+    @classmethod
+    def batch_signals(cls,
+                      chart: Chart,
+                      strategies: Sequence[VectorizedStrategy]) -> Signals:
+        """
+        Signals of many parameter sets of the strategy as 2-D arrays
+        of shape (len(strategies), len(chart)).
+
+        The default stacks ``signals`` of every strategy. Strategies
+        whose indicators can be computed for all parameter sets
+        at once should override it.
+        """
+        rows: list[Signals] = []
+        for strategy in strategies:
+            signals: Signals = strategy.signals(chart)
+            signals.validate(length=len(chart))
+            rows.append(signals)
+
+        def stack(name: str) -> np.ndarray | None:
+            arrays = [getattr(signals, name) for signals in rows]
+            if all(array is None for array in arrays):
+                return None
+            return np.stack([np.full(len(chart), np.nan)
+                             if array is None else array
+                             for array in arrays])
+
+        return Signals(position=stack("position"),
+                       stop_loss=stack("stop_loss"),
+                       take_profit=stack("take_profit"))
+
+    def reset(self) -> None:
+        self._events = []
+
+    def _levels(self, signals: Signals) -> list[Level]:
+        levels: list[Level] = []
+        if signals.stop_loss is not None and \
+                not np.isnan(signals.stop_loss[-1]):
+            levels.append(StopLoss(price=signals.stop_loss[-1],
+                                   trade_part=1))
+        if signals.take_profit is not None and \
+                not np.isnan(signals.take_profit[-1]):
+            levels.append(TakeProfit(price=signals.take_profit[-1],
+                                     trade_part=1))
+        return levels
+
+    def run(self, chart: Chart) -> None:
+        signals: Signals = self.signals(chart)
+        signals.validate(length=len(chart))
+        position: int = int(np.sign(signals.position[-1]))
+        previous: int = 0
+        if len(chart) > 1:
+            previous = int(np.sign(signals.position[-2]))
+
+        self._events = []
+        if position != previous:
+            self._events.append(
+                CloseStrategySymbolTrades(strategy_id=self._id)
+            )
+            if position:
+                side = TradeSide.LONG if position > 0 else TradeSide.SHORT
+                trade = Trade(
+                    side=side,
+                    entries=LevelHeap([SimpleEntry(price=chart.close_array[-1],
+                                                   trade_part=1)]),
+                    breakouts=LevelHeap(self._levels(signals)),
+                    meta_info=TradeMetaInfo(strategy_id=self._id)
+                )
+                self._events.append(OpenTrade(trade))
+
+    def fetch_events(self) -> Iterable[Event]:
+        return self._events
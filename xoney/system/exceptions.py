@@ -38,9 +38,16 @@ class IncorrectChartLength(ChartError):
 
 
 class InvalidChartParameters(ChartError):
-    def __init__(self):
+    def __init__(self, reason=None):
+        if reason is None:
+            reason = "Please check types of parameters"
         super().__init__("Incorrect parameters of Chart initialization. "
-                         "Please check types of parameters")
+                         + reason)
+
+
+class InvalidChartFile(ChartError):
+    def __init__(self, path, reason):
+        super().__init__(f"Invalid chart file {path}: {reason}")
 
 
 class UnexpectedParameter(XoneyException):